@@ -70,6 +70,14 @@ class BasemapsPlugin:
         except Exception:
             pass
 
+        # Stop following provider files; a reloaded plugin starts afresh.
+        try:
+            from .catalog_service import get_catalog_service
+
+            get_catalog_service().stop_watching()
+        except Exception:
+            pass
+
         if self.translator:
             QCoreApplication.removeTranslator(self.translator)
 
@@ -12,9 +12,11 @@
 
 from __future__ import annotations
 
+import functools
 import tempfile
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import urlencode
 
 from qgis.core import (
@@ -34,6 +36,7 @@ from qgis.PyQt.QtCore import (
     QSettings,
     QSize,
     Qt,
+    QTimer,
     QUrl,
 )
 from qgis.PyQt.QtGui import QIcon, QPixmap
@@ -67,10 +70,14 @@ from qgis.PyQt.QtWidgets import (
 )
 
 from . import config_loader
+from .catalog_service import get_catalog_service
 from .icon_utils import make_rounded_icon
+from .layer_record import LayerRecord
 from .messageTool import Logger, MessageBar, MessageBox
-from .preview_manager import PreviewManager
+from .preview_manager import PreviewManager, load_preview_pixmap
+from .search_index import item_name
 from .style_cache import get_style_cache, safe_file_url
+from .tag_index import OVERLAY_TAG, OVERLAY_TAG_PREFIX, TagIndex
 from .ui import IconBasemaps, UIBasemapsBase
 from .ui.basemap_delegate import TAG_COLORS, BasemapCardDelegate
 from .wms_fetch_task import FetchResult, WMSFetchTask
@@ -100,6 +107,14 @@ else:
     window_modal = Qt.WindowModality.WindowModal
     http_status_code_attribute = QNetworkRequest.Attribute.HttpStatusCodeAttribute
 
+# Position of a list/tree item's basemap or layer in its provider's item
+# list, i.e. its id in the provider's TagIndex
+ITEM_ID_ROLE = user_role + 13
+
+# Scrolling/resizing settle time before grid previews are requested and
+# re-prioritized
+GRID_PRIORITY_DELAY_MS = 80
+
 VECTOR_STYLE_REQUEST_HEADERS = (
     (
         b"User-Agent",
@@ -120,21 +135,6 @@ user_separator = {
     "type": "separator",
 }
 
-OVERLAY_TAG = "Overlay"
-OVERLAY_TAG_PREFIX = f"{OVERLAY_TAG}/"
-
-TAG_SORT_ORDER = [
-    "Satellite",
-    "Streets",
-    "Terrain",
-    "Thematic",
-    "Overlay/Labels",
-    "Overlay/Boundaries",
-    "Overlay/Transportation",
-    "Overlay/Hydrography",
-    OVERLAY_TAG,
-]
-
 AVAILABLE_TAGS = [
     "All",
     "Satellite",
@@ -160,6 +160,9 @@ ASSIGNABLE_TAGS = [
     "Overlay/Boundaries",
 ]
 
+# Maximum number of hits listed in the "Search All" tab
+GLOBAL_SEARCH_LIMIT = 200
+
 TOKEN_PARAM_OPTIONS = ["apikey", "key", "api_key", "access_token", "token", "tk"]
 DEFAULT_TOKEN_PARAM = TOKEN_PARAM_OPTIONS[0]
 
@@ -475,6 +478,42 @@ class _StyleCacheValidationTask(QgsTask):
             )
 
 
+class _GridPreviews:
+    """Deferred preview requests of the cards of one gallery grid.
+
+    Cards register the preview request they need when they are added; the
+    request is only issued once the card enters or approaches the viewport.
+
+    Parameters
+    ----------
+    scope : str
+        Preview request scope of the grid (see
+        :meth:`PreviewManager.begin_scope`).
+    """
+
+    def __init__(self, scope: str) -> None:
+        self.scope = scope
+        # Preview key -> call that requests it, until the preview arrives
+        self.requests: dict[str, Callable[[], None]] = {}
+        # Preview key -> cards that show it
+        self.items: dict[str, list[QListWidgetItem]] = {}
+        # Keys requested from the preview manager and not answered yet
+        self.issued: set[str] = set()
+
+    def add(
+        self, key: str, item: QListWidgetItem, request: Callable[[], None]
+    ) -> None:
+        """Register *item* as showing preview *key*, fetched by *request*."""
+        self.items.setdefault(key, []).append(item)
+        self.requests.setdefault(key, request)
+
+    def clear(self) -> None:
+        """Forget all cards (the grid is being repopulated)."""
+        self.requests.clear()
+        self.items.clear()
+        self.issued.clear()
+
+
 class BasemapsDialog(QDialog, UIBasemapsBase):
     def __init__(self, iface, parent=None):
         super(BasemapsDialog, self).__init__(parent)
@@ -482,6 +521,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         self.setupUi(self)
         self.providers_data = []
         self.resources_dir = Path(__file__).parent / "resources"
+        self._catalog = get_catalog_service()
         self.icons_dir = self.resources_dir / "icons"
 
         # Task management for async WMS/WMTS fetching
@@ -522,6 +562,24 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             grid_view.setWordWrap(True)
             grid_view.setMovement(QListView.Movement.Static)
             grid_view.setMouseTracking(True)
+        # Previews are requested only for cards on or near the screen, the
+        # visible ones first; re-evaluated once scrolling, resizing or
+        # (re)population settles
+        self._grid_previews = {
+            self.listBasemapsGrid: _GridPreviews("xyz"),
+            self.listWmsLayersGrid: _GridPreviews("wms"),
+        }
+        # Preview shown by the detail panel, kept requested whatever the
+        # grids show (e.g. in list view)
+        self._detail_preview_key = ""
+        self._grid_priority_timer = QTimer(self)
+        self._grid_priority_timer.setSingleShot(True)
+        self._grid_priority_timer.setInterval(GRID_PRIORITY_DELAY_MS)
+        self._grid_priority_timer.timeout.connect(self._request_visible_previews)
+        for grid_view in (self.listBasemapsGrid, self.listWmsLayersGrid):
+            scroll_bar = grid_view.verticalScrollBar()
+            scroll_bar.valueChanged.connect(self._schedule_preview_requests)
+            scroll_bar.rangeChanged.connect(self._schedule_preview_requests)
         self.xyz_grid_delegate.tagBadgeClicked.connect(self._on_xyz_badge_clicked)
         self.wms_grid_delegate.tagBadgeClicked.connect(self._on_wms_badge_clicked)
 
@@ -602,6 +660,9 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         # Tag filter state
         self._active_tag: str = "All"
+        # Tag indexes of the providers whose items are listed
+        self._xyz_tag_index: TagIndex | None = None
+        self._wms_tag_index: TagIndex | None = None
 
         # Search filter state
         self._search_text_xyz: str = ""
@@ -618,13 +679,21 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         self.searchBasemaps.textChanged.connect(self._on_xyz_search_changed)
         self.searchWmsLayers.textChanged.connect(self._on_wms_search_changed)
 
+        # Cross-provider search tab
+        self._setup_global_search()
+
         # Load configurations
         self.load_default_basemaps()
         self.load_user_basemaps()
 
-        # Apply persisted tag overrides for default-provider items
-        self._tag_overrides = config_loader.load_tag_overrides(self.resources_dir)
-        config_loader.apply_tag_overrides(self.providers_data, self._tag_overrides)
+        # Tag overrides are loaded and applied once by the shared catalog
+        self._tag_overrides = self._catalog.tag_overrides()
+
+        # Follow external edits, so that saving never writes stale providers
+        # back over them
+        self._catalog.provider_changed.connect(self._on_catalog_provider_changed)
+        self._catalog.provider_removed.connect(self._on_catalog_provider_removed)
+        self._catalog.catalog_reset.connect(self._on_catalog_reset)
 
         # Select first selectable provider by default in both tabs
         for i in range(self.listProviders.count()):
@@ -660,6 +729,9 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         self.listProviders.itemSelectionChanged.connect(self._refresh_detail_panel)
         self.listWmsProviders.itemSelectionChanged.connect(self._refresh_detail_panel)
         self.tabWidget.currentChanged.connect(self._on_detail_tab_changed)
+        self.tabWidget.currentChanged.connect(self._schedule_preview_requests)
+        self.tabBasemapsView.currentChanged.connect(self._schedule_preview_requests)
+        self.tabWmsView.currentChanged.connect(self._schedule_preview_requests)
 
     def tr(self, message):
         """Get the translation for a string using Qt translation API."""
@@ -687,7 +759,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         """
         if tag == "All":
             return True
-        if not item_data or not isinstance(item_data, dict):
+        if not item_data or not isinstance(item_data, Mapping):
             return False
         item_tags = item_data.get("tags", [])
         return self._tag_list_matches(item_tags, tag)
@@ -727,23 +799,6 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         return active_tag in normalized_tags
 
-    @staticmethod
-    def _sort_key_by_tag(item: dict) -> int:
-        """Return sort key for a basemap/layer based on its tags.
-
-        Items are ordered by the first matching tag in TAG_SORT_ORDER.
-        Items without a recognized tag are placed at the end.
-        """
-        if not isinstance(item, dict):
-            return len(TAG_SORT_ORDER)
-        item_tags = item.get("tags", [])
-        if not item_tags:
-            return len(TAG_SORT_ORDER)
-        for tag in item_tags:
-            if tag in TAG_SORT_ORDER:
-                return TAG_SORT_ORDER.index(tag)
-        return len(TAG_SORT_ORDER)
-
     def _tree_item_hidden_by_tag(self, tree_item: QTreeWidgetItem, tag: str) -> bool:
         """Check if a tree item should be hidden based on tag filtering.
 
@@ -768,7 +823,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             return False
 
         item_data = tree_item.data(0, user_role)
-        if item_data and isinstance(item_data, dict):
+        if item_data and isinstance(item_data, Mapping):
             item_tags = item_data.get("tags", [])
             if self._tag_list_matches(item_tags, tag):
                 for i in range(tree_item.childCount()):
@@ -804,6 +859,49 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             return True
         return search_text in text.lower()
 
+    def _search_hits(
+        self, provider_list: QListWidget, search_text: str
+    ) -> set[str] | None:
+        """Return item names of the current provider that match the search.
+
+        Parameters
+        ----------
+        provider_list : QListWidget
+            ``listProviders`` or ``listWmsProviders``.
+        search_text : str
+            Search text (empty = no filter).
+
+        Returns
+        -------
+        set[str] | None
+            Names answered by the catalog search index, or ``None`` when
+            there is no query or the provider is not in the catalog (e.g.
+            not saved yet), in which case display text is matched instead.
+        """
+        if not search_text:
+            return None
+        current_item = provider_list.currentItem()
+        provider_data = current_item.data(user_role) if current_item else None
+        if not provider_data or "data" not in provider_data:
+            return None
+        provider = provider_data["data"]
+        provider_type = provider.get("type") or ""
+        provider_name = provider.get("name") or ""
+        if self._catalog.find_provider(provider_type, provider_name) is None:
+            return None
+        return {
+            ref[2]
+            for ref in self._catalog.search(search_text, provider_type, provider_name)
+        }
+
+    def _item_matches(
+        self, data: dict | None, text: str, search_text: str, hits: set[str] | None
+    ) -> bool:
+        """Check an item against the search, via index *hits* when available."""
+        if hits is None:
+            return self._search_matches(text, search_text)
+        return isinstance(data, Mapping) and item_name(data) in hits
+
     def _on_xyz_search_changed(self, text: str) -> None:
         """Handle XYZ search box text changes."""
         self._search_text_xyz = text
@@ -831,66 +929,133 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         """
         if active_tag == "All":
             return True
-        items = provider.get("basemaps", []) or provider.get("layers", [])
-        return any(
-            self._tag_list_matches(item.get("tags", []), active_tag) for item in items
-        )
+        # The catalog's tag histogram includes the Overlay roll-up and keeps
+        # lazy providers unloaded
+        return self._catalog.tag_counts(provider).get(active_tag, 0) > 0
+
+    def _row_visible(
+        self,
+        item_id: int | None,
+        row_data: Callable[[], Any],
+        text: str,
+        tag_ids: frozenset[int] | None,
+        search_text: str,
+        hits: set[str] | None,
+    ) -> bool:
+        """Check a basemap/layer row against the active tag and the search.
+
+        Parameters
+        ----------
+        item_id : int | None
+            The row's id in the listed provider's tag index, if any.
+        row_data : Callable[[], Any]
+            Returns the row's item data; only called when the indexes
+            cannot answer, since converting Qt item data is not free.
+        text : str
+            Row display text.
+        tag_ids : frozenset[int] | None
+            Ids matching the active tag (``None`` = no tag index).
+        search_text : str
+            Lowercase search text (empty = no filter).
+        hits : set[str] | None
+            Item names matching the search (see :meth:`_search_hits`).
+
+        Returns
+        -------
+        bool
+            True if the row should be shown.
+        """
+        if self._active_tag != "All":
+            if tag_ids is not None and item_id is not None:
+                if item_id not in tag_ids:
+                    return False
+            elif not self._tag_matches(row_data(), self._active_tag):
+                return False
+        if not search_text:
+            return True
+        if hits is None:
+            return self._search_matches(text, search_text)
+        data = row_data()
+        return isinstance(data, Mapping) and item_name(data) in hits
+
+    @staticmethod
+    def _set_hidden(item: QListWidgetItem | QTreeWidgetItem, hidden: bool) -> None:
+        """Hide or show *item*, leaving rows whose state is unchanged alone."""
+        if item.isHidden() != hidden:
+            item.setHidden(hidden)
 
     def _apply_tag_filter(self) -> None:
-        """Filter displayed basemaps/layers/providers based on active tag and search."""
+        """Filter displayed basemaps/layers/providers based on active tag and search.
+
+        Basemap/layer rows are matched through the listed provider's
+        :class:`TagIndex` and only rows whose visibility changes are updated.
+        """
         active_tag = self._active_tag
         search_xyz = (self._search_text_xyz or "").lower()
         search_wms = (self._search_text_wms or "").lower()
+        hits_xyz = self._search_hits(self.listProviders, search_xyz)
+        hits_wms = self._search_hits(self.listWmsProviders, search_wms)
+        tag_ids_xyz = (
+            self._xyz_tag_index.ids(active_tag) if self._xyz_tag_index else None
+        )
+        tag_ids_wms = (
+            self._wms_tag_index.ids(active_tag) if self._wms_tag_index else None
+        )
 
-        # Filter XYZ providers
-        for i in range(self.listProviders.count()):
-            item = self.listProviders.item(i)
-            item_data = item.data(user_role)
-            if item_data and "data" in item_data:
-                provider = item_data["data"]
-                has_match = self._provider_has_matching_items(provider, active_tag)
-                item.setHidden(not has_match)
-
-        # Filter XYZ basemaps (list + grid)
-        for widget in [self.listBasemaps, self.listBasemapsGrid]:
+        # Filter providers
+        for provider_list in [self.listProviders, self.listWmsProviders]:
+            for i in range(provider_list.count()):
+                item = provider_list.item(i)
+                item_data = item.data(user_role)
+                if item_data and "data" in item_data:
+                    provider = item_data["data"]
+                    has_match = self._provider_has_matching_items(provider, active_tag)
+                    self._set_hidden(item, not has_match)
+
+        # Filter XYZ basemaps (list + grid) and WMS layers (grid)
+        for widget, tag_ids, search_text, hits in [
+            (self.listBasemaps, tag_ids_xyz, search_xyz, hits_xyz),
+            (self.listBasemapsGrid, tag_ids_xyz, search_xyz, hits_xyz),
+            (self.listWmsLayersGrid, tag_ids_wms, search_wms, hits_wms),
+        ]:
             for i in range(widget.count()):
                 item = widget.item(i)
-                data = item.data(user_role)
-                item.setHidden(
-                    not (
-                        self._tag_matches(data, active_tag)
-                        and self._search_matches(item.text(), search_xyz)
-                    )
+                visible = self._row_visible(
+                    item.data(ITEM_ID_ROLE),
+                    lambda item=item: item.data(user_role),
+                    item.text(),
+                    tag_ids,
+                    search_text,
+                    hits,
                 )
+                self._set_hidden(item, not visible)
 
-        # Filter WMS providers
-        for i in range(self.listWmsProviders.count()):
-            item = self.listWmsProviders.item(i)
-            item_data = item.data(user_role)
-            if item_data and "data" in item_data:
-                provider = item_data["data"]
-                has_match = self._provider_has_matching_items(provider, active_tag)
-                item.setHidden(not has_match)
-
-        # Filter WMS layers (tree + grid)
+        # Filter WMS layers (tree)
         for i in range(self.treeWmsLayers.topLevelItemCount()):
             top_item = self.treeWmsLayers.topLevelItem(i)
-            hidden = self._tree_item_hidden_by_tag(top_item, active_tag)
-            if not hidden and search_wms:
-                item_text = top_item.text(0).lower() if top_item.text(0) else ""
-                if search_wms not in item_text:
-                    hidden = True
-            top_item.setHidden(hidden)
-
-        for i in range(self.listWmsLayersGrid.count()):
-            item = self.listWmsLayersGrid.item(i)
-            data = item.data(user_role)
-            item.setHidden(
-                not (
-                    self._tag_matches(data, active_tag)
-                    and self._search_matches(item.text(), search_wms)
+            item_id = top_item.data(0, ITEM_ID_ROLE)
+            if item_id is None:
+                # Nested rows without a tag index id
+                hidden = self._tree_item_hidden_by_tag(top_item, active_tag)
+                if not hidden and search_wms:
+                    hidden = not self._item_matches(
+                        top_item.data(0, user_role),
+                        top_item.text(0) or "",
+                        search_wms,
+                        hits_wms,
+                    )
+            else:
+                hidden = not self._row_visible(
+                    item_id,
+                    lambda item=top_item: item.data(0, user_role),
+                    top_item.text(0) or "",
+                    tag_ids_wms,
+                    search_wms,
+                    hits_wms,
                 )
-            )
+            self._set_hidden(top_item, hidden)
+
+        self._schedule_preview_requests()
 
     def _get_user_separator_index(self) -> int:
         """Get the index of User separator in providers_data.
@@ -940,15 +1105,26 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
     def reject(self):
         """Called when dialog is closed or cancelled."""
         if hasattr(self, "preview_manager"):
-            self.preview_manager.cleanup()
+            self._stop_previews()
         super().reject()
 
     def closeEvent(self, event):
         """Handle window close button."""
         if hasattr(self, "preview_manager"):
-            self.preview_manager.cleanup()
+            self._stop_previews()
         super().closeEvent(event)
 
+    def showEvent(self, event):
+        """Request the previews of the cards shown when the dialog opens."""
+        super().showEvent(event)
+        self._schedule_preview_requests()
+
+    def _stop_previews(self) -> None:
+        """Drop all preview work; cards re-request when shown again."""
+        self.preview_manager.cleanup()
+        for grid_previews in self._grid_previews.values():
+            grid_previews.issued.clear()
+
     def _duplicate_provider_as_user(
         self, provider: dict[str, Any], suffix: str | None = None
     ) -> dict[str, Any]:
@@ -979,7 +1155,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         import copy
         import time
 
-        new_provider = copy.deepcopy(provider)
+        new_provider = copy.deepcopy(self._catalog.ensure_items(provider))
 
         # Generate unique name
         base_name = f"{provider['name']}{suffix}"
@@ -1002,11 +1178,9 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         return new_provider
 
     def load_default_basemaps(self):
-        """Load default basemap configurations."""
+        """Load default basemap configurations from the shared catalog."""
         try:
-            providers = config_loader.load_all_provider_files(
-                self.resources_dir, "default"
-            )
+            providers = self._catalog.default_providers()
 
             if providers:
                 Logger.info(
@@ -1028,22 +1202,14 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             )
 
     def load_user_basemaps(self):
-        """Load user basemap configurations."""
+        """Load user basemap configurations from the shared catalog."""
         try:
-            providers = config_loader.load_all_provider_files(
-                self.resources_dir, "user"
-            )
+            # Already sorted by creation time (oldest first, undated first)
+            providers = self._catalog.user_providers()
             if providers:
-                providers_with_time = [p for p in providers if "created_at" in p]
-                providers_without_time = [p for p in providers if "created_at" not in p]
-                # Sort providers by creation time (oldest first)
-                # Providers without created_at will be placed at the beginning
-                providers_with_time.sort(key=lambda x: x["created_at"])
-                sorted_providers = providers_without_time + providers_with_time
-
                 # Add separator to distinguish default from user providers
                 self.providers_data.append(user_separator)
-                self.providers_data.extend(sorted_providers)
+                self.providers_data.extend(providers)
                 Logger.info(f"Loaded {len(providers)} user providers")
                 self.update_providers_list()
         except Exception as e:
@@ -1054,6 +1220,96 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 self,
             )
 
+    def _find_provider_index(self, provider_type: str, name: str) -> int:
+        """Return the index of a provider in providers_data, or -1."""
+        for i, p in enumerate(self.providers_data):
+            if p.get("type") == provider_type and p.get("name") == name:
+                return i
+        return -1
+
+    def _on_catalog_provider_changed(self, provider_type: str, name: str) -> None:
+        """Swap in a provider that the catalog added or re-read from disk."""
+        provider = self._catalog.find_provider(provider_type, name)
+        if provider is None:
+            return
+        index = self._find_provider_index(provider_type, name)
+        if index >= 0:
+            if self.providers_data[index] is provider:
+                return  # Our own edit, published by the catalog
+            self.providers_data[index] = provider
+        elif self._is_default_provider(provider):
+            user_separator_index = self._get_user_separator_index()
+            if user_separator_index < 0:
+                self.providers_data.append(provider)
+            else:
+                self.providers_data.insert(user_separator_index, provider)
+        else:
+            if self._get_user_separator_index() < 0:
+                self.providers_data.append(user_separator)
+            self.providers_data.append(provider)
+        self._refresh_providers_list({(provider_type, name)})
+
+    def _on_catalog_provider_removed(self, provider_type: str, name: str) -> None:
+        """Drop a provider whose file was deleted or no longer defines it."""
+        index = self._find_provider_index(provider_type, name)
+        if index < 0:
+            return  # Removed by this dialog
+        del self.providers_data[index]
+        self._refresh_providers_list({(provider_type, name)})
+
+    def _on_catalog_reset(self) -> None:
+        """Take over every provider after the catalog reloaded from disk."""
+        default_providers = self._catalog.default_providers()
+        user_providers = self._catalog.user_providers()
+        self.providers_data = (
+            [default_separator] + default_providers if default_providers else []
+        )
+        if user_providers:
+            self.providers_data.append(user_separator)
+            self.providers_data.extend(user_providers)
+        self._tag_overrides = self._catalog.tag_overrides()
+        self._refresh_providers_list(None)
+
+    def _refresh_providers_list(self, affected: set[tuple[str, str]] | None) -> None:
+        """Rebuild the provider lists after a catalog change.
+
+        The selected providers stay selected.  Their basemaps or layers are
+        shown again only when they are *affected* (``None`` means all).
+
+        Parameters
+        ----------
+        affected : set[tuple[str, str]] | None
+            ``(type, name)`` of the providers that changed.
+        """
+        provider_lists = (
+            (self.listProviders, self.on_provider_changed),
+            (self.listWmsProviders, self.on_wms_provider_changed),
+        )
+
+        def provider_key(item) -> tuple[str, str] | None:
+            item_data = item.data(user_role) if item else None
+            if not item_data or "data" not in item_data:
+                return None
+            return item_data["data"].get("type"), item_data["data"].get("name")
+
+        selected = [provider_key(widget.currentItem()) for widget, _ in provider_lists]
+        for widget, _ in provider_lists:
+            widget.blockSignals(True)
+        try:
+            self.update_providers_list()
+            for (widget, _), key in zip(provider_lists, selected):
+                for i in range(widget.count()):
+                    if key is not None and provider_key(widget.item(i)) == key:
+                        widget.setCurrentItem(widget.item(i))
+                        break
+        finally:
+            for widget, _ in provider_lists:
+                widget.blockSignals(False)
+
+        for (_, on_changed), key in zip(provider_lists, selected):
+            if key is not None and (affected is None or key in affected):
+                on_changed()
+
     def import_providers(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -1205,6 +1461,8 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Save as YAML file (new default format)
                 yaml_path = Path(temp_dir) / "providers.yaml"
+                for provider in providers_to_export:
+                    self._catalog.ensure_items(provider)
                 config_loader.save_config_as_yaml(yaml_path, providers_to_export)
 
                 # Create ZIP file
@@ -1284,6 +1542,8 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         Saves user providers (those after User separator) to individual files in resources directory.
         Each provider gets its own file: resources/providers/user/{type}_{provider_name}.yaml
+        Unchanged providers are not rewritten, and files are written off the
+        GUI thread (see :meth:`CatalogService.save_user_providers`).
         """
         try:
             # Find User separator index (not Default separator)
@@ -1296,16 +1556,10 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 else []
             )
 
-            if not user_providers:
-                Logger.info("No user providers to save")
-                return
-
-            # Save each provider to its own file
-            saved_files = config_loader.save_providers_separately(
-                self.resources_dir, user_providers, prefix="user"
-            )
-
-            Logger.info(f"Saved {len(saved_files)} user provider files")
+            # The catalog writes only the providers that were added or
+            # edited, in the background, and publishes the new set so the
+            # Browser panel refreshes only what changed.
+            self._catalog.save_user_providers(user_providers)
 
         except Exception as e:
             Logger.critical(f"Failed to save user configuration: {e}")
@@ -1353,8 +1607,10 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 item.setData(user_role, {"index": i, "data": provider})
                 self.listWmsProviders.addItem(item)
             else:  # xyz type
-                # Ensure provider has basemaps field
-                if "basemaps" not in provider:
+                # Ensure provider has basemaps field (unless not loaded yet)
+                if "basemaps" not in provider and not self._catalog.has_lazy_items(
+                    provider
+                ):
                     provider["basemaps"] = []
 
                 item = QListWidgetItem(provider["name"])
@@ -1688,6 +1944,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         if not current_item:
             self.listBasemaps.clear()
             self.listBasemapsGrid.clear()
+            self._reset_grid_previews(self.listBasemapsGrid)
             self.btnEditBasemap.setEnabled(False)
             self.btnRemoveBasemap.setEnabled(False)
             self.btnEditProvider.setEnabled(False)
@@ -1701,6 +1958,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         # Clear immediately so old content disappears; populate deferred
         self.listBasemaps.clear()
         self.listBasemapsGrid.clear()
+        self._reset_grid_previews(self.listBasemapsGrid)
         self.listBasemaps.setIconSize(QSize(20, 20))
         self.btnEditBasemap.setEnabled(False)
         self.btnRemoveBasemap.setEnabled(False)
@@ -1717,11 +1975,11 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             if icon_file.exists():
                 provider_icon = make_rounded_icon(icon_file, size=20)
 
+        provider = self._catalog.ensure_items(provider)
+        self._xyz_tag_index = self._catalog.tag_index(provider)
         basemaps = [
-            bm
-            for bm in sorted(
-                provider_data["data"].get("basemaps", []), key=self._sort_key_by_tag
-            )
+            (item_id, bm)
+            for item_id, bm in self._xyz_tag_index.sorted_items()
             if isinstance(bm, dict)
             and "name" in bm
             and (
@@ -1733,13 +1991,14 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         CHUNK = 15
         self._xyz_version = getattr(self, "_xyz_version", 0) + 1
         version = self._xyz_version
+        grid_previews = self._grid_previews[self.listBasemapsGrid]
 
         def process_chunk(start: int):
             if self._xyz_version != version:
                 return
             end = min(start + CHUNK, len(basemaps))
             for i in range(start, end):
-                basemap = basemaps[i]
+                item_id, basemap = basemaps[i]
                 tile_type = basemap.get("tile_type", "raster")
                 if tile_type == "vector":
                     protocol = "vector"
@@ -1751,6 +2010,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 item = QListWidgetItem(basemap["name"])
                 item.setIcon(provider_icon)
                 item.setData(user_role, basemap)
+                item.setData(ITEM_ID_ROLE, item_id)
                 item.setToolTip(
                     self.tr("Double-click to load")
                 )
@@ -1758,6 +2018,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
                 grid_item = QListWidgetItem(basemap["name"])
                 grid_item.setData(user_role, basemap)
+                grid_item.setData(ITEM_ID_ROLE, item_id)
                 grid_item.setData(user_role + 10, provider_icon)
                 grid_item.setData(user_role + 12, protocol)
                 grid_item.setToolTip(self.tr("Double-click to load"))
@@ -1765,7 +2026,8 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 grid_item.setData(user_role + 11, bm_tags[0] if bm_tags else None)
                 self.listBasemapsGrid.addItem(grid_item)
 
-                # Issue preview inline (same as WMS)
+                # Preview is requested once the card scrolls into view
+                preview_key = f"{provider_name}_{basemap['name']}"
                 if tile_type == "vector":
                     preview_url = self._append_token(
                         basemap.get("url", ""), token, token_param
@@ -1774,12 +2036,18 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                         basemap.get("style_url", ""), token, token_param
                     )
                     if preview_url:
-                        self.preview_manager.request_vector_preview(
-                            provider_name,
-                            basemap["name"],
-                            preview_url,
-                            preview_style_url,
-                            is_default_provider,
+                        grid_previews.add(
+                            preview_key,
+                            grid_item,
+                            functools.partial(
+                                self.preview_manager.request_vector_preview,
+                                provider_name,
+                                basemap["name"],
+                                preview_url,
+                                preview_style_url,
+                                is_default_provider,
+                                scope=grid_previews.scope,
+                            ),
                         )
                 elif tile_type == "group":
                     # Composite preview: use the first vector source's tile
@@ -1807,24 +2075,37 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                                 basemap.get("style_url", ""), token, token_param
                             )
                         if preview_url:
-                            self.preview_manager.request_vector_preview(
-                                provider_name,
-                                basemap["name"],
-                                preview_url,
-                                preview_style_url,
-                                is_default_provider,
+                            grid_previews.add(
+                                preview_key,
+                                grid_item,
+                                functools.partial(
+                                    self.preview_manager.request_vector_preview,
+                                    provider_name,
+                                    basemap["name"],
+                                    preview_url,
+                                    preview_style_url,
+                                    is_default_provider,
+                                    scope=grid_previews.scope,
+                                ),
                             )
                 else:
                     preview_url = self._append_token(basemap["url"], token, token_param)
-                    self.preview_manager.request_preview(
-                        provider_name,
-                        basemap["name"],
-                        preview_url,
-                        "xyz",
-                        None,
-                        is_default_provider,
+                    grid_previews.add(
+                        preview_key,
+                        grid_item,
+                        functools.partial(
+                            self.preview_manager.request_preview,
+                            provider_name,
+                            basemap["name"],
+                            preview_url,
+                            "xyz",
+                            None,
+                            is_default_provider,
+                            scope=grid_previews.scope,
+                        ),
                     )
 
+            self._schedule_preview_requests()
             if end < len(basemaps):
                 QCoreApplication.processEvents()
                 QTimer.singleShot(5, lambda s=end: process_chunk(s))
@@ -1844,6 +2125,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         if not current_item:
             self.treeWmsLayers.clear()
             self.listWmsLayersGrid.clear()
+            self._reset_grid_previews(self.listWmsLayersGrid)
             self.btnEditWmsProvider.setEnabled(False)
             self.btnRemoveWmsProvider.setEnabled(False)
             return
@@ -1855,6 +2137,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         # Clear immediately so old content disappears; populate deferred
         self.treeWmsLayers.clear()
         self.listWmsLayersGrid.clear()
+        self._reset_grid_previews(self.listWmsLayersGrid)
         self.btnEditWmsProvider.setEnabled(False)
         self.btnRemoveWmsProvider.setEnabled(False)
 
@@ -1871,20 +2154,21 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         preview_url_base = self._append_token(provider["url"], token, token_param)
         provider_service_type = provider.get("service_type", "wms")
 
-        layers = sorted(
-            provider_data["data"].get("layers", []), key=self._sort_key_by_tag
-        )
+        provider = self._catalog.ensure_items(provider)
+        self._wms_tag_index = self._catalog.tag_index(provider)
+        layers = self._wms_tag_index.sorted_items()
 
         CHUNK = 15
         self._wms_version = getattr(self, "_wms_version", 0) + 1
         version = self._wms_version
+        grid_previews = self._grid_previews[self.listWmsLayersGrid]
 
         def process_chunk(start: int):
             if self._wms_version != version:
                 return
             end = min(start + CHUNK, len(layers))
             for i in range(start, end):
-                layer = layers[i]
+                item_id, layer = layers[i]
                 display_name = layer.get(
                     "layer_title",
                     layer.get("layer_name", self.tr("Unknown Layer")),
@@ -1893,6 +2177,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
                 layer_item = QTreeWidgetItem([display_name])
                 layer_item.setIcon(0, provider_icon)
+                layer_item.setData(0, ITEM_ID_ROLE, item_id)
                 layer_item.setToolTip(
                     0, self.tr("Double-click to load")
                 )
@@ -1904,19 +2189,20 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                     layer_item.setData(0, user_role, layer)
                 else:
                     layer_tags = layer.get("tags", [])
-                    default_config = {
-                        "layer_name": layer.get("layer_name"),
-                        "layer_title": layer.get("layer_title"),
-                        "crs": [crs_list[0]] if crs_list else [],
-                        "format": format_list if format_list else [],
-                        "styles": layer.get("styles", [""]),
-                        "service_type": provider_service_type,
-                        "tags": layer_tags,
-                    }
+                    default_config = LayerRecord(
+                        layer_name=layer.get("layer_name"),
+                        layer_title=layer.get("layer_title"),
+                        crs=[crs_list[0]] if crs_list else [],
+                        format=format_list if format_list else [],
+                        styles=layer.get("styles", [""]),
+                        service_type=provider_service_type,
+                        tags=layer_tags,
+                    )
                     layer_item.setData(0, user_role, default_config)
 
                 grid_item = QListWidgetItem(display_name)
                 grid_item.setData(user_role, layer)
+                grid_item.setData(ITEM_ID_ROLE, item_id)
                 grid_item.setData(user_role + 10, provider_icon)
                 grid_item.setData(user_role + 12, service_type)
                 grid_item.setToolTip(self.tr("Double-click to load"))
@@ -1924,15 +2210,23 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 grid_item.setData(user_role + 11, layer_tags[0] if layer_tags else None)
                 self.listWmsLayersGrid.addItem(grid_item)
 
-                self.preview_manager.request_preview(
-                    provider_name,
-                    display_name,
-                    preview_url_base,
-                    service_type,
-                    layer,
-                    is_default,
+                # Preview is requested once the card scrolls into view
+                grid_previews.add(
+                    f"{provider_name}_{display_name}",
+                    grid_item,
+                    functools.partial(
+                        self.preview_manager.request_preview,
+                        provider_name,
+                        display_name,
+                        preview_url_base,
+                        service_type,
+                        layer,
+                        is_default,
+                        scope=grid_previews.scope,
+                    ),
                 )
 
+            self._schedule_preview_requests()
             if end < len(layers):
                 QCoreApplication.processEvents()
                 QTimer.singleShot(5, lambda s=end: process_chunk(s))
@@ -1982,7 +2276,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         # Update basemap list
         self.listBasemaps.clear()
-        for basemap in provider_data["data"]["basemaps"]:
+        for basemap in self._catalog.ensure_items(provider)["basemaps"]:
             item = QListWidgetItem(basemap["name"])
             item.setIcon(provider_icon)
             item.setData(user_role, basemap)
@@ -2191,57 +2485,18 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                     break
             self.save_user_config()
 
-    def _save_tag_overrides(self, provider: dict[str, Any]) -> None:
-        """Persist tag edits to the tag overrides file (works for all providers)."""
-        provider_type = provider.get("type")
-        provider_name = provider.get("name")
-        if not provider_type or not provider_name:
-            return
-
-        entry: dict[str, dict[str, list[str]]] = {}
-        if provider_type == "xyz":
-            for bm in provider.get("basemaps", []):
-                tags = bm.get("tags", [])
-                if tags:
-                    entry[bm["name"]] = {"tags": list(tags)}
-        elif provider_type == "wms":
-            for layer in provider.get("layers", []):
-                tags = layer.get("tags", [])
-                if tags:
-                    entry[layer.get("layer_name", "")] = {"tags": list(tags)}
-
-        # Prune removed tags: if an item no longer has tags, remove its entry
-        self._tag_overrides.setdefault(provider_type, {})
-        existing = self._tag_overrides[provider_type].get(provider_name, {})
-        merged = {}
-        for item_name, override in entry.items():
-            merged[item_name] = override
-        # Keep entries for items not in the current provider (they may be from
-        # other providers with the same name – play it safe and only overwrite
-        # what we just edited)
-        for item_name, override in existing.items():
-            if item_name not in merged:
-                # Check if this item still exists in the provider and has tags
-                still_exists = False
-                if provider_type == "xyz":
-                    still_exists = any(
-                        bm.get("name") == item_name and bm.get("tags")
-                        for bm in provider.get("basemaps", [])
-                    )
-                elif provider_type == "wms":
-                    still_exists = any(
-                        layer.get("layer_name") == item_name and layer.get("tags")
-                        for layer in provider.get("layers", [])
-                    )
-                if still_exists:
-                    merged[item_name] = override
-
-        if merged:
-            self._tag_overrides[provider_type][provider_name] = merged
-        else:
-            self._tag_overrides[provider_type].pop(provider_name, None)
+    def _record_tag_edit(
+        self, provider: dict[str, Any], item_name: str, tags: list[str], save_mode: str
+    ) -> None:
+        """Persist a tag edit made in memory according to *save_mode*.
 
-        config_loader.save_tag_overrides(self.resources_dir, self._tag_overrides)
+        Edits are journaled by the catalog and written to the YAML files in
+        the background; a provider that has no file yet is saved whole.
+        """
+        if save_mode != "overrides" and not provider.get("source_file"):
+            self._save_to_provider_file(provider)
+            return
+        self._catalog.record_tag_edit(provider, item_name, tags, save_mode)
 
     def _save_to_provider_file(self, provider: dict[str, Any]) -> None:
         """Persist tag edits directly to the provider's config file.
@@ -2249,6 +2504,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         Also clears any stale overrides for this provider so that
         ``apply_tag_overrides`` does not overwrite the direct save on next load.
         """
+        provider = self._catalog.ensure_items(provider)
         source_file = provider.get("source_file")
         if source_file:
             config_loader.save_provider_to_path(Path(source_file), provider)
@@ -2260,16 +2516,10 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         # Remove any existing overrides for this provider — the config file is
         # now the source of truth, and we must not let stale overrides win.
-        provider_type = provider.get("type")
-        provider_name = provider.get("name")
-        if provider_type and provider_name:
-            type_overrides = self._tag_overrides.get(provider_type)
-            if type_overrides and provider_name in type_overrides:
-                del type_overrides[provider_name]
-                config_loader.save_tag_overrides(
-                    self.resources_dir,
-                    self._tag_overrides,
-                )
+        # Journaled, so tag_overrides.yaml is only written by the compaction.
+        self._catalog.clear_tag_overrides(provider)
+
+        self._catalog.notify_provider_changed(provider)
 
     def _edit_xyz_basemap_tags(self, basemap_data: dict) -> None:
         """Open tag-only editor for an XYZ basemap (from grid badge click)."""
@@ -2292,7 +2542,8 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         # Update in providers_data (use name match, not identity — same as WMS)
         provider_index = provider_data["index"]
         found = None
-        for bm in self.providers_data[provider_index].get("basemaps", []):
+        provider = self._catalog.ensure_items(self.providers_data[provider_index])
+        for bm in provider.get("basemaps", []):
             if isinstance(bm, dict) and bm.get("name") == basemap_name:
                 found = bm
                 break
@@ -2315,15 +2566,16 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                     item.setData(user_role + 11, new_tags[0] if new_tags else None)
                     break
 
-        self._apply_tag_filter()
-        self.listBasemapsGrid.viewport().update()
         # Use self.providers_data reference directly — the 'provider' variable
         # from QListWidgetItem.data() may be a stale QVariant copy
         canonical = self.providers_data[provider_index]
-        if save_mode == "overrides":
-            self._save_tag_overrides(canonical)
-        else:
-            self._save_to_provider_file(canonical)
+        self._record_tag_edit(canonical, basemap_name, new_tags, save_mode)
+
+        # Saving reports the change to the catalog, which drops the stale
+        # tag index; filter with the rebuilt one
+        self._xyz_tag_index = self._catalog.tag_index(canonical)
+        self._apply_tag_filter()
+        self.listBasemapsGrid.viewport().update()
 
     def edit_xyz_basemap(self):
         """edit XYZ basemap"""
@@ -3039,8 +3291,8 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         """
         updated = False
         item_data = item.data(0, user_role)
-        if isinstance(item_data, dict) and item_data.get("layer_name") == layer_name:
-            item_data = dict(item_data)
+        if isinstance(item_data, Mapping) and item_data.get("layer_name") == layer_name:
+            item_data = item_data.copy()
             item_data["tags"] = list(tags)
             item.setData(0, user_role, item_data)
             updated = True
@@ -3070,10 +3322,10 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             grid_item = self.listWmsLayersGrid.item(item_index)
             grid_data = grid_item.data(user_role)
             if (
-                isinstance(grid_data, dict)
+                isinstance(grid_data, Mapping)
                 and grid_data.get("layer_name") == layer_name
             ):
-                grid_data = dict(grid_data)
+                grid_data = grid_data.copy()
                 grid_data["tags"] = list(tags)
                 grid_item.setData(user_role, grid_data)
                 grid_item.setData(user_role + 11, tags[0] if tags else None)
@@ -3112,7 +3364,9 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
             # Find the exact layer in providers_data by name
             provider_index = provider_data["index"]
-            layers = self.providers_data[provider_index].get("layers", [])
+            layers = self._catalog.ensure_items(
+                self.providers_data[provider_index]
+            ).get("layers", [])
             found_lyr = None
             for lyr in layers:
                 if lyr.get("layer_name") == layer_name:
@@ -3145,19 +3399,17 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
             # opens with the just-saved tag without requiring a plugin reload.
             self._update_wms_layer_tags_in_views(layer_name, new_tags)
 
-            # Re-apply the tag filter to reflect changes
-            self._apply_tag_filter()
-            self.listWmsLayersGrid.viewport().update()
-            self.treeWmsLayers.viewport().update()
-
             # Persist tag edits
             # Use self.providers_data reference directly — 'provider' from
             # QListWidgetItem.data() may be a stale QVariant copy
             canonical = self.providers_data[provider_index]
-            if save_mode == "overrides":
-                self._save_tag_overrides(canonical)
-            else:
-                self._save_to_provider_file(canonical)
+            self._record_tag_edit(canonical, layer_name, new_tags, save_mode)
+
+            # Re-apply the tag filter with the rebuilt tag index
+            self._wms_tag_index = self._catalog.tag_index(canonical)
+            self._apply_tag_filter()
+            self.listWmsLayersGrid.viewport().update()
+            self.treeWmsLayers.viewport().update()
 
     def _on_xyz_badge_clicked(self, index: QModelIndex) -> None:
         """Handle click on tag badge in XYZ grid — open tag-only editor."""
@@ -3516,24 +3768,108 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
     def _on_preview_ready(self, key, image_path):
         """Handle preview image ready event."""
-        # Update grid views (both XYZ and WMS if they match the key)
+        # Update the grid cards showing this preview (XYZ and/or WMS);
         # key format is "{provider_name}_{layer_name}"
-        for grid_view in [self.listBasemapsGrid, self.listWmsLayersGrid]:
-            for i in range(grid_view.count()):
-                item = grid_view.item(i)
-                current_item_key = (
-                    f"{self._get_current_provider_name(grid_view)}_{item.text()}"
-                )
-                if current_item_key == key:
-                    pixmap = QPixmap(image_path)
-                    item.setData(Qt.ItemDataRole.DecorationRole, pixmap)
-                    # Trigger repaint
-                    grid_view.update()
+        pixmap = None
+        for grid_view, grid_previews in self._grid_previews.items():
+            items = grid_previews.items.get(key)
+            if not items:
+                continue
+            grid_previews.issued.discard(key)
+            grid_previews.requests.pop(key, None)
+            if pixmap is None:
+                pixmap = load_preview_pixmap(image_path)
+            for item in items:
+                item.setData(Qt.ItemDataRole.DecorationRole, pixmap)
+            # Trigger repaint
+            grid_view.update()
 
         # Refresh detail panel preview if visible
         if self._details_visible:
             self._refresh_detail_panel()
 
+    def _reset_grid_previews(self, grid_view: QListWidget) -> None:
+        """Forget the cards of *grid_view* and supersede their requests.
+
+        Queued previews of the provider being left are dropped; those
+        already downloading get :attr:`PreviewManager.SUPERSEDED_GRACE_MS`
+        to finish, so they still end up in the cache.
+        """
+        grid_previews = self._grid_previews[grid_view]
+        grid_previews.clear()
+        self.preview_manager.begin_scope(
+            grid_previews.scope, PreviewManager.SUPERSEDED_GRACE_MS
+        )
+
+    def _schedule_preview_requests(self, *_args) -> None:
+        """(Re)start the timer that requests and re-prioritizes grid previews."""
+        self._grid_priority_timer.start()
+
+    def _request_visible_previews(self) -> None:
+        """Request the previews of the cards on or near the screen.
+
+        Cards in the viewport of the shown grid are fetched first, then
+        cards within one viewport height of it.  Queued requests of cards
+        that have left that range, or whose grid is not shown, are dropped
+        and issued again when the cards come back.
+        """
+        wanted = {}
+        for grid_view in (self.listBasemapsGrid, self.listWmsLayersGrid):
+            wanted[grid_view] = self._grid_preview_keys(grid_view)
+        detail_keys = [self._detail_preview_key] if self._detail_preview_key else []
+        self.preview_manager.prioritize_previews(
+            [key for visible, _ in wanted.values() for key in visible] + detail_keys,
+            [key for _, near in wanted.values() for key in near],
+        )
+        for grid_view, (visible_keys, near_keys) in wanted.items():
+            grid_previews = self._grid_previews[grid_view]
+            for key in visible_keys + near_keys:
+                request = grid_previews.requests.get(key)
+                if request is not None and key not in grid_previews.issued:
+                    grid_previews.issued.add(key)
+                    request()
+            released = grid_previews.issued.difference(
+                visible_keys, near_keys, detail_keys
+            )
+            if released:
+                grid_previews.issued.difference_update(
+                    self.preview_manager.cancel_queued_previews(released)
+                )
+
+    def _grid_preview_keys(
+        self, grid_view: QListWidget
+    ) -> tuple[list[str], list[str]]:
+        """Return the preview keys of the cards in and near the viewport.
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            Keys of the cards in the viewport and of those within one
+            viewport height of it, in card order; both empty when the grid
+            is not shown.
+        """
+        visible_keys: list[str] = []
+        near_keys: list[str] = []
+        if not grid_view.isVisible():
+            return visible_keys, near_keys
+        provider_name = self._get_current_provider_name(grid_view)
+        viewport = grid_view.viewport().rect()
+        margin = viewport.height()
+        near_rect = viewport.adjusted(0, -margin, 0, margin)
+        for row in range(grid_view.count()):
+            if grid_view.isRowHidden(row):
+                continue
+            item = grid_view.item(row)
+            rect = grid_view.visualItemRect(item)
+            # Icon mode lays cards out row by row in item order
+            if rect.top() > near_rect.bottom():
+                break
+            if rect.intersects(viewport):
+                visible_keys.append(f"{provider_name}_{item.text()}")
+            elif rect.intersects(near_rect):
+                near_keys.append(f"{provider_name}_{item.text()}")
+        return visible_keys, near_keys
+
     def _get_current_provider_name(self, grid_view):
         if grid_view == self.listBasemapsGrid:
             provider_list = self.listProviders
@@ -3642,6 +3978,128 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         self.tabBasemapsView.setCurrentIndex(index)
         self.tabBasemapsView.blockSignals(False)
 
+    # ── Global Search ─────────────────────────────────────────────
+
+    def _setup_global_search(self) -> None:
+        """Add the "Search All" tab that searches every provider at once.
+
+        Hits come from the catalog search index, so no provider's item list
+        is materialized until one of its hits is loaded.
+        """
+        self._global_search_icons: dict[str, QIcon] = {}
+
+        page = QWidget()
+        layout = QVBoxLayout(page)
+
+        search_row = QHBoxLayout()
+        search_row.addWidget(QLabel(self.tr("Search:")))
+        self.searchAll = QLineEdit()
+        self.searchAll.setPlaceholderText(
+            self.tr("Search basemaps and layers of all providers…")
+        )
+        self.searchAll.setClearButtonEnabled(True)
+        search_row.addWidget(self.searchAll)
+        layout.addLayout(search_row)
+
+        self.listGlobalResults = QListWidget()
+        self.listGlobalResults.setSelectionMode(extended_selection)
+        self.listGlobalResults.setIconSize(QSize(20, 20))
+        layout.addWidget(self.listGlobalResults, 1)
+
+        button_row = QHBoxLayout()
+        self.labelGlobalResults = QLabel()
+        button_row.addWidget(self.labelGlobalResults, 1)
+        self.btnLoadGlobalResult = QPushButton(self.tr("Load"))
+        self.btnLoadGlobalResult.setToolTip(
+            self.tr("Load selected result(s)\n(or double-click a result)")
+        )
+        self.btnLoadGlobalResult.setEnabled(False)
+        button_row.addWidget(self.btnLoadGlobalResult)
+        layout.addLayout(button_row)
+
+        self._global_search_tab = self.tabWidget.addTab(page, self.tr("Search All"))
+
+        self.searchAll.textChanged.connect(self._on_global_search_changed)
+        self.listGlobalResults.itemSelectionChanged.connect(
+            lambda: self.btnLoadGlobalResult.setEnabled(
+                bool(self.listGlobalResults.selectedItems())
+            )
+        )
+        self.listGlobalResults.itemDoubleClicked.connect(self.load_global_results)
+        self.btnLoadGlobalResult.clicked.connect(self.load_global_results)
+        self.tabWidget.currentChanged.connect(self._on_global_search_tab_shown)
+
+    def _global_search_icon(self, provider: dict[str, Any]) -> QIcon:
+        """Return the (cached) rounded icon of *provider* for result rows."""
+        icon_name = provider.get("icon") or ""
+        icon = self._global_search_icons.get(icon_name)
+        if icon is None:
+            icon_file = self.icons_dir / icon_name if icon_name else None
+            if icon_file is not None and icon_file.exists():
+                icon = make_rounded_icon(icon_file, size=20)
+            else:
+                icon = make_rounded_icon(IconBasemaps, size=20)
+            self._global_search_icons[icon_name] = icon
+        return icon
+
+    def _on_global_search_tab_shown(self, index: int) -> None:
+        """Re-run the search; providers may have been edited in other tabs."""
+        if index == self._global_search_tab:
+            self._on_global_search_changed(self.searchAll.text())
+
+    def _on_global_search_changed(self, text: str) -> None:
+        """List the ranked hits of *text* across every provider."""
+        self.listGlobalResults.clear()
+        self.btnLoadGlobalResult.setEnabled(False)
+        if not text.strip():
+            self.labelGlobalResults.clear()
+            return
+
+        # One extra hit tells whether the list was truncated
+        hits = self._catalog.search(text, limit=GLOBAL_SEARCH_LIMIT + 1)
+        for ref in hits[:GLOBAL_SEARCH_LIMIT]:
+            provider_type, provider_name, name = ref
+            provider = self._catalog.find_provider(provider_type, provider_name)
+            if provider is None:
+                continue
+            title = self._catalog.item_title(ref) or name
+            item = QListWidgetItem(
+                self._global_search_icon(provider), f"{title}  —  {provider_name}"
+            )
+            item.setData(user_role, list(ref))
+            item.setToolTip(
+                f"{title}\n{provider_name} ({provider_type.upper()})\n"
+                + self.tr("Double-click to load")
+            )
+            self.listGlobalResults.addItem(item)
+
+        if len(hits) > GLOBAL_SEARCH_LIMIT:
+            self.labelGlobalResults.setText(
+                self.tr("First {} results shown").format(GLOBAL_SEARCH_LIMIT)
+            )
+        else:
+            self.labelGlobalResults.setText(
+                self.tr("{} result(s)").format(self.listGlobalResults.count())
+            )
+
+    def load_global_results(self) -> None:
+        """Load the selected search results into the project."""
+        from . import layer_loader
+
+        for item in self.listGlobalResults.selectedItems():
+            ref = item.data(user_role)
+            if not ref:
+                continue
+            found = self._catalog.find_item(tuple(ref))
+            if found is None:
+                Logger.warning(f"Search result no longer in catalog: {ref}")
+                continue
+            provider, item_data = found
+            if provider.get("type") == "xyz":
+                layer_loader.load_xyz_basemap(provider, item_data)
+            else:
+                layer_loader.load_wms_layer(provider, item_data)
+
     # ── Detail Panel ──────────────────────────────────────────────
 
     def _setup_detail_panel(self) -> None:
@@ -3796,7 +4254,9 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         current_tab = self.tabWidget.currentIndex()
 
-        if current_tab == 0:  # XYZ / Vector Tiles
+        if current_tab == self._global_search_tab:
+            self._render_empty_detail()
+        elif current_tab == 0:  # XYZ / Vector Tiles
             layer_data, protocol = self._get_current_xyz_layer()
             provider_data = self._get_current_provider(self.listProviders, "xyz")
             if layer_data:
@@ -3863,7 +4323,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 layer = item.data(0, user_role)
             else:
                 layer = item.data(user_role)
-            if isinstance(layer, dict):
+            if isinstance(layer, Mapping):
                 provider_data = self._get_current_provider(self.listWmsProviders, "wms")
                 if provider_data:
                     protocol = provider_data.get("service_type", "wms")
@@ -3886,6 +4346,10 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         key = f"{provider_data.get('name', '')}_{name}" if provider_data else f"_{name}"
         # Try to find a cached preview pixmap from the grid views
         pixmap = self._find_preview_pixmap(key)
+        self._detail_preview_key = "" if pixmap else key
+        if not pixmap:
+            # Cards off screen, or in list view, have not been requested
+            self._request_detail_preview(key)
         if pixmap:
             preview_w = max(100, self.detailsPanel.width() - 20)
             preview_h = int(preview_w * 0.6)
@@ -3978,11 +4442,11 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
         # CRS / Format (WMS/WMTS)
         crs = layer_data.get("crs", [])
         if crs:
-            crs_str = ", ".join(crs) if isinstance(crs, list) else str(crs)
+            crs_str = ", ".join(crs) if isinstance(crs, (list, tuple)) else str(crs)
             parts.append(self._info_row(self.tr("CRS"), self._esc(crs_str)))
         fmt = layer_data.get("format", [])
         if fmt:
-            fmt_str = ", ".join(fmt) if isinstance(fmt, list) else str(fmt)
+            fmt_str = ", ".join(fmt) if isinstance(fmt, (list, tuple)) else str(fmt)
             parts.append(self._info_row(self.tr("Format"), self._esc(fmt_str)))
 
         # Layer Metadata (from basemap config, inline in Layer Info)
@@ -4211,17 +4675,28 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
 
         *key* has the form ``"{provider_name}_{layer_name}"``.
         """
-        for grid_view in [self.listBasemapsGrid, self.listWmsLayersGrid]:
-            provider_name = self._get_current_provider_name(grid_view)
-            for i in range(grid_view.count()):
-                item = grid_view.item(i)
-                item_key = f"{provider_name}_{item.text()}"
-                if item_key == key:
-                    pix = item.data(Qt.ItemDataRole.DecorationRole)
-                    if isinstance(pix, QPixmap) and not pix.isNull():
-                        return pix
+        for grid_previews in self._grid_previews.values():
+            for item in grid_previews.items.get(key, ()):
+                pix = item.data(Qt.ItemDataRole.DecorationRole)
+                if isinstance(pix, QPixmap) and not pix.isNull():
+                    return pix
         return None
 
+    def _request_detail_preview(self, key: str) -> None:
+        """Issue the registered grid request of preview *key*, if any.
+
+        The detail panel shows the selected item's preview even when its
+        card is not on screen; :meth:`_on_preview_ready` refreshes the
+        panel once it arrives.
+        """
+        for grid_previews in self._grid_previews.values():
+            request = grid_previews.requests.get(key)
+            if request is not None and key not in grid_previews.issued:
+                grid_previews.issued.add(key)
+                request()
+                # Fetch it at the priority of the cards on screen
+                self._schedule_preview_requests()
+
     def _on_panel_link_clicked(self, link: str) -> None:
         """Handle clicks on links in the detail panel info text.
 
@@ -4249,7 +4724,7 @@ class BasemapsDialog(QDialog, UIBasemapsBase):
                 layer_data, _ = self._get_current_xyz_layer()
                 if layer_data:
                     self._edit_xyz_basemap_tags(layer_data)
-            else:  # WMS
+            elif current_tab != self._global_search_tab:  # WMS
                 self.edit_wms_layer_tags()
         else:
             from qgis.PyQt.QtGui import QDesktopServices
@@ -0,0 +1,43 @@
+"""Shared helpers for the Basemaps micro-benchmarks.
+
+The benchmarks import the plugin as a package, so they must run from a
+Python interpreter that can import ``qgis`` (e.g. the QGIS Python console
+or ``python-qgis``)::
+
+    python benchmarks/bench_catalog_startup.py
+"""
+
+from __future__ import annotations
+
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1]
+RESOURCES_DIR = PLUGIN_DIR / "resources"
+
+
+def plugin_module(name: str) -> ModuleType:
+    """Import ``<plugin package>.<name>`` regardless of the install folder name."""
+    if str(PLUGIN_DIR.parent) not in sys.path:
+        sys.path.insert(0, str(PLUGIN_DIR.parent))
+    return importlib.import_module(f"{PLUGIN_DIR.name}.{name}")
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> tuple[float, float]:
+    """Return the (median, min) wall time of *func* in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), min(samples)
+
+
+def report(label: str, median_ms: float, min_ms: float) -> None:
+    """Print one aligned benchmark result row."""
+    print(f"{label:<44} median {median_ms:9.2f} ms   min {min_ms:9.2f} ms")
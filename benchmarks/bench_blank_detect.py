@@ -0,0 +1,127 @@
+"""Blank-image detection benchmark for rendered vector previews.
+
+Compares, on synthetic 256×256 renders:
+
+* **reference** – the two-pass per-sample loop that
+  ``PreviewManager._is_blank_vector_preview_image`` used to run (one
+  ``QColor`` per sample; transcribed here onto the raw pixel words);
+* **python** – :func:`blank_detect.is_blank_python`;
+* **numpy** – :func:`blank_detect.is_blank_numpy`, when NumPy is installed.
+
+Every implementation must agree with the reference on every image; the
+set includes images just either side of the blank threshold and tied
+background colors.  Needs only the plugin's pure-Python modules, so it
+also runs outside QGIS.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+
+from _common import plugin_module, report, time_call
+
+blank_detect = plugin_module("blank_detect")
+
+SIZE = 256
+
+
+def reference(words: array, width: int, height: int, words_per_line: int) -> bool:
+    """Blank test as previously written, one pixel lookup per sample."""
+
+    def rgb(x: int, y: int) -> tuple[int, int, int]:
+        word = words[y * words_per_line + x]
+        return (word >> 16) & 0xFF, (word >> 8) & 0xFF, word & 0xFF
+
+    sample_counts: dict[tuple[int, int, int], int] = {}
+    for y in range(0, height, 4):
+        for x in range(0, width, 4):
+            key = rgb(x, y)
+            sample_counts[key] = sample_counts.get(key, 0) + 1
+    if not sample_counts:
+        return True
+
+    background = max(sample_counts.items(), key=lambda item: item[1])[0]
+    total_samples = 0
+    distinct_samples = 0
+    for y in range(0, height, 4):
+        for x in range(0, width, 4):
+            color = rgb(x, y)
+            total_samples += 1
+            delta = max(abs(c - b) for c, b in zip(color, background))
+            if delta > 25:
+                distinct_samples += 1
+    return distinct_samples / total_samples < 0.012
+
+
+def _sampled(colors: list[int]) -> array:
+    """An image whose samples, in row-major order, take *colors*.
+
+    Pixels that are not sampled keep the first color.
+    """
+    words = array("I", [0xFF000000 | colors[0]]) * (SIZE * SIZE)
+    for index, color in enumerate(colors):
+        y, x = divmod(index, SIZE // 4)
+        words[y * 4 * SIZE + x * 4] = 0xFF000000 | color
+    return words
+
+
+def _images() -> dict[str, array]:
+    rng = random.Random(42)
+    samples = (SIZE // 4) ** 2
+    threshold = int(samples * 0.012)
+    paper, ink = 0xF2EFE9, 0x202020
+    # Two equally frequent backgrounds 25 apart; the third color is close
+    # to the first but distinct from the second, so the tie decides
+    tied = (samples - 96) // 2
+    return {
+        "flat white": _sampled([0xFFFFFF]),
+        f"{threshold} distinct samples": _sampled(
+            [paper] * (samples - threshold) + [ink] * threshold
+        ),
+        f"{threshold + 1} distinct samples": _sampled(
+            [paper] * (samples - threshold - 1) + [ink] * (threshold + 1)
+        ),
+        "delta of 25 only": _sampled([0x808080, 0x808099] * (samples // 2)),
+        "tied backgrounds": _sampled(
+            [0x808080] * tied + [0x808099] * tied + [0x80806A] * 96
+        ),
+        "noise": array(
+            "I", (0xFF000000 | rng.getrandbits(24) for _ in range(SIZE * SIZE))
+        ),
+        "gradient": array(
+            "I",
+            (
+                0xFF000000 | (x << 16) | (y << 8)
+                for y in range(SIZE)
+                for x in range(SIZE)
+            ),
+        ),
+    }
+
+
+def main() -> None:
+    print(f"NumPy available: {blank_detect.HAS_NUMPY}")
+    implementations = {"python": blank_detect.is_blank_python}
+    if blank_detect.HAS_NUMPY:
+        implementations["numpy"] = blank_detect.is_blank_numpy
+
+    images = _images()
+    for name, words in images.items():
+        expected = reference(words, SIZE, SIZE, SIZE)
+        results = {
+            label: detect(words, SIZE, SIZE, SIZE)
+            for label, detect in implementations.items()
+        }
+        mismatches = [label for label, blank in results.items() if blank != expected]
+        status = f"!! differs: {', '.join(mismatches)}" if mismatches else "ok"
+        print(f"{name:<28} blank={expected!s:<6} {status}")
+
+    words = images["noise"]
+    report("reference", *time_call(lambda: reference(words, SIZE, SIZE, SIZE)))
+    for label, detect in implementations.items():
+        report(label, *time_call(lambda: detect(words, SIZE, SIZE, SIZE)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Startup benchmark for the provider catalog snapshot.
+
+Measures what ``BasemapsPlugin.initGui`` pays to load every default and
+user provider file:
+
+* **yaml** – parse every file with PyYAML (snapshot disabled).
+* **yaml, parallel** – the same with ``workers=4`` (threads with libyaml,
+  processes without).
+* **cold** – no snapshot on disk: parse YAML and write the snapshot.
+* **warm** – new process, snapshot on disk: one read, no YAML parsing.
+* **warm, index tier** – as warm, but default providers are loaded as the
+  lazy index (no ``basemaps``/``layers`` unpickled), as the catalog
+  service does at startup.
+
+The existing on-disk snapshot is restored when the benchmark finishes.
+"""
+
+from __future__ import annotations
+
+from _common import RESOURCES_DIR, plugin_module, report, time_call
+
+config_loader = plugin_module("config_loader")
+catalog_snapshot = plugin_module("catalog_snapshot")
+
+SNAPSHOT_PATH = RESOURCES_DIR / catalog_snapshot.SNAPSHOT_FILENAME
+
+
+def _load_all(use_snapshot: bool = True, workers: int = 0) -> int:
+    count = 0
+    for prefix in ("default", "user"):
+        count += len(
+            config_loader.load_all_provider_files(
+                RESOURCES_DIR, prefix, use_snapshot=use_snapshot, workers=workers
+            )
+        )
+    return count
+
+
+def _cold() -> None:
+    catalog_snapshot.reset_snapshots()
+    SNAPSHOT_PATH.unlink(missing_ok=True)
+    _load_all()
+
+
+def _warm() -> None:
+    catalog_snapshot.reset_snapshots()
+    _load_all()
+
+
+def _warm_index() -> None:
+    catalog_snapshot.reset_snapshots()
+    config_loader.load_provider_index(RESOURCES_DIR, "default")
+    config_loader.load_all_provider_files(RESOURCES_DIR, "user")
+
+
+def main() -> None:
+    backup = SNAPSHOT_PATH.read_bytes() if SNAPSHOT_PATH.exists() else None
+    try:
+        print(f"Providers loaded: {_load_all(use_snapshot=False)}")
+        report("yaml (snapshot disabled)", *time_call(lambda: _load_all(False)))
+        report(
+            "yaml, parallel (workers=4)",
+            *time_call(lambda: _load_all(False, workers=4)),
+        )
+        report("cold (parse + write snapshot)", *time_call(_cold))
+        report("warm (snapshot read only)", *time_call(_warm))
+        report("warm, index tier (lazy items)", *time_call(_warm_index))
+        print(f"Snapshot size: {SNAPSHOT_PATH.stat().st_size / 1024:.1f} KiB")
+    finally:
+        catalog_snapshot.reset_snapshots()
+        if backup is None:
+            SNAPSHOT_PATH.unlink(missing_ok=True)
+        else:
+            SNAPSHOT_PATH.write_bytes(backup)
+
+
+if __name__ == "__main__":
+    main()
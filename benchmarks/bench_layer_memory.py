@@ -0,0 +1,94 @@
+"""Memory report for WMS/WMTS layer records.
+
+Compares the footprint of every default WMS/WMTS layer held as
+
+* **dicts** – one dict plus its own ``crs``/``format``/``styles``/``tags``
+  lists per layer, as parsed from YAML (what the catalog used to keep);
+* **records** – :class:`layer_record.LayerRecord` with interned tuples.
+
+Sizes are deep sizes in which every object is counted once, so values
+shared between layers are only paid for once.  The name, title and URL
+strings are the same objects in both forms and are left out of both.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from _common import RESOURCES_DIR, plugin_module, report, time_call
+
+config_loader = plugin_module("config_loader")
+layer_record = plugin_module("layer_record")
+yaml_io = plugin_module("yaml_io")
+
+
+def _raw_layers() -> dict[str, list[dict]]:
+    """Return ``{file name: layer dicts}`` for every default WMS file."""
+    layers = {}
+    for path in sorted((RESOURCES_DIR / "providers" / "default").glob("wms_*.yaml")):
+        data = yaml_io.load_file(path) or {}
+        for provider in (data.get("wms") or {}).values():
+            layers.setdefault(path.name, []).extend(provider.get("layers") or [])
+    return layers
+
+
+def deep_size(obj: object, seen: set[int] | None = None) -> int:
+    """Return the size of *obj* and everything it references, each once."""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, layer_record.LayerRecord):
+            stack.extend(getattr(item, field) for field in layer_record.FIELDS)
+            if item._extra is not None:
+                stack.append(item._extra)
+    return total
+
+
+def main() -> None:
+    raw = _raw_layers()
+    print(f"{'file':<52}{'layers':>8}{'dicts KB':>11}{'records KB':>12}{'saved':>8}")
+    total_dicts = total_records = 0
+    for name, layers in raw.items():
+        records = [layer_record.LayerRecord(layer) for layer in layers]
+        # Strings are shared by both forms; count them on neither side
+        strings: set[int] = set()
+        for layer in layers:
+            strings.update(id(v) for v in layer.values() if isinstance(v, str))
+            strings.update(id(k) for k in layer)
+        dicts_size = deep_size(layers, set(strings))
+        records_size = deep_size(records, set(strings))
+        total_dicts += dicts_size
+        total_records += records_size
+        print(
+            f"{name:<52}{len(layers):>8}{dicts_size / 1024:>11.1f}"
+            f"{records_size / 1024:>12.1f}{1 - records_size / dicts_size:>8.0%}"
+        )
+    print(
+        f"{'total':<52}{sum(map(len, raw.values())):>8}{total_dicts / 1024:>11.1f}"
+        f"{total_records / 1024:>12.1f}{1 - total_records / total_dicts:>8.0%}"
+    )
+
+    nasa = max(raw.values(), key=len)
+    report(
+        f"build {len(nasa)} records",
+        *time_call(lambda: [layer_record.LayerRecord(layer) for layer in nasa]),
+    )
+    report(
+        f"copy {len(nasa)} dicts",
+        *time_call(lambda: [dict(layer) for layer in nasa]),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Encoder benchmark for preview thumbnails.
+
+Re-encodes every shipped default preview within a size budget with
+
+* **sweep** – PNG, then every scale in ``PREVIEW_SCALE_FACTORS`` times a
+  fixed list of JPEG qualities until one fits (what
+  ``PreviewManager._save_preview_image`` used to do);
+* **search** – :meth:`preview_manager.PreviewManager._compress_preview_image`,
+  which binary-searches quality, skips scales that cannot fit and keeps the
+  most faithful candidate; run once per lossy format Qt supports here
+  (``jpeg``, and ``webp`` when the WebP image plugin is installed).
+
+Reported per budget: encodes per preview (mean and worst case), mean
+fidelity (PSNR against the flattened source, in dB) and total time.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import statistics
+
+from _common import RESOURCES_DIR, plugin_module, report, time_call
+
+from qgis.PyQt.QtGui import QImage
+
+preview_manager = plugin_module("preview_manager")
+preview_store = plugin_module("preview_store")
+PreviewManager = preview_manager.PreviewManager
+
+SWEEP_QUALITIES = (85, 75, 65, 55, 45, 35, 25, 15, 8, 4, 1)
+BUDGETS = (PreviewManager.PREVIEW_MAX_BYTES, PreviewManager.PREVIEW_MAX_BYTES // 2)
+
+_encode = PreviewManager._encode_preview_image
+_encodes = 0
+
+
+def _counting_encode(image: QImage, image_format: str, quality: int = -1) -> bytes:
+    global _encodes
+    _encodes += 1
+    return _encode(image, image_format, quality)
+
+
+def sweep(image: QImage, max_bytes: int) -> bytes:
+    """Encode *image* the way previews were encoded before the search."""
+    png_bytes = PreviewManager._encode_preview_image(image, "PNG")
+    if png_bytes and len(png_bytes) <= max_bytes:
+        return png_bytes
+    rgb_image = PreviewManager._flatten_preview_image(image)
+    for scale_factor in PreviewManager.PREVIEW_SCALE_FACTORS:
+        scaled_image = PreviewManager._scaled_preview_image(rgb_image, scale_factor)
+        for quality in SWEEP_QUALITIES:
+            jpeg_bytes = PreviewManager._encode_preview_image(
+                scaled_image, "JPEG", quality
+            )
+            if jpeg_bytes and len(jpeg_bytes) <= max_bytes:
+                return jpeg_bytes
+    return b""
+
+
+def _images() -> list[QImage]:
+    """Return the shipped previews, from the loose files or else the pack."""
+    paths = sorted((RESOURCES_DIR / "previews" / "default").rglob("*.*"))
+    if not paths:
+        store = preview_store.get_preview_store(RESOURCES_DIR / "previews")
+        paths = [
+            store.root / key
+            for key in sorted(store.keys())
+            if key.startswith("default/") and store.is_pinned(store.root / key)
+        ]
+    images = []
+    for path in paths:
+        image = preview_manager.load_preview_image(path)
+        if not image.isNull():
+            images.append(image)
+    return images
+
+
+def _run(encoder, images: list[QImage], max_bytes: int) -> tuple[list[int], float]:
+    """Return the encodes per image and the mean fidelity of *encoder*."""
+    global _encodes
+    counts = []
+    fidelities = []
+    for image in images:
+        _encodes = 0
+        image_bytes = encoder(image, max_bytes)
+        counts.append(_encodes)
+        if image_bytes:
+            reference = PreviewManager._flatten_preview_image(image)
+            fidelity = PreviewManager._preview_fidelity(reference, image_bytes)
+            fidelities.append(min(fidelity, 99.0) if math.isinf(fidelity) else fidelity)
+    return counts, statistics.fmean(fidelities) if fidelities else 0.0
+
+
+def main() -> None:
+    images = _images()
+    print(f"Shipped previews: {len(images)}")
+    if not images:
+        return
+    PreviewManager._encode_preview_image = staticmethod(_counting_encode)
+    encoders = [("sweep", sweep)] + [
+        (
+            image_format.lower(),
+            functools.partial(
+                PreviewManager._compress_preview_image, image_formats=(image_format,)
+            ),
+        )
+        for image_format in reversed(preview_manager.preview_lossy_formats())
+    ]
+    try:
+        print(f"{'budget':>8}{'encoder':>9}{'encodes':>10}{'worst':>8}{'PSNR dB':>10}")
+        for max_bytes in BUDGETS:
+            for name, encoder in encoders:
+                counts, fidelity = _run(encoder, images, max_bytes)
+                print(
+                    f"{max_bytes:>8}{name:>9}{statistics.fmean(counts):>10.1f}"
+                    f"{max(counts):>8}{fidelity:>10.2f}"
+                )
+        for max_bytes in BUDGETS:
+            for name, encoder in encoders:
+                report(
+                    f"{name} {len(images)} previews <= {max_bytes} B",
+                    *time_call(
+                        lambda: [encoder(image, max_bytes) for image in images],
+                        repeat=3,
+                    ),
+                )
+    finally:
+        PreviewManager._encode_preview_image = staticmethod(_encode)
+
+
+if __name__ == "__main__":
+    main()
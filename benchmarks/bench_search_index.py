@@ -0,0 +1,77 @@
+"""Search benchmark for the catalog search index.
+
+Compares, over every default and user provider item:
+
+* **linear scan** – ``term in text.lower()`` over each item's name, title,
+  layer name, description and tags (what the dialog filter used to do).
+* **index** – :meth:`search_index.SearchIndex.search` on a prebuilt index.
+
+Index build time and the incremental re-index of the largest provider are
+reported as well.
+"""
+
+from __future__ import annotations
+
+from _common import RESOURCES_DIR, plugin_module, report, time_call
+
+config_loader = plugin_module("config_loader")
+search_index = plugin_module("search_index")
+
+QUERIES = ("blue marble", "osm", "sat", "terrain", "Overlay/Boundaries", "xyzzy")
+
+
+def _providers() -> list[dict]:
+    providers = []
+    for prefix in ("default", "user"):
+        providers += config_loader.load_all_provider_files(RESOURCES_DIR, prefix)
+    return providers
+
+
+def _items(provider: dict) -> list[dict]:
+    return provider.get("basemaps") or provider.get("layers") or []
+
+
+def _build(providers: list[dict]):
+    index = search_index.SearchIndex()
+    for provider in providers:
+        index.add_provider(provider, _items(provider))
+    return index
+
+
+def _linear(docs: list[str], query: str) -> int:
+    terms = query.lower().split()
+    return sum(all(t in doc for t in terms) for doc in docs)
+
+
+def main() -> None:
+    providers = _providers()
+    index = _build(providers)
+    docs = [
+        search_index._document(item)
+        for provider in providers
+        for item in _items(provider)
+        if isinstance(item, dict)
+    ]
+    print(f"Items indexed: {len(index)}")
+    report("build index", *time_call(lambda: _build(providers)))
+
+    largest = max(providers, key=lambda p: len(_items(p)))
+    report(
+        f"re-index {largest.get('name')} ({len(_items(largest))})",
+        *time_call(lambda: index.add_provider(largest, _items(largest))),
+    )
+
+    for query in QUERIES:
+        hits = len(index.search(query))
+        report(
+            f"linear scan  '{query}' ({hits})",
+            *time_call(lambda: _linear(docs, query), repeat=20),
+        )
+        report(
+            f"index        '{query}' ({hits})",
+            *time_call(lambda: index.search(query), repeat=20),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""YAML load/dump benchmark for the default provider files.
+
+Compares PyYAML's pure-Python ``SafeLoader``/``SafeDumper`` with the
+:mod:`yaml_io` layer (libyaml ``CSafeLoader``/``CSafeDumper`` when
+available) for every file in ``resources/providers/default``, and checks
+that both dumpers emit identical text.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import yaml
+from _common import RESOURCES_DIR, plugin_module, time_call
+
+yaml_io = plugin_module("yaml_io")
+
+
+class PureOrderedDumper(yaml.SafeDumper):
+    pass
+
+
+def _ordered(dumper, data):
+    return dumper.represent_mapping("tag:yaml.org,2002:map", data.items())
+
+
+PureOrderedDumper.add_representer(dict, _ordered)
+PureOrderedDumper.add_representer(OrderedDict, _ordered)
+
+DUMP_KWARGS = dict(
+    allow_unicode=True, default_flow_style=False, sort_keys=False, indent=2
+)
+
+
+def main(repeat: int = 3) -> None:
+    print(f"libyaml available: {yaml_io.HAS_LIBYAML}")
+    header = (
+        f"{'file':<48}{'KiB':>7}{'load py':>10}{'load io':>10}"
+        f"{'dump py':>10}{'dump io':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for path in sorted((RESOURCES_DIR / "providers" / "default").glob("*.yaml")):
+        raw = path.read_bytes()
+        data = yaml_io.safe_load(raw)
+        pure_text = yaml.dump(data, Dumper=PureOrderedDumper, **DUMP_KWARGS)
+        if pure_text != yaml_io.dump(data):
+            print(f"!! dump output differs for {path.name}")
+        row = [
+            time_call(lambda: yaml.load(raw, Loader=yaml.SafeLoader), repeat)[0],
+            time_call(lambda: yaml_io.safe_load(raw), repeat)[0],
+            time_call(
+                lambda: yaml.dump(data, Dumper=PureOrderedDumper, **DUMP_KWARGS),
+                repeat,
+            )[0],
+            time_call(lambda: yaml_io.dump(data), repeat)[0],
+        ]
+        totals = [t + r for t, r in zip(totals, row)]
+        print(
+            f"{path.name:<48}{len(raw) / 1024:>7.1f}"
+            + "".join(f"{ms:>10.1f}" for ms in row)
+        )
+    print("-" * len(header))
+    label = "total (ms, median per file)"
+    print(f"{label:<55}" + "".join(f"{ms:>10.1f}" for ms in totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Blank-image detection for rendered vector previews.
+
+A vector preview render can come back as a flat background (nothing
+loaded yet, wrong zoom, empty area), and
+:meth:`PreviewManager.render_vector_preview_image` then tries the next
+zoom/center combination.  The test runs after every render attempt:
+
+* every :data:`SAMPLE_STEP`-th pixel of every :data:`SAMPLE_STEP`-th row
+  is sampled;
+* the most frequent sampled RGB color is the background (ties go to the
+  color seen first in row-major order);
+* a sample is *distinct* when one of its channels differs from the
+  background by more than :data:`DISTINCT_DELTA`;
+* the image is blank when fewer than :data:`BLANK_RATIO` of the samples
+  are distinct.
+
+Pixels are read as 32-bit ``0xAARRGGBB`` words straight from the image
+buffer (``QImage.constBits()`` of a ``Format_RGB32``/``Format_ARGB32``
+image, in native byte order); alpha is ignored.  NumPy evaluates this in a
+few vectorized passes when it is installed; otherwise a pure-Python loop
+over the buffer gives the same result.
+
+This module has no QGIS dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # NumPy is optional
+    np = None
+    HAS_NUMPY = False
+
+SAMPLE_STEP = 4
+DISTINCT_DELTA = 25
+BLANK_RATIO = 0.012
+
+
+def is_blank(pixels: Any, width: int, height: int, words_per_line: int) -> bool:
+    """Return whether an image is effectively a flat background.
+
+    Parameters
+    ----------
+    pixels : Any
+        Buffer of the image's 32-bit pixels (anything supporting the buffer
+        protocol, e.g. a ``sip.voidptr`` with its size set).
+    width, height : int
+        Image size in pixels.
+    words_per_line : int
+        Row stride in 32-bit words (``bytesPerLine() // 4``).
+
+    Returns
+    -------
+    bool
+        ``True`` when almost no sample differs from the background.
+    """
+    if HAS_NUMPY:
+        return is_blank_numpy(pixels, width, height, words_per_line)
+    return is_blank_python(pixels, width, height, words_per_line)
+
+
+def is_blank_numpy(pixels: Any, width: int, height: int, words_per_line: int) -> bool:
+    """:func:`is_blank` evaluated with NumPy."""
+    if width <= 0 or height <= 0:
+        return True
+    words = np.frombuffer(pixels, dtype=np.uint32, count=words_per_line * height)
+    samples = words.reshape(height, words_per_line)[
+        ::SAMPLE_STEP, :width:SAMPLE_STEP
+    ].ravel() & np.uint32(0xFFFFFF)
+
+    colors, first_seen, counts = np.unique(
+        samples, return_index=True, return_counts=True
+    )
+    tied = counts == counts.max()
+    background = int(colors[tied][np.argmin(first_seen[tied])])
+
+    channels = np.empty((samples.size, 3), dtype=np.int16)
+    for index, shift in enumerate((16, 8, 0)):
+        channels[:, index] = (samples >> np.uint32(shift)) & np.uint32(0xFF)
+    reference = np.array(
+        [(background >> shift) & 0xFF for shift in (16, 8, 0)], dtype=np.int16
+    )
+    delta = np.abs(channels - reference).max(axis=1)
+    distinct = int(np.count_nonzero(delta > DISTINCT_DELTA))
+    return distinct / samples.size < BLANK_RATIO
+
+
+def is_blank_python(pixels: Any, width: int, height: int, words_per_line: int) -> bool:
+    """:func:`is_blank` evaluated in pure Python."""
+    if width <= 0 or height <= 0:
+        return True
+    words = memoryview(pixels).cast("B").cast("I")
+    samples = [
+        words[row + x] & 0xFFFFFF
+        for row in range(0, words_per_line * height, words_per_line * SAMPLE_STEP)
+        for x in range(0, width, SAMPLE_STEP)
+    ]
+
+    counts: dict[int, int] = {}
+    for color in samples:
+        counts[color] = counts.get(color, 0) + 1
+    # max() keeps the first of several equally frequent colors
+    background = max(counts.items(), key=lambda item: item[1])[0]
+    red, green, blue = background >> 16, (background >> 8) & 0xFF, background & 0xFF
+
+    distinct = 0
+    for color, count in counts.items():
+        delta = max(
+            abs((color >> 16) - red),
+            abs(((color >> 8) & 0xFF) - green),
+            abs((color & 0xFF) - blue),
+        )
+        if delta > DISTINCT_DELTA:
+            distinct += count
+    return distinct / len(samples) < BLANK_RATIO
@@ -37,6 +37,7 @@ during population — everything works from the on-disk YAML catalog.
 
 from __future__ import annotations
 
+import weakref
 from pathlib import Path
 from typing import Any
 
@@ -52,8 +53,11 @@ from qgis.core import (
 from qgis.PyQt.QtCore import QBuffer, QCoreApplication, QIODevice, Qt
 from qgis.PyQt.QtGui import QColor, QFont, QFontMetrics, QIcon, QPainter, QPixmap
 
-from . import config_loader, layer_loader
+from . import layer_loader
+from .catalog_service import get_catalog_service
 from .icon_utils import make_rounded_icon
+from .preview_manager import load_preview_pixmap
+from .preview_store import get_preview_store, safe_name
 from .style_cache import get_style_cache, safe_file_url
 
 # Qt5/Qt6 + QGIS enum-scope compatibility. The BrowserItemType and
@@ -102,38 +106,6 @@ _PREVIEWS_DIR = _RESOURCES_DIR / "previews"
 _XYZ_GROUP_KEY = "xyz"
 _WMS_GROUP_KEY = "wms"
 
-# Sort order for basemap/layer items within each provider, matching the
-# main dialog's TAG_SORT_ORDER so the Browser panel displays layers in
-# the same sequence.
-TAG_SORT_ORDER = [
-    "Satellite",
-    "Streets",
-    "Terrain",
-    "Thematic",
-    "Overlay/Labels",
-    "Overlay/Boundaries",
-    "Overlay/Transportation",
-    "Overlay/Hydrography",
-    "Overlay",
-]
-
-
-def _sort_key_by_tag(item: dict) -> int:
-    """Return sort key for a basemap/layer based on its tags.
-
-    Items are ordered by the first matching tag in TAG_SORT_ORDER.
-    Items without a recognized tag are placed at the end.
-    """
-    if not isinstance(item, dict):
-        return len(TAG_SORT_ORDER)
-    tags = item.get("tags", [])
-    if not tags:
-        return len(TAG_SORT_ORDER)
-    for tag in tags:
-        if tag in TAG_SORT_ORDER:
-            return TAG_SORT_ORDER.index(tag)
-    return len(TAG_SORT_ORDER)
-
 
 def _tr(message: str) -> str:
     """Translate a string in the BasemapsBrowser context."""
@@ -223,7 +195,7 @@ def _format_tooltip(
         )
 
     # --- Paint badges onto a scaled copy of the preview image. ---------------
-    src = QPixmap(str(preview))
+    src = load_preview_pixmap(preview)
     if src.isNull():
         return _wrap_tooltip(
             f'<p style="margin:0;"><nobr>{tag_spans}{type_span}</nobr></p>'
@@ -314,7 +286,7 @@ def _format_tooltip(
 
 
 def _preview_path(provider: dict[str, Any], layer_name: str) -> Path | None:
-    """Return the cached preview image path, or None if it does not exist."""
+    """Return the cached preview location, or None if it is not cached."""
     source = provider.get("source_file", "")
     is_default = "/providers/default/" in source.replace("\\", "/")
     prefix = "default" if is_default else "user"
@@ -326,72 +298,72 @@ def _preview_path(provider: dict[str, Any], layer_name: str) -> Path | None:
     else:
         subdir = "xyz"
 
-    safe_provider = "".join(c for c in provider.get("name", "") if c.isalnum())
-    safe_layer = "".join(c for c in layer_name if c.isalnum())
+    safe_provider = safe_name(provider.get("name", ""))
+    safe_layer = safe_name(layer_name)
     path = _PREVIEWS_DIR / prefix / subdir / f"{safe_provider}_{safe_layer}.png"
-    return path if path.exists() else None
-
-
-def _newest_provider_mtime() -> float:
-    """Return the newest modification time across all provider YAML files."""
-    newest = 0.0
-    for prefix in ("default", "user"):
-        d = _RESOURCES_DIR / "providers" / prefix
-        if not d.exists():
-            continue
-        for f in d.glob("*.yaml"):
-            try:
-                mt = f.stat().st_mtime
-                if mt > newest:
-                    newest = mt
-            except OSError:
-                continue
-    return newest
+    return path if get_preview_store(_PREVIEWS_DIR).contains(path) else None
 
 
-# Module-level catalog cache.  ``_load_catalog()`` checks file mtimes to
-# decide whether the cache is still valid, so external edits (manual,
-# git pull, etc.) are picked up automatically.
-_catalog_cache: list[dict[str, Any]] | None = None
-_catalog_cache_mtime: float = 0.0
+# Populated group items that follow catalog change notifications.  Weak so
+# items deleted by the Browser model are simply dropped.
+_live_groups: weakref.WeakSet = weakref.WeakSet()
+_catalog_signals_connected = False
 
 
 def _load_catalog() -> list[dict[str, Any]]:
-    """Load and merge default + user providers, applying tag overrides.
+    """Return default + user providers from the shared catalog service.
 
-    Results are cached in memory and only refreshed when any provider YAML
-    file has a newer modification time than the cached snapshot.
+    This is an in-memory lookup: external edits (manual, git pull, etc.)
+    are applied by the service's file watcher and arrive here as change
+    notifications.
     """
-    global _catalog_cache, _catalog_cache_mtime
+    _connect_catalog_signals()
+    return get_catalog_service().providers()
 
-    current_mtime = _newest_provider_mtime()
-    if _catalog_cache is not None and _catalog_cache_mtime >= current_mtime:
-        return _catalog_cache
 
-    providers: list[dict[str, Any]] = []
-    for prefix in ("default", "user"):
-        try:
-            providers.extend(
-                config_loader.load_all_provider_files(_RESOURCES_DIR, prefix)
-            )
-        except Exception:
-            # Loading must never crash the Browser; logged by config_loader.
+def preload_catalog() -> None:
+    """Warm the catalog cache so the first browser click is instant."""
+    _load_catalog()
+
+
+def _connect_catalog_signals() -> None:
+    """Subscribe the Browser tree to catalog change notifications once."""
+    global _catalog_signals_connected
+    if _catalog_signals_connected:
+        return
+    service = get_catalog_service()
+    service.provider_changed.connect(_on_catalog_provider_changed)
+    service.provider_removed.connect(_on_catalog_provider_removed)
+    service.catalog_reset.connect(_on_catalog_reset)
+    _catalog_signals_connected = True
+
+
+def _iter_live_groups(provider_type: str | None = None):
+    from qgis.PyQt import sip
+
+    for group in list(_live_groups):
+        if sip.isdeleted(group):
             continue
+        if provider_type is None or group._group_key == provider_type:
+            yield group
 
-    try:
-        overrides = config_loader.load_tag_overrides(_RESOURCES_DIR)
-        config_loader.apply_tag_overrides(providers, overrides)
-    except Exception:
-        pass
 
-    _catalog_cache = providers
-    _catalog_cache_mtime = current_mtime
-    return _catalog_cache
+def _on_catalog_provider_changed(provider_type: str, name: str) -> None:
+    provider = get_catalog_service().find_provider(provider_type, name)
+    if provider is None:
+        return
+    for group in _iter_live_groups(provider_type):
+        group.update_provider(name, provider)
 
 
-def preload_catalog() -> None:
-    """Warm the catalog cache so the first browser click is instant."""
-    _load_catalog()
+def _on_catalog_provider_removed(provider_type: str, name: str) -> None:
+    for group in _iter_live_groups(provider_type):
+        group.update_provider(name, None)
+
+
+def _on_catalog_reset() -> None:
+    for group in _iter_live_groups():
+        group.rebuild()
 
 
 # ---------------------------------------------------------------------------
@@ -667,6 +639,53 @@ class GroupCollectionItem(QgsDataCollectionItem):
             children.append(item)
         return children
 
+    def _provider_child(self, name: str) -> ProviderCollectionItem | None:
+        for child in self.children():
+            if isinstance(child, ProviderCollectionItem) and child.name() == name:
+                return child
+        return None
+
+    def update_provider(self, name: str, provider: dict[str, Any] | None) -> None:
+        """Apply a single-provider catalog change to the populated children.
+
+        Parameters
+        ----------
+        name : str
+            Provider name.
+        provider : dict[str, Any] | None
+            New provider data, or ``None`` when the provider was removed.
+        """
+        if self.state() != _STATE_POPULATED:
+            # Not expanded yet – populate() will read the fresh catalog.
+            return
+        child = self._provider_child(name)
+        if provider is None:
+            if child is not None:
+                self.deleteChildItem(child)
+            return
+        if child is not None:
+            child.set_provider(provider)
+            return
+
+        from qgis.PyQt import sip
+
+        catalog = _load_catalog()
+        item = ProviderCollectionItem(self, provider)
+        item.setSortKey(
+            next((i for i, p in enumerate(catalog) if p is provider), len(catalog))
+        )
+        sip.transferto(item, self)
+        self.addChildItem(item, refresh=True)
+
+    def rebuild(self) -> None:
+        """Replace all provider children after a full catalog reload."""
+        if self.state() != _STATE_POPULATED:
+            return
+        for child in list(self.children()):
+            self.deleteChildItem(child)
+        for child in self._build_children():
+            self.addChildItem(child, refresh=True)
+
     def createChildren(self):
         # Return empty – children are built synchronously in populate().
         # In QGIS 3.28+ createChildren() runs in a background worker thread;
@@ -690,6 +709,7 @@ class GroupCollectionItem(QgsDataCollectionItem):
         for child in self._build_children():
             self.addChildItem(child, refresh=False)
         self.setState(_STATE_POPULATED)
+        _live_groups.add(self)
 
     def capabilities2(self):
         """Remove Collapse so QGIS does not refuse to expand this node."""
@@ -715,6 +735,17 @@ class ProviderCollectionItem(QgsDataCollectionItem):
         self._provider = provider
         self.setIcon(_provider_icon(provider.get("icon", "")))
 
+    def set_provider(self, provider: dict[str, Any]) -> None:
+        """Swap in updated provider data and rebuild expanded layer children."""
+        self._provider = provider
+        self.setIcon(_provider_icon(provider.get("icon", "")))
+        if self.state() != _STATE_POPULATED:
+            return
+        for child in list(self.children()):
+            self.deleteChildItem(child)
+        for child in self._build_children():
+            self.addChildItem(child, refresh=True)
+
     def _build_children(self) -> list:
         """Build the list of child layer items from provider data.
 
@@ -728,12 +759,13 @@ class ProviderCollectionItem(QgsDataCollectionItem):
         from qgis.PyQt import sip
 
         children: list = []
+        # Default providers are listed from the catalog index; load their
+        # layers only now that the node is expanded.  The tag index orders
+        # them like the dialog does.
+        tag_index = get_catalog_service().tag_index(self._provider)
+        items = [item for _, item in tag_index.sorted_items()]
         provider_type = self._provider.get("type")
         if provider_type == _XYZ_GROUP_KEY:
-            items = sorted(
-                self._provider.get("basemaps", []),
-                key=_sort_key_by_tag,
-            )
             for idx, basemap in enumerate(items):
                 if not basemap.get("name"):
                     continue
@@ -742,10 +774,6 @@ class ProviderCollectionItem(QgsDataCollectionItem):
                 sip.transferto(item, self)
                 children.append(item)
         elif provider_type == _WMS_GROUP_KEY:
-            items = sorted(
-                self._provider.get("layers", []),
-                key=_sort_key_by_tag,
-            )
             for idx, layer_data in enumerate(items):
                 title = layer_data.get("layer_title") or layer_data.get("layer_name")
                 if not title:
@@ -0,0 +1,825 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Process-wide provider catalog shared by the dialog and the Browser panel.
+
+The :class:`CatalogService` owns the parsed default and user providers and
+the tag overrides.  Both :class:`basemaps_dialog.BasemapsDialog` and the
+Browser items in :mod:`browser_items` read the same provider dicts from it,
+so the catalog is parsed once per QGIS session and held in memory once.
+
+State is kept per provider file (``resources/providers/{default,user}/``).
+A :class:`QFileSystemWatcher` reports external edits (manual, git pull,
+etc.); after a short debounce only the YAML files that were changed or
+added are parsed again, and removed files are dropped.  Reads therefore
+never touch the filesystem.
+
+Default providers are held in two tiers.  The index tier (name, type,
+icon, item count and tag histogram; see
+:class:`catalog_snapshot.ProviderSummary`) is loaded at startup.  The
+``basemaps``/``layers`` payload is unpickled from the snapshot only when a
+provider is opened (:meth:`CatalogService.ensure_items`), and is kept in an
+LRU cache that drops the least recently opened item lists once
+:data:`ITEM_CACHE_LIMIT` items are materialized.  User providers are small
+and edited in place, so they are always fully loaded.
+
+Writers (the dialog) report what they saved, and the service re-emits
+every change as fine-grained signals so each consumer refreshes only the
+affected provider:
+
+* ``provider_changed(type, name)`` – a provider was added or modified.
+* ``provider_removed(type, name)`` – a provider no longer exists.
+* ``catalog_reset()`` – the whole catalog was reloaded from disk.
+
+A :class:`search_index.SearchIndex` over every provider's items is built
+on the first :meth:`CatalogService.search` call and afterwards kept current
+from the same change notifications, one provider at a time.
+"""
+
+from __future__ import annotations
+
+import pickle
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from qgis.PyQt.QtCore import (
+    QFileSystemWatcher,
+    QObject,
+    QSettings,
+    QTimer,
+    pyqtSignal,
+)
+
+from . import config_loader
+from .catalog_snapshot import ProviderSummary, get_snapshot
+from .messageTool import Logger
+from .provider_saver import ProviderSaveQueue
+from .search_index import ItemRef, SearchIndex, item_name
+from .tag_index import TagIndex, count_tags
+from .tag_journal import TagEdit, TagEditJournal, apply_edits
+
+_PREFIXES = ("default", "user")
+
+# Editors and ``git`` touch files in bursts; wait for them to settle.
+_RELOAD_DEBOUNCE_MS = 300
+
+# Materialized default-provider items kept before the least recently
+# opened item lists are evicted (NASA GIBS alone has ~1,200 layers).
+ITEM_CACHE_LIMIT = 3000
+
+_instance: CatalogService | None = None
+
+
+def get_catalog_service() -> CatalogService:
+    """Return the module-level :class:`CatalogService` singleton.
+
+    The instance is created on first call using the ``resources/`` directory
+    that ships with the plugin (next to this file).
+    """
+    global _instance
+    if _instance is None:
+        resources_dir = Path(__file__).resolve().parent / "resources"
+        _instance = CatalogService(resources_dir)
+    return _instance
+
+
+def _parse_workers() -> int:
+    """Worker count for parallel provider parsing (``0`` = sequential).
+
+    Opt-in via the ``parse_workers`` plugin setting; useful when many user
+    provider files change between sessions and the snapshot is cold.
+    """
+    try:
+        return int(QSettings("Basemaps", "Basemaps").value("parse_workers", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _provider_key(provider: dict[str, Any]) -> tuple[str, str]:
+    return (provider.get("type") or "", provider.get("name") or "")
+
+
+def _summary_key(provider: dict[str, Any]) -> tuple[str, str, str]:
+    """Identify a provider by file, type and name.
+
+    Unlike ``id()`` this also matches the copies Qt returns from item data.
+    """
+    return (
+        provider.get("source_file") or "",
+        provider.get("type") or "",
+        provider.get("name") or "",
+    )
+
+
+def _fingerprint(provider: dict[str, Any]) -> bytes:
+    """Cheap structural fingerprint used to detect in-place edits."""
+    try:
+        return pickle.dumps(provider, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # Unpicklable values should never happen; force a change event.
+        return repr(id(provider)).encode()
+
+
+def _file_state(path: str) -> tuple[int, int] | None:
+    """Return ``(size, mtime_ns)`` of *path*, or ``None`` if it is gone."""
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class CatalogService(QObject):
+    """Shared in-memory catalog of default and user providers.
+
+    Parameters
+    ----------
+    resources_dir : Path
+        The plugin ``resources/`` directory.
+    """
+
+    provider_changed = pyqtSignal(str, str)
+    provider_removed = pyqtSignal(str, str)
+    catalog_reset = pyqtSignal()
+
+    def __init__(self, resources_dir: Path, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.resources_dir = Path(resources_dir)
+        self._loaded = False
+        # prefix -> {resolved yaml path: providers parsed from that file}
+        self._files: dict[str, dict[str, list[dict[str, Any]]]] = {
+            prefix: {} for prefix in _PREFIXES
+        }
+        # resolved yaml path -> (size, mtime_ns) the in-memory data reflects
+        self._file_states: dict[str, tuple[int, int]] = {}
+        self._default: list[dict[str, Any]] = []
+        self._user: list[dict[str, Any]] = []
+        self._tag_overrides: dict[str, Any] = {}
+        # (type, name) -> fingerprint of the last published user provider
+        self._user_fingerprints: dict[tuple[str, str], bytes] = {}
+        # Index tier of the default providers, and the LRU of those whose
+        # item list is currently materialized (key -> item count)
+        self._summaries: dict[tuple[str, str, str], ProviderSummary] = {}
+        self._loaded_items: OrderedDict[tuple[str, str, str], int] = OrderedDict()
+        self._loaded_item_total = 0
+        # Built on first search, then updated per changed provider
+        self._search_index: SearchIndex | None = None
+        # Built per provider on first tag lookup, dropped when it changes
+        self._tag_indexes: dict[tuple[str, str, str], TagIndex] = {}
+
+        self._journal: TagEditJournal | None = None
+        self._saver = ProviderSaveQueue(self)
+        self._saver.saved.connect(self._on_providers_saved)
+
+        self._watcher: QFileSystemWatcher | None = None
+        self._pending_paths: set[str] = set()
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(_RELOAD_DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self._apply_pending_changes)
+
+    # ------------------------------------------------------------------
+    # Read access (no filesystem calls once loaded)
+    # ------------------------------------------------------------------
+
+    def default_providers(self) -> list[dict[str, Any]]:
+        """Return the default providers (shared dicts, new list)."""
+        self._ensure_loaded()
+        return list(self._default)
+
+    def user_providers(self) -> list[dict[str, Any]]:
+        """Return the user providers ordered by creation time."""
+        self._ensure_loaded()
+        return list(self._user)
+
+    def providers(self) -> list[dict[str, Any]]:
+        """Return default followed by user providers."""
+        self._ensure_loaded()
+        return self._default + self._user
+
+    def tag_overrides(self) -> dict[str, Any]:
+        """Return the live tag overrides mapping (already applied)."""
+        self._ensure_loaded()
+        return self._tag_overrides
+
+    def find_provider(self, provider_type: str, name: str) -> dict[str, Any] | None:
+        """Return the provider with the given type and name, if any."""
+        for provider in self.providers():
+            if provider.get("type") == provider_type and provider.get("name") == name:
+                return provider
+        return None
+
+    def search(
+        self,
+        query: str,
+        provider_type: str | None = None,
+        provider_name: str | None = None,
+        limit: int | None = None,
+    ) -> list[ItemRef]:
+        """Find catalog items matching *query* (see :meth:`SearchIndex.search`).
+
+        Item lists that are not materialized are read for indexing only;
+        building the index does not attach them to their providers.
+        """
+        return self._index().search(query, provider_type, provider_name, limit)
+
+    def item_title(self, ref: ItemRef) -> str:
+        """Return the display title of a search result without loading items."""
+        return self._index().title(ref)
+
+    def find_item(
+        self, ref: ItemRef
+    ) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        """Resolve a search result to its ``(provider, item)`` dicts.
+
+        Only the item list of the result's own provider is materialized.
+        """
+        provider_type, provider_name, name = ref
+        provider = self.find_provider(provider_type, provider_name)
+        if provider is None:
+            return None
+        self.ensure_items(provider)
+        for item in provider.get("basemaps") or provider.get("layers") or []:
+            if isinstance(item, Mapping) and item_name(item) == name:
+                return provider, item
+        return None
+
+    def _index(self) -> SearchIndex:
+        self._ensure_loaded()
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            for provider in self.providers():
+                self._index_provider(provider)
+        return self._search_index
+
+    def _index_provider(self, provider: dict[str, Any]) -> None:
+        items = provider.get("basemaps") or provider.get("layers")
+        summary = self._summaries.get(_summary_key(provider))
+        if items is None and summary is not None and summary.items_key is not None:
+            items = self._load_items(summary)
+            detached = {**provider, summary.items_key: items}
+            config_loader.apply_tag_overrides([detached], self._tag_overrides)
+        self._search_index.add_provider(provider, items or [])
+
+    def _drop_tag_indexes(self, provider_type: str, name: str) -> None:
+        for key in [k for k in self._tag_indexes if k[1:] == (provider_type, name)]:
+            del self._tag_indexes[key]
+
+    def _emit_changed(self, provider_type: str, name: str) -> None:
+        self._drop_tag_indexes(provider_type, name)
+        if self._search_index is not None:
+            provider = self.find_provider(provider_type, name)
+            if provider is None:
+                self._search_index.remove_provider(provider_type, name)
+            else:
+                self._index_provider(provider)
+        self.provider_changed.emit(provider_type, name)
+
+    def _emit_removed(self, provider_type: str, name: str) -> None:
+        self._drop_tag_indexes(provider_type, name)
+        if self._search_index is not None:
+            self._search_index.remove_provider(provider_type, name)
+        self.provider_removed.emit(provider_type, name)
+
+    # ------------------------------------------------------------------
+    # Lazy item lists
+    # ------------------------------------------------------------------
+
+    def ensure_items(self, provider: dict[str, Any]) -> dict[str, Any]:
+        """Materialize the ``basemaps``/``layers`` list of *provider*.
+
+        Must be called before reading the item list of a provider that may
+        come from the index tier.  Cheap for providers that are already
+        loaded (or were never lazy).  When *provider* is a copy of a catalog
+        provider (e.g. returned from Qt item data) the loaded list is also
+        set on the copy.
+
+        Parameters
+        ----------
+        provider : dict[str, Any]
+            Catalog provider or a copy of one.
+
+        Returns
+        -------
+        dict[str, Any]
+            *provider* itself, with its item list present.
+        """
+        key = _summary_key(provider)
+        summary = self._summaries.get(key)
+        if summary is None or summary.items_key is None:
+            return provider
+        canonical = summary.provider
+        if summary.items_key not in canonical:
+            canonical[summary.items_key] = self._load_items(summary)
+            config_loader.apply_tag_overrides([canonical], self._tag_overrides)
+            self._refresh_summary(key)
+        self._touch_loaded(key)
+        if provider is not canonical and summary.items_key not in provider:
+            provider[summary.items_key] = canonical[summary.items_key]
+        self._evict_items()
+        return provider
+
+    def has_lazy_items(self, provider: dict[str, Any]) -> bool:
+        """Return whether *provider*'s item list is managed by the index tier."""
+        summary = self._summaries.get(_summary_key(provider))
+        return summary is not None and summary.items_key is not None
+
+    def item_count(self, provider: dict[str, Any]) -> int:
+        """Return the number of basemaps/layers without loading them."""
+        summary = self._summaries.get(_summary_key(provider))
+        if summary is not None:
+            return summary.item_count
+        return len(provider.get("basemaps") or provider.get("layers") or [])
+
+    def tag_counts(self, provider: dict[str, Any]) -> dict[str, int]:
+        """Return the ``{tag: item count}`` histogram without loading items."""
+        summary = self._summaries.get(_summary_key(provider))
+        if summary is not None:
+            return summary.tag_counts
+        return count_tags(provider.get("basemaps") or provider.get("layers") or [])
+
+    def tag_index(self, provider: dict[str, Any]) -> TagIndex:
+        """Return the :class:`TagIndex` of *provider*'s item list.
+
+        Materializes the item list.  The index is cached until the provider
+        is reported changed or its items are evicted; item ids are positions
+        in the list, so they are also valid for copies of *provider*.
+        """
+        provider = self.ensure_items(provider)
+        key = _summary_key(provider)
+        index = self._tag_indexes.get(key)
+        if index is None:
+            items = provider.get("basemaps") or provider.get("layers") or []
+            index = self._tag_indexes[key] = TagIndex(items)
+        return index
+
+    def _load_items(self, summary: ProviderSummary) -> list[dict[str, Any]]:
+        """Unpickle an item list from the snapshot, re-parsing if it is stale."""
+        path = Path(summary.provider.get("source_file", ""))
+        snapshot = get_snapshot(self.resources_dir)
+        try:
+            items = snapshot.load_items(path, path.stat(), summary.position)
+        except OSError:
+            items = None
+        if items is None:
+            # The file was written after the index was read: parse it again.
+            try:
+                for provider in config_loader.load_provider_file(path, snapshot):
+                    if _provider_key(provider) == _provider_key(summary.provider):
+                        items = provider.get(summary.items_key)
+                        break
+                snapshot.save()
+            except Exception as e:
+                Logger.critical(f"Failed to load items from {path}: {e}")
+        return items or []
+
+    def _register_summaries(self, summaries: list[ProviderSummary]) -> None:
+        for summary in summaries:
+            key = _summary_key(summary.provider)
+            self._summaries[key] = summary
+            if summary.items_key is None:
+                continue
+            if summary.items_key in summary.provider:
+                # Parsed eagerly because the file changed while loading.
+                config_loader.apply_tag_overrides(
+                    [summary.provider], self._tag_overrides
+                )
+                self._refresh_summary(key)
+                self._touch_loaded(key)
+            elif summary.provider.get("name") in self._tag_overrides.get(
+                summary.provider.get("type"), {}
+            ):
+                # Overrides change tags, so the stored histogram is stale.
+                self.ensure_items(summary.provider)
+        self._evict_items()
+
+    def _unregister_file(self, path: str) -> None:
+        for key in [k for k in self._summaries if k[0] == path]:
+            del self._summaries[key]
+            self._tag_indexes.pop(key, None)
+            self._loaded_item_total -= self._loaded_items.pop(key, 0)
+
+    def _refresh_summary(self, key: tuple[str, str, str]) -> None:
+        """Recompute count and histogram of a materialized provider."""
+        summary = self._summaries[key]
+        items = summary.provider.get(summary.items_key)
+        if items is None:
+            return
+        summary = summary._replace(item_count=len(items), tag_counts=count_tags(items))
+        self._summaries[key] = summary
+        if key in self._loaded_items:
+            self._loaded_item_total += summary.item_count - self._loaded_items[key]
+            self._loaded_items[key] = summary.item_count
+
+    def _touch_loaded(self, key: tuple[str, str, str]) -> None:
+        if key in self._loaded_items:
+            self._loaded_items.move_to_end(key)
+            return
+        count = self._summaries[key].item_count
+        self._loaded_items[key] = count
+        self._loaded_item_total += count
+
+    def _evict_items(self) -> None:
+        """Drop least recently used item lists beyond :data:`ITEM_CACHE_LIMIT`."""
+        while (
+            self._loaded_item_total > ITEM_CACHE_LIMIT and len(self._loaded_items) > 1
+        ):
+            key, count = self._loaded_items.popitem(last=False)
+            self._loaded_item_total -= count
+            self._tag_indexes.pop(key, None)
+            summary = self._summaries.get(key)
+            if summary is not None and summary.items_key is not None:
+                summary.provider.pop(summary.items_key, None)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def reload(self) -> None:
+        """Re-read every provider file and the tag overrides from disk."""
+        workers = _parse_workers()
+        files: dict[str, dict[str, list[dict[str, Any]]]] = {
+            prefix: {} for prefix in _PREFIXES
+        }
+        self._tag_overrides = self._load_tag_overrides()
+        self._summaries = {}
+        self._search_index = None
+        self._tag_indexes.clear()
+        self._loaded_items.clear()
+        self._loaded_item_total = 0
+
+        # Default providers: index tier only, items on demand.
+        try:
+            summaries = config_loader.load_provider_index(
+                self.resources_dir, "default", workers=workers
+            )
+        except Exception as e:
+            Logger.critical(f"Failed to load default configuration: {e}")
+            summaries = []
+        for summary in summaries:
+            files["default"].setdefault(
+                summary.provider.get("source_file", ""), []
+            ).append(summary.provider)
+        self._register_summaries(summaries)
+
+        # User providers: fully loaded.
+        try:
+            user = config_loader.load_all_provider_files(
+                self.resources_dir, "user", workers=workers
+            )
+            config_loader.apply_tag_overrides(user, self._tag_overrides)
+        except Exception as e:
+            Logger.critical(f"Failed to load user configuration: {e}")
+            user = []
+        for provider in user:
+            files["user"].setdefault(provider.get("source_file", ""), []).append(
+                provider
+            )
+
+        first_load = not self._loaded
+        self._loaded = True
+        self._files = files
+        self._file_states = {}
+        for prefix in _PREFIXES:
+            for path in files[prefix]:
+                self._record_file_state(path)
+        self._rebuild_lists()
+        self._watch_provider_files()
+        if not first_load:
+            self.catalog_reset.emit()
+
+    def stop_watching(self) -> None:
+        """Stop following provider file changes (called on plugin unload)."""
+        if self._journal is not None:
+            self._journal.stop()
+        self._saver.flush()
+        self._reload_timer.stop()
+        self._pending_paths.clear()
+        if self._watcher is not None:
+            paths = self._watcher.files() + self._watcher.directories()
+            if paths:
+                self._watcher.removePaths(paths)
+            self._watcher.deleteLater()
+            self._watcher = None
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def _provider_dir(self, prefix: str) -> Path:
+        return self.resources_dir / "providers" / prefix
+
+    def _record_file_state(self, path: str) -> None:
+        state = _file_state(path)
+        if state is None:
+            self._file_states.pop(path, None)
+        else:
+            self._file_states[path] = state
+
+    def _rebuild_lists(self) -> None:
+        """Rebuild the ordered provider lists from the per-file state."""
+        default_files = self._files["default"]
+        self._default = [
+            p for path in sorted(default_files) for p in default_files[path]
+        ]
+        user_files = self._files["user"]
+        self._user = self._sorted_user(
+            [p for path in sorted(user_files) for p in user_files[path]]
+        )
+        self._user_fingerprints = {
+            _provider_key(p): _fingerprint(p) for p in self._user
+        }
+
+    @staticmethod
+    def _sorted_user(providers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Sort user providers by ``created_at`` (undated ones first)."""
+        without_time = [p for p in providers if "created_at" not in p]
+        with_time = [p for p in providers if "created_at" in p]
+        with_time.sort(key=lambda x: x["created_at"])
+        return without_time + with_time
+
+    # ------------------------------------------------------------------
+    # Filesystem watching
+    # ------------------------------------------------------------------
+
+    def _watch_provider_files(self) -> None:
+        """Make sure both provider directories and every known file are watched.
+
+        Files replaced by an atomic rename drop out of the watcher, so this
+        is re-run after every applied change.
+        """
+        if self._watcher is None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._on_path_changed)
+            self._watcher.directoryChanged.connect(self._on_path_changed)
+        wanted = [
+            str(self._provider_dir(prefix).resolve())
+            for prefix in _PREFIXES
+            if self._provider_dir(prefix).is_dir()
+        ]
+        wanted.extend(self._file_states)
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_path_changed(self, path: str) -> None:
+        self._pending_paths.add(path)
+        self._reload_timer.start()
+
+    def _changed_file_candidates(self) -> dict[str, str]:
+        """Map every file that may have changed to its provider prefix."""
+        candidates: dict[str, str] = {}
+        dirs = {str(self._provider_dir(p).resolve()): p for p in _PREFIXES}
+        for path in self._pending_paths:
+            prefix = dirs.get(path)
+            if prefix is not None:
+                # Directory event: a file was added, removed or renamed.
+                for known in self._files[prefix]:
+                    candidates[known] = prefix
+                for yaml_file in Path(path).glob("*.yaml"):
+                    candidates[str(yaml_file.resolve())] = prefix
+                continue
+            prefix = dirs.get(str(Path(path).parent))
+            if prefix is not None:
+                candidates[path] = prefix
+        self._pending_paths.clear()
+        return candidates
+
+    def _apply_pending_changes(self) -> None:
+        """Re-parse changed/added provider files and drop removed ones."""
+        removed: list[tuple[str, str]] = []
+        changed: list[tuple[str, str]] = []
+        snapshot = get_snapshot(self.resources_dir)
+        # Our own background writes; recorded once they finish
+        busy = self._saver.busy_paths()
+
+        for path, prefix in sorted(self._changed_file_candidates().items()):
+            if path in busy:
+                continue
+            state = _file_state(path)
+            if state is not None and self._file_states.get(path) == state:
+                continue  # spurious event or one of our own writes
+            old = self._files[prefix].pop(path, [])
+            self._file_states.pop(path, None)
+            self._unregister_file(path)
+            new: list[dict[str, Any]] = []
+            if state is None:
+                snapshot.discard(Path(path))
+            else:
+                try:
+                    if prefix == "default":
+                        summaries = config_loader.load_provider_file_index(
+                            Path(path), snapshot
+                        )
+                        new = [summary.provider for summary in summaries]
+                        self._register_summaries(summaries)
+                    else:
+                        new = config_loader.load_provider_file(Path(path), snapshot)
+                        config_loader.apply_tag_overrides(new, self._tag_overrides)
+                except Exception as e:
+                    Logger.critical(f"Failed to reload {path}: {e}")
+                    new = []
+                self._files[prefix][path] = new
+                self._file_states[path] = state
+                Logger.info(f"Reloaded {len(new)} provider(s) from {Path(path).name}")
+
+            new_keys = [_provider_key(p) for p in new]
+            removed.extend(k for k in map(_provider_key, old) if k not in new_keys)
+            changed.extend(new_keys)
+
+        if not removed and not changed:
+            self._watch_provider_files()
+            return
+        snapshot.save()
+        self._rebuild_lists()
+        self._watch_provider_files()
+        for provider_type, name in removed:
+            self._emit_removed(provider_type, name)
+        for provider_type, name in changed:
+            self._emit_changed(provider_type, name)
+
+    # ------------------------------------------------------------------
+    # Write notifications
+    # ------------------------------------------------------------------
+
+    def save_user_providers(self, providers: list[dict[str, Any]]) -> None:
+        """Save the dialog's user providers and publish them.
+
+        Only providers that were added or modified since they were last
+        published are written, in the background (see
+        :class:`provider_saver.ProviderSaveQueue`).
+
+        Parameters
+        ----------
+        providers : list[dict[str, Any]]
+            User providers in display order (separators are ignored).
+        """
+        self._ensure_loaded()
+        providers = [p for p in providers if p.get("type") != "separator"]
+        for provider in providers:
+            if self._user_fingerprints.get(_provider_key(provider)) != _fingerprint(
+                provider
+            ):
+                self._saver.enqueue(self.resources_dir, provider, "user")
+        self.set_user_providers(providers)
+
+    def _on_providers_saved(self, paths: list[Path]) -> None:
+        for path in map(str, paths):
+            if path in self._files["user"]:
+                self._record_file_state(path)
+            elif path not in self._saver.busy_paths():
+                # The provider was removed while its save was in flight
+                Path(path).unlink(missing_ok=True)
+        self._watch_provider_files()
+
+    def set_user_providers(self, providers: list[dict[str, Any]]) -> None:
+        """Publish the dialog's current user providers after saving them.
+
+        Providers are compared with the previously published set, and only
+        those that were added, modified or removed are announced.  The
+        files just written are recorded as known, so the watcher events
+        they cause are ignored.
+
+        Parameters
+        ----------
+        providers : list[dict[str, Any]]
+            User providers in display order (separators are ignored).
+        """
+        self._ensure_loaded()
+        providers = [p for p in providers if p.get("type") != "separator"]
+        fingerprints = {_provider_key(p): _fingerprint(p) for p in providers}
+
+        removed = [k for k in self._user_fingerprints if k not in fingerprints]
+        changed = [
+            k
+            for k, fp in fingerprints.items()
+            if self._user_fingerprints.get(k) != fp
+        ]
+
+        for path in self._files["user"]:
+            self._file_states.pop(path, None)
+        user_files: dict[str, list[dict[str, Any]]] = {}
+        for provider in providers:
+            source_file = provider.get("source_file")
+            if source_file:
+                user_files.setdefault(source_file, []).append(provider)
+        for path in user_files:
+            self._record_file_state(path)
+        self._files["user"] = user_files
+
+        self._user = providers
+        self._user_fingerprints = fingerprints
+        self._watch_provider_files()
+        for provider_type, name in removed:
+            self._emit_removed(provider_type, name)
+        for provider_type, name in changed:
+            self._emit_changed(provider_type, name)
+
+    def record_tag_edit(
+        self,
+        provider: dict[str, Any],
+        item: str,
+        tags: list[str],
+        mode: str = "overrides",
+    ) -> None:
+        """Persist a tag edit of one item through the edit journal.
+
+        The item's tags must already be updated in memory.  Only a small
+        journal record is written now; the YAML files are updated in the
+        background (see :mod:`tag_journal`).
+
+        Parameters
+        ----------
+        provider : dict[str, Any]
+            The edited provider.
+        item : str
+            Basemap ``name`` (XYZ) or ``layer_name`` (WMS/WMTS).
+        tags : list[str]
+            The item's new tags.
+        mode : str
+            ``"overrides"`` (``tag_overrides.yaml``) or ``"direct"`` (the
+            provider's own YAML file).
+        """
+        self._ensure_loaded()
+        edit = TagEdit(
+            mode,
+            provider.get("type") or "",
+            provider.get("name") or "",
+            provider.get("source_file") or "",
+            item,
+            list(tags),
+        )
+        self._journal.record(edit)
+        # Keeps the edit when the item list is evicted and read back from
+        # the not yet compacted file
+        apply_edits(self._tag_overrides, [edit])
+        self.notify_provider_changed(provider)
+
+    def clear_tag_overrides(self, provider: dict[str, Any]) -> None:
+        """Drop the tag overrides of *provider* through the edit journal.
+
+        Called once the whole provider was saved to its own file, which now
+        holds its tags.  Like every tag edit, the change reaches
+        ``tag_overrides.yaml`` through the background compaction, the only
+        writer of that file.  Consumers are not notified; the caller
+        announces the saved provider with :meth:`notify_provider_changed`.
+
+        Parameters
+        ----------
+        provider : dict[str, Any]
+            The saved provider.
+        """
+        self._ensure_loaded()
+        provider_type = provider.get("type") or ""
+        name = provider.get("name") or ""
+        if name not in self._tag_overrides.get(provider_type, {}):
+            return
+        edit = TagEdit("clear", provider_type, name, "", "", [])
+        self._journal.record(edit)
+        apply_edits(self._tag_overrides, [edit])
+
+    def _load_tag_overrides(self) -> dict[str, Any]:
+        """Read the tag overrides with the pending journal edits applied."""
+        if self._journal is None:
+            self._journal = TagEditJournal(self.resources_dir, self)
+            self._journal.compacted.connect(self._on_tag_edits_compacted)
+        overrides = config_loader.load_tag_overrides(self.resources_dir)
+        apply_edits(overrides, self._journal.pending())
+        return overrides
+
+    def _on_tag_edits_compacted(self, paths: list[Path]) -> None:
+        # Our own writes: the data in memory already reflects them
+        for path in paths:
+            path = str(path.resolve())
+            if path in self._file_states:
+                self._record_file_state(path)
+        # Shared with the dialog, so update in place
+        overrides = config_loader.load_tag_overrides(self.resources_dir)
+        apply_edits(overrides, self._journal.pending())
+        self._tag_overrides.clear()
+        self._tag_overrides.update(overrides)
+
+    def notify_provider_changed(self, provider: dict[str, Any]) -> None:
+        """Announce an in-place edit of *provider* (e.g. its tags)."""
+        source_file = provider.get("source_file")
+        if source_file and source_file in self._file_states:
+            self._record_file_state(source_file)
+        summary_key = _summary_key(provider)
+        if summary_key in self._loaded_items:
+            self._refresh_summary(summary_key)
+        key = _provider_key(provider)
+        if key in self._user_fingerprints:
+            self._user_fingerprints[key] = _fingerprint(provider)
+        self._emit_changed(*key)
@@ -0,0 +1,328 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Compiled binary snapshot of the parsed provider YAML catalog.
+
+Parsing ``resources/providers/*/*.yaml`` with PyYAML dominates plugin
+start-up (the NASA GIBS file alone is ~360 KB).  The snapshot stores the
+already-converted provider list of every YAML file in a single versioned
+pickle at ``resources/catalog_snapshot.pickle``, keyed by the file's
+resolved path and validated against its size and ``st_mtime_ns``:
+
+* **Warm path** – the whole snapshot is read with one ``read_bytes`` call
+  and each unchanged file is served by unpickling its entry.
+* **Changed files** – only files whose size or mtime differs are parsed
+  from YAML again; their entries are replaced and the snapshot is
+  rewritten atomically once loading finishes.
+
+Each entry holds pickled data rather than live objects, so every caller
+gets a fresh copy it may mutate freely (tag overrides, ``source_file``
+annotations, in-place edits in the dialog).
+
+Entries are split in two tiers so large providers (NASA GIBS, Wayback)
+can be listed without materializing their layers:
+
+* the **index** – each provider without its ``basemaps``/``layers`` list,
+  plus the item count and a tag histogram (:class:`ProviderSummary`);
+* the **items** – one separately pickled blob per provider item list,
+  unpickled only by :meth:`CatalogSnapshot.load_items` or :meth:`get`.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .messageTool import Logger
+from .tag_index import count_tags
+
+SNAPSHOT_FILENAME = "catalog_snapshot.pickle"
+
+# Bump whenever the converted provider structure produced by
+# config_loader changes, so stale snapshots are discarded on upgrade.
+SNAPSHOT_VERSION = 4
+
+# Provider keys holding the (potentially large) item lists.
+ITEM_KEYS = ("basemaps", "layers")
+
+# One snapshot instance per resources directory, shared by every loader
+# in the process (dialog, Browser panel, benchmarks).
+_snapshots: dict[Path, CatalogSnapshot] = {}
+
+
+def get_snapshot(resources_dir: Path) -> CatalogSnapshot:
+    """Return the process-wide :class:`CatalogSnapshot` for *resources_dir*."""
+    key = Path(resources_dir).resolve()
+    snapshot = _snapshots.get(key)
+    if snapshot is None:
+        snapshot = CatalogSnapshot(key / SNAPSHOT_FILENAME)
+        _snapshots[key] = snapshot
+    return snapshot
+
+
+def reset_snapshots() -> None:
+    """Forget all in-memory snapshots (the on-disk files are kept)."""
+    _snapshots.clear()
+
+
+class ProviderSummary(NamedTuple):
+    """Index-tier view of one provider.
+
+    Attributes
+    ----------
+    provider : dict[str, Any]
+        Provider dict; its item list is absent until loaded.
+    items_key : str | None
+        ``"basemaps"`` / ``"layers"``, or ``None`` if it has no item list.
+    position : int
+        Position of the provider inside its YAML file.
+    item_count : int
+        Number of basemaps/layers.
+    tag_counts : dict[str, int]
+        Number of items carrying each tag (see :func:`tag_index.count_tags`).
+    """
+
+    provider: dict[str, Any]
+    items_key: str | None
+    position: int
+    item_count: int
+    tag_counts: dict[str, int]
+
+
+def summarize_provider(provider: dict[str, Any], position: int = 0) -> ProviderSummary:
+    """Build a :class:`ProviderSummary` for a fully loaded *provider*."""
+    items_key = next((k for k in ITEM_KEYS if k in provider), None)
+    items = (provider.get(items_key) or []) if items_key else []
+    return ProviderSummary(provider, items_key, position, len(items), count_tags(items))
+
+
+class CatalogSnapshot:
+    """Versioned pickle cache of converted provider files.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the snapshot file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # resolved yaml path ->
+        #   (size, mtime_ns, pickled index tier, pickled item list per provider)
+        self._entries: dict[str, tuple[int, int, bytes, tuple]] | None = None
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(
+        self, yaml_file: Path, stat: os.stat_result
+    ) -> list[dict[str, Any]] | None:
+        """Return a fresh copy of the cached providers for *yaml_file*.
+
+        Parameters
+        ----------
+        yaml_file : Path
+            Provider YAML file.
+        stat : os.stat_result
+            Current ``stat()`` of *yaml_file*.
+
+        Returns
+        -------
+        list[dict[str, Any]] | None
+            Cached providers, or ``None`` when the entry is missing or stale.
+        """
+        entry = self._current_entry(yaml_file, stat)
+        if entry is None:
+            return None
+        try:
+            providers = []
+            for provider, items_key, _count, _tags in pickle.loads(entry[2]):
+                if items_key is not None:
+                    provider[items_key] = pickle.loads(entry[3][len(providers)])
+                providers.append(provider)
+            return providers
+        except Exception as exc:
+            Logger.warning(f"Discarding corrupt catalog snapshot entry: {exc}")
+            self.discard(yaml_file)
+            return None
+
+    def get_index(
+        self, yaml_file: Path, stat: os.stat_result
+    ) -> list[ProviderSummary] | None:
+        """Return the index tier of *yaml_file* without unpickling item lists.
+
+        Returns
+        -------
+        list[ProviderSummary] | None
+            One summary per provider, or ``None`` when missing or stale.
+        """
+        entry = self._current_entry(yaml_file, stat)
+        if entry is None:
+            return None
+        try:
+            return [
+                ProviderSummary(provider, items_key, position, count, tags)
+                for position, (provider, items_key, count, tags) in enumerate(
+                    pickle.loads(entry[2])
+                )
+            ]
+        except Exception as exc:
+            Logger.warning(f"Discarding corrupt catalog snapshot entry: {exc}")
+            self.discard(yaml_file)
+            return None
+
+    def load_items(
+        self, yaml_file: Path, stat: os.stat_result, position: int
+    ) -> list[dict[str, Any]] | None:
+        """Unpickle the item list of the provider at *position* in *yaml_file*.
+
+        Returns
+        -------
+        list[dict[str, Any]] | None
+            The items, or ``None`` when the entry is missing or stale.
+        """
+        entry = self._current_entry(yaml_file, stat)
+        if entry is None or position >= len(entry[3]) or entry[3][position] is None:
+            return None
+        try:
+            return pickle.loads(entry[3][position])
+        except Exception as exc:
+            Logger.warning(f"Discarding corrupt catalog snapshot entry: {exc}")
+            self.discard(yaml_file)
+            return None
+
+    def is_current(self, yaml_file: Path, stat: os.stat_result) -> bool:
+        """Return whether a valid entry for *yaml_file* exists (no unpickling)."""
+        return self._current_entry(yaml_file, stat) is not None
+
+    def put(
+        self,
+        yaml_file: Path,
+        stat: os.stat_result,
+        providers: list[dict[str, Any]],
+    ) -> None:
+        """Store the freshly parsed *providers* of *yaml_file*."""
+        index = []
+        item_blobs = []
+        try:
+            for provider in providers:
+                summary = summarize_provider(provider)
+                head = {k: v for k, v in provider.items() if k != summary.items_key}
+                index.append(
+                    (head, summary.items_key, summary.item_count, summary.tag_counts)
+                )
+                item_blobs.append(
+                    pickle.dumps(
+                        provider[summary.items_key], protocol=pickle.HIGHEST_PROTOCOL
+                    )
+                    if summary.items_key is not None
+                    else None
+                )
+            index_blob = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as exc:
+            Logger.warning(f"Cannot snapshot {yaml_file.name}: {exc}")
+            return
+        self._load()[self._key(yaml_file)] = (
+            stat.st_size,
+            stat.st_mtime_ns,
+            index_blob,
+            tuple(item_blobs),
+        )
+        self._dirty = True
+
+    def discard(self, yaml_file: Path) -> None:
+        """Drop the entry for *yaml_file* if present."""
+        if self._load().pop(self._key(yaml_file), None) is not None:
+            self._dirty = True
+
+    def prune(self, directory: Path, keep: set[str]) -> None:
+        """Drop entries under *directory* whose key is not in *keep*.
+
+        Parameters
+        ----------
+        directory : Path
+            Provider directory that was just scanned.
+        keep : set[str]
+            Resolved paths of the YAML files that still exist there.
+        """
+        prefix = str(directory.resolve()) + os.sep
+        entries = self._load()
+        stale = [k for k in entries if k.startswith(prefix) and k not in keep]
+        for key in stale:
+            del entries[key]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the snapshot to disk if it changed since it was loaded.
+
+        The file is written to a temporary sibling and renamed into place,
+        so a crash never leaves a truncated snapshot behind.
+        """
+        if not self._dirty or self._entries is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(
+                pickle.dumps(
+                    (SNAPSHOT_VERSION, self._entries),
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as exc:
+            Logger.warning(f"Failed to write catalog snapshot {self.path}: {exc}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(yaml_file: Path) -> str:
+        return str(yaml_file.resolve())
+
+    def _current_entry(self, yaml_file: Path, stat: os.stat_result) -> tuple | None:
+        entry = self._load().get(self._key(yaml_file))
+        if entry is None:
+            return None
+        if entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return None
+        return entry
+
+    def _load(self) -> dict[str, tuple[int, int, bytes, tuple]]:
+        """Read the snapshot file once; start empty if missing or stale."""
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if not self.path.exists():
+            return self._entries
+        try:
+            version, entries = pickle.loads(self.path.read_bytes())
+        except Exception as exc:
+            Logger.warning(f"Ignoring unreadable catalog snapshot {self.path}: {exc}")
+            self._dirty = True
+            return self._entries
+        if version != SNAPSHOT_VERSION or not isinstance(entries, dict):
+            Logger.info("Catalog snapshot version changed; rebuilding")
+            self._dirty = True
+            return self._entries
+        self._entries = entries
+        return self._entries
@@ -6,12 +6,21 @@ Provides unified interface for loading configuration files.
 
 from __future__ import annotations
 
+import multiprocessing
+import sys
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Literal
 
-import yaml
-
+from . import yaml_io
+from .catalog_snapshot import (
+    CatalogSnapshot,
+    ProviderSummary,
+    get_snapshot,
+    summarize_provider,
+)
+from .layer_record import LayerRecord
 from .messageTool import Logger
 
 
@@ -67,8 +76,7 @@ def _load_yaml_config(filepath: Path) -> dict[str, list[dict[str, Any]]]:
     """
     Logger.info(f"Loading YAML config: {filepath}")
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    data = yaml_io.load_file(filepath)
 
     # Convert YAML type-based structure to providers list
     providers = _convert_yaml_to_providers(data)
@@ -135,7 +143,7 @@ def _convert_yaml_to_providers(
     return providers
 
 
-def _normalize_wms_layers(layers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _normalize_wms_layers(layers: list[dict[str, Any]]) -> list[LayerRecord]:
     """Normalize WMS/WMTS layer dictionaries loaded from YAML.
 
     Parameters
@@ -145,13 +153,13 @@ def _normalize_wms_layers(layers: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
     Returns
     -------
-    list[dict[str, Any]]
-        Layers with ``layer_name`` populated from ``layer_name_parts`` when
-        needed.
+    list[LayerRecord]
+        Compact layer records with ``layer_name`` populated from
+        ``layer_name_parts`` when needed.
     """
     normalized_layers = []
     for layer in layers:
-        normalized_layer = dict(layer)
+        normalized_layer = LayerRecord(layer)
         if "layer_name" not in normalized_layer and "layer_name_parts" in layer:
             normalized_layer["layer_name"] = "".join(
                 str(part) for part in layer["layer_name_parts"]
@@ -269,34 +277,13 @@ def save_config_as_yaml(
     # Save to file with custom representer for better formatting
     Logger.info(f"Saving YAML config to {filepath}")
 
-    # Use a custom Dumper to maintain field order
-    class OrderedDumper(yaml.SafeDumper):
-        pass
-
-    def dict_representer(dumper, data):
-        return dumper.represent_mapping("tag:yaml.org,2002:map", data.items())
-
-    def ordered_dict_representer(dumper, data):
-        return dumper.represent_mapping("tag:yaml.org,2002:map", data.items())
-
-    OrderedDumper.add_representer(dict, dict_representer)
-    OrderedDumper.add_representer(OrderedDict, ordered_dict_representer)
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        yaml.dump(
-            yaml_data,
-            f,
-            Dumper=OrderedDumper,
-            allow_unicode=True,
-            default_flow_style=False,
-            sort_keys=False,
-            indent=2,
-        )
+    # yaml_io's dumper maintains field order
+    yaml_io.dump_file(filepath, yaml_data)
 
     Logger.info(f"Successfully saved {len(providers)} providers to {filepath}")
 
 
-def _build_provider_yaml_data(provider: dict[str, Any]) -> dict[str, Any]:
+def build_provider_yaml_data(provider: dict[str, Any]) -> dict[str, Any]:
     """Build the YAML data structure for a single provider.
 
     Returns a dict suitable for yaml.dump: ``{type: {provider_name: {...}}}``.
@@ -371,26 +358,8 @@ def _build_provider_yaml_data(provider: dict[str, Any]) -> dict[str, Any]:
 
 def _write_provider_yaml(filepath: Path, yaml_data: dict[str, Any]) -> None:
     """Write provider YAML data to a file, preserving OrderedDict order."""
-
-    class OrderedDumper(yaml.SafeDumper):
-        pass
-
-    def ordered_dict_representer(dumper, data):
-        return dumper.represent_mapping("tag:yaml.org,2002:map", data.items())
-
-    OrderedDumper.add_representer(OrderedDict, ordered_dict_representer)
-
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
-        yaml.dump(
-            yaml_data,
-            f,
-            Dumper=OrderedDumper,
-            allow_unicode=True,
-            default_flow_style=False,
-            sort_keys=False,
-            indent=2,
-        )
+    yaml_io.dump_file(filepath, yaml_data)
 
 
 def save_provider_to_path(
@@ -408,19 +377,19 @@ def save_provider_to_path(
     """
     filepath = Path(filepath)
     provider_name = provider.get("name", "unknown")
-    yaml_data = _build_provider_yaml_data(provider)
+    yaml_data = build_provider_yaml_data(provider)
     _write_provider_yaml(filepath, yaml_data)
     Logger.info(f"Saved provider '{provider_name}' to {filepath}")
     if isinstance(provider, dict):
         provider["source_file"] = str(filepath.resolve())
 
 
-def save_provider_to_yaml(
+def provider_yaml_path(
     directory: Path,
     provider: dict[str, Any],
     prefix: Literal["default", "user"] = "user",
-) -> Path | None:
-    """Save a single provider to its own YAML file (auto-generated path).
+) -> Path:
+    """Return the auto-generated YAML file path of *provider*.
 
     Parameters
     ----------
@@ -433,28 +402,52 @@ def save_provider_to_yaml(
 
     Returns
     -------
-    Path | None
-        Path to the saved file, or None if skipped.
+    Path
+        ``{directory}/providers/{prefix}/{type}_{safe name}.yaml``
     """
     provider_type = provider.get("type")
     provider_name = provider.get("name", "unknown")
 
-    if provider_type == "separator":
-        Logger.info("Skipping separator provider", notify_user=False)
-        return None
-
     if provider_type not in ["xyz", "wms"]:
         raise ValueError(f"Invalid provider type: {provider_type}")
 
-    providers_dir = directory / "providers" / prefix
     safe_name = (
         provider_name.replace(" ", "_")
         .replace("/", "_")
         .replace("(", "")
         .replace(")", "")
     )
-    filename = f"{provider_type}_{safe_name}.yaml"
-    filepath = providers_dir / filename
+    return directory / "providers" / prefix / f"{provider_type}_{safe_name}.yaml"
+
+
+def save_provider_to_yaml(
+    directory: Path,
+    provider: dict[str, Any],
+    prefix: Literal["default", "user"] = "user",
+) -> Path | None:
+    """Save a single provider to its own YAML file (auto-generated path).
+
+    Parameters
+    ----------
+    directory : Path
+        Base directory (usually resources/).
+    provider : dict[str, Any]
+        Provider configuration dictionary.
+    prefix : Literal['default', 'user']
+        File prefix ('default' or 'user').
+
+    Returns
+    -------
+    Path | None
+        Path to the saved file, or None if skipped.
+    """
+    provider_name = provider.get("name", "unknown")
+
+    if provider.get("type") == "separator":
+        Logger.info("Skipping separator provider", notify_user=False)
+        return None
+
+    filepath = provider_yaml_path(directory, provider, prefix)
 
     # If the provider was renamed, delete the old file
     old_source = provider.get("source_file")
@@ -465,7 +458,7 @@ def save_provider_to_yaml(
         except OSError as e:
             Logger.warning(f"Failed to remove old provider file '{old_source}': {e}")
 
-    yaml_data = _build_provider_yaml_data(provider)
+    yaml_data = build_provider_yaml_data(provider)
     _write_provider_yaml(filepath, yaml_data)
 
     Logger.info(f"Saved provider '{provider_name}' to {filepath}")
@@ -517,6 +510,8 @@ def save_providers_separately(
 def load_all_provider_files(
     directory: Path,
     prefix: Literal["default", "user"] = "default",
+    use_snapshot: bool = True,
+    workers: int = 0,
 ) -> list[dict[str, Any]]:
     """Load all provider files with given prefix from directory.
 
@@ -526,6 +521,14 @@ def load_all_provider_files(
         Base directory (usually resources/)
     prefix : Literal['default', 'user']
         Subdirectory name to load from ('default' or 'user')
+    use_snapshot : bool, default=True
+        Serve unchanged files from the compiled catalog snapshot
+        (see :mod:`catalog_snapshot`) instead of parsing their YAML.
+    workers : int, default=0
+        Opt-in parallel parsing: when greater than 1, the files that need
+        parsing are read on a pool of this many workers (threads with
+        libyaml, processes otherwise).  Order and ``source_file``
+        annotations are the same as in sequential mode.
 
     Returns
     -------
@@ -538,19 +541,25 @@ def load_all_provider_files(
     Falls back to old location: directory/{prefix}_*.yaml for backward compatibility
     """
     providers = []
+    snapshot = get_snapshot(directory) if use_snapshot else None
     # Try new directory structure first: resources/providers/{prefix}/
     new_providers_dir = directory / "providers" / prefix
     if new_providers_dir.exists():
         Logger.info(f"Loading providers from new structure: {new_providers_dir}")
-        for yaml_file in sorted(new_providers_dir.glob("*.yaml")):
+        seen_files: set[str] = set()
+        yaml_files = sorted(new_providers_dir.glob("*.yaml"))
+        parsed: dict[Path, Any] = {}
+        if workers > 1:
+            parsed = _parse_yaml_files_parallel(
+                [f for f in yaml_files if not _snapshot_is_current(snapshot, f)],
+                workers,
+            )
+        for yaml_file in yaml_files:
             try:
-                data = load_config_file(yaml_file)
-                file_providers = data.get("providers", [])
-
-                # Add source file path to each provider
-                for provider in file_providers:
-                    provider["source_file"] = str(yaml_file.resolve())
-
+                seen_files.add(str(yaml_file.resolve()))
+                file_providers = load_provider_file(
+                    yaml_file, snapshot, parsed.get(yaml_file)
+                )
                 providers.extend(file_providers)
                 Logger.info(
                     f"Loaded {len(file_providers)} provider(s) from {yaml_file.name}"
@@ -559,9 +568,222 @@ def load_all_provider_files(
                 Logger.critical(f"Failed to load {yaml_file}: {e}")
                 continue
 
+        if snapshot is not None:
+            snapshot.prune(new_providers_dir, seen_files)
+            snapshot.save()
+
     return providers
 
 
+def load_provider_index(
+    directory: Path,
+    prefix: Literal["default", "user"] = "default",
+    workers: int = 0,
+) -> list[ProviderSummary]:
+    """Load the lightweight index tier of all provider files with *prefix*.
+
+    Like :func:`load_all_provider_files`, but item lists (``basemaps`` /
+    ``layers``) stay pickled in the catalog snapshot until requested via
+    :meth:`catalog_snapshot.CatalogSnapshot.load_items`.
+
+    Parameters
+    ----------
+    directory : Path
+        Base directory (usually resources/)
+    prefix : Literal['default', 'user']
+        Subdirectory name to load from ('default' or 'user')
+    workers : int, default=0
+        Parallel parsing for files missing from the snapshot (see
+        :func:`load_all_provider_files`).
+
+    Returns
+    -------
+    list[ProviderSummary]
+        One summary per provider, in file order, each provider annotated
+        with ``source_file``
+    """
+    summaries: list[ProviderSummary] = []
+    snapshot = get_snapshot(directory)
+    providers_dir = directory / "providers" / prefix
+    if not providers_dir.exists():
+        return summaries
+
+    Logger.info(f"Loading provider index from {providers_dir}")
+    seen_files: set[str] = set()
+    yaml_files = sorted(providers_dir.glob("*.yaml"))
+    parsed: dict[Path, Any] = {}
+    if workers > 1:
+        parsed = _parse_yaml_files_parallel(
+            [f for f in yaml_files if not _snapshot_is_current(snapshot, f)],
+            workers,
+        )
+    for yaml_file in yaml_files:
+        try:
+            seen_files.add(str(yaml_file.resolve()))
+            summaries.extend(
+                load_provider_file_index(yaml_file, snapshot, parsed.get(yaml_file))
+            )
+        except Exception as e:
+            Logger.critical(f"Failed to load {yaml_file}: {e}")
+            continue
+
+    snapshot.prune(providers_dir, seen_files)
+    snapshot.save()
+    return summaries
+
+
+def load_provider_file_index(
+    yaml_file: Path,
+    snapshot: CatalogSnapshot,
+    yaml_data: Any = None,
+) -> list[ProviderSummary]:
+    """Load the index tier of a single provider YAML file.
+
+    The file is parsed (and stored in *snapshot*, not saved) only when the
+    snapshot has no current entry for it.
+
+    Parameters
+    ----------
+    yaml_file : Path
+        Provider file.
+    snapshot : CatalogSnapshot
+        Snapshot serving the index and, later, the item lists.
+    yaml_data : Any
+        Raw YAML document already parsed from *yaml_file*, if any.
+
+    Returns
+    -------
+    list[ProviderSummary]
+        Summaries whose providers are annotated with ``source_file``.
+        Providers come back fully loaded if the file changed while it was
+        being parsed.
+    """
+    stat = yaml_file.stat()
+    index = snapshot.get_index(yaml_file, stat)
+    if index is None:
+        providers = load_provider_file(yaml_file, snapshot, yaml_data)
+        index = snapshot.get_index(yaml_file, stat)
+        if index is None:
+            return [summarize_provider(p, i) for i, p in enumerate(providers)]
+
+    source_file = str(yaml_file.resolve())
+    for summary in index:
+        summary.provider["source_file"] = source_file
+    return index
+
+
+def _snapshot_is_current(snapshot: CatalogSnapshot | None, yaml_file: Path) -> bool:
+    if snapshot is None:
+        return False
+    try:
+        return snapshot.is_current(yaml_file, yaml_file.stat())
+    except OSError:
+        return False
+
+
+def _worker_process_context():
+    """Return a ``spawn`` context whose executable is a Python interpreter.
+
+    Inside QGIS ``sys.executable`` is the QGIS application binary, which
+    cannot run multiprocessing children; point the context at the bundled
+    interpreter instead.
+    """
+    context = multiprocessing.get_context("spawn")
+    executable = Path(sys.executable)
+    if executable.name.lower().startswith("python"):
+        return context
+    prefix = Path(sys.exec_prefix)
+    for candidate in (
+        prefix / "python.exe",
+        prefix / "python3.exe",
+        prefix / "bin" / "python3",
+        prefix / "bin" / "python",
+    ):
+        if candidate.exists():
+            context.set_executable(str(candidate))
+            return context
+    raise RuntimeError("No Python interpreter found for worker processes")
+
+
+def _parse_yaml_files_parallel(yaml_files: list[Path], workers: int) -> dict[Path, Any]:
+    """Parse *yaml_files* concurrently and return ``{file: raw YAML data}``.
+
+    libyaml's loader is fast enough that threads suffice; the pure-Python
+    loader holds the GIL throughout, so processes are used instead.  Files
+    that fail (or a pool that cannot start) are simply left out of the
+    result and parsed sequentially by the caller, which also reports the
+    error.
+    """
+    if len(yaml_files) < 2:
+        return {}
+    max_workers = min(workers, len(yaml_files))
+    results: dict[Path, Any] = {}
+    try:
+        if yaml_io.HAS_LIBYAML:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_worker_process_context()
+            )
+        with executor:
+            futures = {
+                yaml_file: executor.submit(yaml_io.load_file, str(yaml_file))
+                for yaml_file in yaml_files
+            }
+            for yaml_file, future in futures.items():
+                try:
+                    results[yaml_file] = future.result()
+                except Exception:
+                    continue
+    except Exception as e:
+        Logger.warning(
+            f"Parallel provider parsing unavailable, parsing sequentially: {e}"
+        )
+    return results
+
+
+def load_provider_file(
+    yaml_file: Path,
+    snapshot: CatalogSnapshot | None = None,
+    yaml_data: Any = None,
+) -> list[dict[str, Any]]:
+    """Load the providers of a single provider YAML file.
+
+    Parameters
+    ----------
+    yaml_file : Path
+        Provider file, e.g. ``resources/providers/user/xyz_MyProvider.yaml``
+    snapshot : CatalogSnapshot | None
+        Compiled snapshot to serve the file from when it is unchanged; a
+        freshly parsed result is stored back into it (not saved).
+    yaml_data : Any
+        Raw YAML document already parsed from *yaml_file* (e.g. by a
+        worker pool); the file is read when omitted.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Providers defined in the file, each annotated with ``source_file``
+    """
+    file_providers = None
+    if snapshot is not None:
+        stat = yaml_file.stat()
+        file_providers = snapshot.get(yaml_file, stat)
+    if file_providers is None:
+        if yaml_data is not None:
+            file_providers = _convert_yaml_to_providers(yaml_data)
+        else:
+            file_providers = load_config_file(yaml_file).get("providers", [])
+        if snapshot is not None:
+            snapshot.put(yaml_file, stat, file_providers)
+
+    # Add source file path to each provider
+    source_file = str(yaml_file.resolve())
+    for provider in file_providers:
+        provider["source_file"] = source_file
+    return file_providers
+
+
 def delete_provider_file(
     directory: Path,
     provider: dict[str, Any],
@@ -679,8 +901,7 @@ def load_tag_overrides(
         return {}
 
     try:
-        with open(overrides_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = yaml_io.load_file(overrides_file)
         return data or {}
     except Exception:
         Logger.warning(f"Failed to load tag overrides from {overrides_file}")
@@ -722,15 +943,7 @@ def save_tag_overrides(
             Logger.info("Removed empty tag overrides file")
         return
 
-    with open(overrides_file, "w", encoding="utf-8") as f:
-        yaml.dump(
-            overrides,
-            f,
-            allow_unicode=True,
-            default_flow_style=False,
-            sort_keys=False,
-            indent=2,
-        )
+    yaml_io.dump_file(overrides_file, overrides)
     Logger.info(f"Saved tag overrides to {overrides_file}")
 
 
@@ -0,0 +1,180 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Compact in-memory representation of WMS/WMTS layers.
+
+Large WMTS catalogs (1,236 layers for NASA GIBS) repeat the same few
+``crs``/``format``/``styles``/``tags`` lists over and over, yet loaded as
+plain dicts every layer carries its own dict plus four small lists.
+:class:`LayerRecord` stores the known layer fields in ``__slots__`` and
+keeps list values as interned tuples, so all layers with e.g.
+``crs: [GoogleMapsCompatible_Level9]`` share one tuple object.  Identical
+``resource_url`` templates are interned as well.
+
+Records behave like the layer dicts they replace: ``layer["crs"]``,
+``layer.get("tags", [])``, ``"resource_url" in layer``, ``dict(layer)``
+and item assignment all work.  Callers must test for
+:class:`collections.abc.Mapping` rather than ``dict`` and must not mutate
+list values in place (they are tuples); assign a new list instead, which
+is interned on assignment.
+
+This module has no QGIS dependency.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Iterator
+
+# Fields stored in slots, in the order they are written to YAML.
+FIELDS = (
+    "layer_name",
+    "layer_title",
+    "crs",
+    "format",
+    "styles",
+    "tags",
+    "resource_url",
+)
+_FIELD_SET = frozenset(FIELDS)
+# Fields whose list values are stored as shared tuples.
+_SEQUENCE_FIELDS = frozenset({"crs", "format", "styles", "tags"})
+
+# Marks an unset slot (the key is absent from the mapping).
+_MISSING: Any = object()
+
+_interned_tuples: dict[tuple, tuple] = {}
+
+
+def intern_values(values: Any) -> Any:
+    """Return a shared tuple equal to the list or tuple *values*.
+
+    Other values (and sequences with unhashable members) are returned
+    unchanged.
+    """
+    if not isinstance(values, (list, tuple)):
+        return values
+    key = tuple(sys.intern(v) if type(v) is str else v for v in values)
+    try:
+        return _interned_tuples.setdefault(key, key)
+    except TypeError:
+        return values
+
+
+class LayerRecord(MutableMapping):
+    """A WMS/WMTS layer with a dict-compatible interface.
+
+    Parameters
+    ----------
+    data : Mapping[str, Any] | None
+        Initial layer fields, typically one layer dict from a provider
+        YAML file.  Keys other than :data:`FIELDS` are kept as well.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, data: Mapping[str, Any] | None = None, **kwargs: Any) -> None:
+        for field in FIELDS:
+            setattr(self, field, _MISSING)
+        self._extra: dict[str, Any] | None = None
+        for source in (data, kwargs):
+            if source:
+                for key, value in source.items():
+                    self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _SEQUENCE_FIELDS:
+            setattr(self, key, intern_values(value))
+        elif key in _FIELD_SET:
+            if key == "resource_url" and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+            return
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+        if not self._extra:
+            self._extra = None
+
+    def __iter__(self) -> Iterator[str]:
+        for field in FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(getattr(self, field) is not _MISSING for field in FIELDS)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING  # type: ignore[arg-type]
+        return bool(self._extra) and key in self._extra  # type: ignore[operator]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in other.items()
+        }
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        # Pickles as a plain dict; the tuples it shares are pickled once and
+        # re-interned on load.
+        return (type(self), (dict(self),))
+
+    def copy(self) -> LayerRecord:
+        """Return a shallow copy (values stay shared)."""
+        return type(self)(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the layer as a plain dict with list values."""
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in self.items()
+        }
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import functools
 import json
-import os
+import random
 import tempfile
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from qgis.core import (
+    QgsApplication,
     QgsBlockingNetworkRequest,
     QgsCoordinateReferenceSystem,
     QgsDataSourceUri,
@@ -25,6 +30,7 @@ from qgis.PyQt.QtCore import (
     QCoreApplication,
     QIODevice,
     QObject,
+    QSettings,
     QSize,
     QTimer,
     pyqtSignal,
@@ -32,10 +38,26 @@ from qgis.PyQt.QtCore import (
     Qt,
 )
 from qgis.PyQt.QtNetwork import QNetworkRequest
-from qgis.PyQt.QtGui import QColor, QImage, QPainter, QPen, QPixmap
+from qgis.PyQt.QtGui import (
+    QColor,
+    QImage,
+    QImageReader,
+    QImageWriter,
+    QPainter,
+    QPen,
+    QPixmap,
+)
 
 from .messageTool import Logger
-from . import wmts_parser
+from . import blank_detect, image_fidelity, preview_store, wmts_parser
+from .preview_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_NEAR,
+    PRIORITY_VISIBLE,
+    HostScheduler,
+    host_key,
+)
+from .preview_store import get_preview_store, safe_name
 
 VECTOR_PREVIEW_PRIMARY_CENTER = (0.0, 0.0)
 VECTOR_PREVIEW_FALLBACK_CENTERS = (
@@ -46,6 +68,53 @@ VECTOR_PREVIEW_FALLBACK_CENTERS = (
 )
 VECTOR_PREVIEW_SYMBOL_SURROGATE_LIMIT = 48
 
+# Default size budget of the preview cache (shipped previews excluded).
+PREVIEW_CACHE_BUDGET_MB = 20
+
+# Default limits of concurrent preview requests, in total and per host
+# (scheme + authority).
+PREVIEW_MAX_CONNECTIONS = 12
+PREVIEW_MAX_CONNECTIONS_PER_HOST = 4
+
+
+def preview_cache_budget() -> int:
+    """Size budget of the preview cache in bytes.
+
+    Read from the ``preview_cache_mb`` plugin setting, defaulting to
+    :data:`PREVIEW_CACHE_BUDGET_MB`.  The shipped default previews are not
+    counted and never evicted.
+    """
+    try:
+        megabytes = float(
+            QSettings("Basemaps", "Basemaps").value(
+                "preview_cache_mb", PREVIEW_CACHE_BUDGET_MB
+            )
+        )
+    except (TypeError, ValueError):
+        megabytes = PREVIEW_CACHE_BUDGET_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+def preview_connection_limits() -> tuple[int, int]:
+    """Total and per-host limits of concurrent preview requests.
+
+    Read from the ``preview_max_connections`` and
+    ``preview_max_connections_per_host`` plugin settings, defaulting to
+    :data:`PREVIEW_MAX_CONNECTIONS` and
+    :data:`PREVIEW_MAX_CONNECTIONS_PER_HOST`.
+    """
+    settings = QSettings("Basemaps", "Basemaps")
+    limits = []
+    for name, default in (
+        ("preview_max_connections", PREVIEW_MAX_CONNECTIONS),
+        ("preview_max_connections_per_host", PREVIEW_MAX_CONNECTIONS_PER_HOST),
+    ):
+        try:
+            limits.append(max(1, int(settings.value(name, default))))
+        except (TypeError, ValueError):
+            limits.append(default)
+    return limits[0], limits[1]
+
 
 def qt_image_format(name: str) -> object:
     """Return a QImage format enum for Qt5 and Qt6.
@@ -83,10 +152,112 @@ def network_reply_has_error(error_code: object) -> bool:
     return error_value != 0
 
 
+# QNetworkReply errors worth retrying: connection refused/closed, timeout,
+# temporary network or session failure, proxy timeout, unknown network
+# error, and the server-side internal/unavailable/unknown errors.
+_TRANSIENT_NETWORK_ERRORS = frozenset({1, 2, 4, 7, 8, 99, 104, 401, 403, 499})
+_TRANSIENT_HTTP_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def network_reply_is_transient(error_code: object, http_status: object) -> bool:
+    """Return whether a failed reply may succeed when retried.
+
+    Parameters
+    ----------
+    error_code : object
+        Value returned by ``QNetworkReply.error()``.
+    http_status : object
+        HTTP status code attribute of the reply (``None`` without response).
+
+    Returns
+    -------
+    bool
+        ``True`` for timeouts, dropped connections, rate limiting and
+        server errors; ``False`` for e.g. missing tiles or bad requests.
+    """
+    try:
+        if int(http_status) in _TRANSIENT_HTTP_STATUSES:
+            return True
+    except (TypeError, ValueError):
+        pass
+    return getattr(error_code, "value", error_code) in _TRANSIENT_NETWORK_ERRORS
+
+
+# Preview saves are frequent and short; keep them out of the task bar where
+# QGIS supports hidden tasks
+_ENCODE_TASK_FLAGS = QgsTask.Flag.CanCancel
+if hasattr(QgsTask.Flag, "Hidden"):
+    _ENCODE_TASK_FLAGS |= QgsTask.Flag.Hidden
+
 qimage_format_rgb32 = qt_image_format("Format_RGB32")
 qimage_format_argb32_premultiplied = qt_image_format(
     "Format_ARGB32_Premultiplied"
 )
+qimage_format_argb32 = qt_image_format("Format_ARGB32")
+# Formats whose pixels are stored as 0xAARRGGBB words (what QImage.pixel()
+# returns for them unchanged)
+_ARGB_WORD_FORMATS = (
+    qimage_format_rgb32,
+    qimage_format_argb32,
+    qimage_format_argb32_premultiplied,
+)
+
+
+def load_preview_image(path: str | Path) -> QImage:
+    """Load a preview from the preview pack, or from disk for other paths.
+
+    Parameters
+    ----------
+    path : str | Path
+        Preview path as emitted by :attr:`PreviewManager.preview_readied`,
+        or a plain image file such as the failure icon.
+
+    Returns
+    -------
+    QImage
+        The decoded image; null when the preview does not exist.
+    """
+    store = preview_store.store_for(path)
+    if store is None:
+        return QImage(str(path))
+    image = QImage()
+    data = store.read(path)
+    if data:
+        # Keys are named ``.png`` whatever the encoding; decode by the
+        # recorded format and let Qt probe the data when that fails
+        image_format = store.image_format(path)
+        if not (image_format and image.loadFromData(data, image_format.upper())):
+            image.loadFromData(data)
+    return image
+
+
+@functools.lru_cache(maxsize=1)
+def preview_lossy_formats() -> tuple[str, ...]:
+    """Return the lossy formats previews may be encoded in, preferred first.
+
+    WebP is used when Qt's image plugins can both read and write it; JPEG
+    is always available.
+
+    Returns
+    -------
+    tuple[str, ...]
+        Qt image format names, e.g. ``("WEBP", "JPEG")``.
+    """
+    readable = {bytes(f).decode().lower() for f in QImageReader.supportedImageFormats()}
+    writable = {bytes(f).decode().lower() for f in QImageWriter.supportedImageFormats()}
+    formats = tuple(
+        image_format
+        for image_format in PreviewManager.PREVIEW_LOSSY_FORMATS
+        if image_format.lower() in readable and image_format.lower() in writable
+    )
+    return formats or ("JPEG",)
+
+
+def load_preview_pixmap(path: str | Path) -> QPixmap:
+    """Return :func:`load_preview_image` as a pixmap."""
+    if preview_store.store_for(path) is None:
+        return QPixmap(str(path))
+    return QPixmap.fromImage(load_preview_image(path))
 
 
 @dataclass
@@ -201,7 +372,6 @@ class VectorPreviewTask(QgsTask):
 
             if update_progress:
                 self.setProgress(85)
-            self.preview_path.parent.mkdir(parents=True, exist_ok=True)
             if not PreviewManager._save_preview_image(image, self.preview_path):
                 self._result = VectorPreviewResult(
                     False,
@@ -347,7 +517,6 @@ class AsyncVectorPreviewRenderer(QObject):
             Logger.info(
                 f"Vector preview rendered for {self.layer_name} using {attempt_label}"
             )
-            self.preview_path.parent.mkdir(parents=True, exist_ok=True)
             if PreviewManager._save_preview_image(rendered_image, self.preview_path):
                 self._finish(True, "")
                 return
@@ -365,6 +534,65 @@ class AsyncVectorPreviewRenderer(QObject):
         )
 
 
+class _PreviewEvictionTask(QgsTask):
+    """Background LRU eviction of cached previews over the size budget."""
+
+    def __init__(self, store: preview_store.PreviewStore, budget: int) -> None:
+        super().__init__(
+            QCoreApplication.translate("BasemapsDialog", "Trimming preview cache...")
+        )
+        self.store = store
+        self.budget = budget
+        self.evicted = 0
+
+    def run(self) -> bool:
+        self.evicted = self.store.evict(self.budget)
+        return True
+
+
+class _PreviewEncodeTask(QgsTask):
+    """Background decoding, compositing, encoding and storing of one preview.
+
+    Parameters
+    ----------
+    task : dict
+        Preview task whose ``"path"`` receives the image.
+    source : bytes | dict[int, bytes]
+        Encoded image of a single-tile preview, or the encoded tiles of a
+        composite by quadrant index (see
+        :meth:`PreviewManager._merge_preview_tiles`).
+    """
+
+    def __init__(self, task: dict, source: bytes | dict[int, bytes]) -> None:
+        super().__init__(
+            QCoreApplication.translate("BasemapsDialog", "Saving preview..."),
+            _ENCODE_TASK_FLAGS,
+        )
+        self.task = task
+        self.source = source
+        # Set on the worker: whether the source decoded, and was stored
+        self.decoded = False
+        self.saved = False
+        # Set on the GUI thread: finished, and whose provider was removed
+        self.done = False
+        self.discarded = False
+
+    def run(self) -> bool:
+        if self.isCanceled():
+            return False
+        if isinstance(self.source, dict):
+            image = PreviewManager._merge_preview_tiles(self.source)
+        else:
+            image = QImage()
+            image.loadFromData(self.source)
+        self.source = None
+        self.decoded = not image.isNull()
+        self.saved = PreviewManager._save_preview_image(
+            image, self.task["path"], canceled=self.isCanceled
+        )
+        return self.saved
+
+
 class PreviewManager(QObject):
     """Manager for fetching and caching basemap preview tiles.
 
@@ -384,7 +612,26 @@ class PreviewManager(QObject):
     # Wayback uses same imagery across all time layers
     WAYBACK_SHARED_LAYER = "WorldImagery"
     PREVIEW_MAX_BYTES = 10 * 1024
-    PREVIEW_JPEG_QUALITIES = (85, 75, 65, 55, 45, 35, 25, 15, 8, 4, 1)
+    # Time superseded in-flight requests get to finish (and be cached)
+    # before they are aborted
+    SUPERSEDED_GRACE_MS = 3000
+    # A request is aborted when its response headers take longer than the
+    # connect timeout, or its data stalls for longer than the transfer one
+    CONNECT_TIMEOUT_MS = 8000
+    TRANSFER_TIMEOUT_MS = 15000
+    # Transient failures are retried after a jittered exponential backoff
+    MAX_FETCH_RETRIES = 2
+    RETRY_BASE_DELAY_MS = 500
+    RETRY_MAX_DELAY_MS = 8000
+    # Time budget of one preview, including retries and zoom escalation
+    PREVIEW_DEADLINE_MS = 60000
+    # Previews flattened, scaled, encoded and stored at the same time
+    PREVIEW_ENCODE_WORKERS = 2
+    # Lossy encodings tried when PNG is too large, most compact first
+    PREVIEW_LOSSY_FORMATS = ("WEBP", "JPEG")
+    # Lossy quality is searched between these bounds at each scale
+    PREVIEW_MAX_QUALITY = 85
+    PREVIEW_MIN_QUALITY = 1
     PREVIEW_SCALE_FACTORS = (
         1.0,
         0.875,
@@ -403,33 +650,59 @@ class PreviewManager(QObject):
         self.previews_dir = resources_dir / "previews"
         self.previews_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create separate subdirectories for default/user and xyz/wms
+        # Previews are stored in a pack (see preview_store) under their
+        # historical per-source/per-type locations
         self._default_xyz_dir = self.previews_dir / "default" / "xyz"
         self._default_wms_dir = self.previews_dir / "default" / "wms"
         self._user_xyz_dir = self.previews_dir / "user" / "xyz"
         self._user_wms_dir = self.previews_dir / "user" / "wms"
-
-        for dir_path in [
-            self._default_xyz_dir,
-            self._default_wms_dir,
-            self._user_xyz_dir,
-            self._user_wms_dir,
-        ]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+        self._store = get_preview_store(self.previews_dir)
+        # Commit buffered preview writes once a burst of saves settles, then
+        # trim the cache if it has outgrown its budget
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(500)
+        self._flush_timer.timeout.connect(self._on_flush_timeout)
+        self._eviction_task: _PreviewEvictionTask | None = None
+        # Catch a cache left over budget by a previous session
+        self._flush_timer.start()
 
         self.failed_icon_path = resources_dir / "icons" / "error.svg"
         self._pending_tasks: set[str] = set()
         self._active_requests: dict = {}  # Map of request_id -> reply object
         self._active_request_tasks: dict[str, dict] = {}
         self._canceled_request_refs: set[tuple[str, int]] = set()
-        self._request_queue: list = []  # Queue of task dicts
+        # Requests aborted by their watchdog, and the watchdogs themselves
+        self._timed_out_refs: set[tuple[str, int]] = set()
+        self._request_watchdogs: dict[str, QTimer] = {}
+        # Task dicts by host and priority, started within connection limits
+        max_connections, max_per_host = preview_connection_limits()
+        self._request_queue = HostScheduler(
+            max_connections, max_per_host, self._task_request_count
+        )
+        # Preview key -> priority of keys the grid views want first
+        self._key_priorities: dict[str, int] = {}
+        # Request scope -> current generation (see begin_scope)
+        self._scope_generations: dict[str, int] = {}
+        # Preview key -> (scope, generation) of the latest request for a key
+        # that was already pending, so a re-requested task is not superseded
+        self._key_generations: dict[str, tuple[str, int]] = {}
         self._vector_preview_tasks: dict[
             str, VectorPreviewTask | AsyncVectorPreviewRenderer
         ] = {}
         self._discarded_keys: set[str] = set()
-
-        # Track composite downloads: key -> {'received': {index: QImage}, 'total': 4, 'failed': bool}
+        # Background preview saves in submission order (results are
+        # delivered in this order), those waiting for a worker, and those
+        # running
+        self._encode_jobs: deque[_PreviewEncodeTask] = deque()
+        self._encode_waiting: deque[_PreviewEncodeTask] = deque()
+        self._encode_running: set[_PreviewEncodeTask] = set()
+
+        # Track composite downloads: key -> {'received': {index: bytes}, 'total': 4, ...}
         self._active_composites: dict = {}
+        # Composite tiles waiting to be fetched again once the host and
+        # connection limits allow: (key, task, composite data, tile indices)
+        self._composite_retries: deque[tuple[str, dict, dict, list[int]]] = deque()
 
         # Track Wayback waiting keys: shared_key -> list of original keys waiting for this preview
         self._wayback_waiting: dict[str, list[str]] = {}
@@ -439,13 +712,6 @@ class PreviewManager(QObject):
         # Track pending capabilities fetch requests: provider_url -> list of waiting tasks
         self._pending_capabilities: dict[str, list[dict]] = {}
 
-        cpu_count = os.cpu_count() or 2
-        if cpu_count <= 4:
-            self._max_concurrent = 2
-        else:
-            self._max_concurrent = (cpu_count // 2) + 1
-        self._max_concurrent = min(self._max_concurrent, 8)
-
     def _is_wayback_provider(self, provider_name: str, url: str) -> bool:
         """Check if provider is Esri Wayback (all layers share same preview)."""
         return "wayback" in provider_name.lower() or "wayback" in url.lower()
@@ -503,7 +769,7 @@ class PreviewManager(QObject):
         Returns
         -------
         Path
-            Path to the preview image file
+            Location of the preview in the preview pack
         """
         base_dir = self._get_preview_dir(service_type, is_default)
 
@@ -511,8 +777,8 @@ class PreviewManager(QObject):
         if self._is_wayback_provider(provider_name, url):
             layer_name = self.WAYBACK_SHARED_LAYER
 
-        safe_provider = "".join([c for c in provider_name if c.isalnum()])
-        safe_layer = "".join([c for c in layer_name if c.isalnum()])
+        safe_provider = safe_name(provider_name)
+        safe_layer = safe_name(layer_name)
         filename = f"{safe_provider}_{safe_layer}.png"
         return base_dir / filename
 
@@ -601,6 +867,7 @@ class PreviewManager(QObject):
         tile_url: str,
         style_url: str = "",
         is_default: bool = True,
+        scope: str = "",
     ) -> None:
         """Queue rendering of a vector tile basemap preview.
 
@@ -616,13 +883,15 @@ class PreviewManager(QObject):
             Tokenized vector tile style URL, when available.
         is_default : bool, default=True
             Whether the provider belongs to the default catalog.
+        scope : str, default=""
+            Request scope (see :meth:`begin_scope`).
         """
         preview_path = self.get_preview_path(
             provider_name, layer_name, "xyz", is_default, tile_url
         )
         key = f"{provider_name}_{layer_name}"
 
-        if preview_path.exists():
+        if self._store.lookup(preview_path):
             if self._is_invalid_vector_preview_cache(preview_path):
                 self._delete_preview_path(preview_path)
             else:
@@ -631,6 +900,7 @@ class PreviewManager(QObject):
                 return
 
         if key in self._pending_tasks:
+            self._renew_request(key, scope)
             return
 
         self._pending_tasks.add(key)
@@ -643,8 +913,12 @@ class PreviewManager(QObject):
             "path": preview_path,
             "key": key,
             "is_default": is_default,
+            "host": host_key(style_url or tile_url),
+            "deadline": time.monotonic() + self.PREVIEW_DEADLINE_MS / 1000,
+            "scope": scope,
+            "generation": self._scope_generations.get(scope, 0),
         }
-        self._request_queue.append(task)
+        self._enqueue(task)
         self._process_queue()
 
     def request_preview(
@@ -655,6 +929,7 @@ class PreviewManager(QObject):
         service_type: str = "xyz",
         layer_data: dict | None = None,
         is_default: bool = True,
+        scope: str = "",
     ) -> None:
         """Request a preview, fetching from network if not cached.
 
@@ -672,6 +947,8 @@ class PreviewManager(QObject):
             Layer data dictionary (for WMS/WMTS)
         is_default : bool
             True if provider is from default directory
+        scope : str, default=""
+            Request scope (see :meth:`begin_scope`).
         """
         # For Wayback, use shared layer name for path but keep original for key
         is_wayback = self._is_wayback_provider(provider_name, url)
@@ -683,7 +960,7 @@ class PreviewManager(QObject):
         # Key uses original layer_name for proper UI matching
         key = f"{provider_name}_{layer_name}"
 
-        if preview_path.exists():
+        if self._store.lookup(preview_path):
             self._ensure_preview_cache_size(preview_path)
             self.preview_readied.emit(key, str(preview_path))
             return
@@ -695,10 +972,16 @@ class PreviewManager(QObject):
                 # Already fetching - add this key to waiting list
                 if shared_key not in self._wayback_waiting:
                     self._wayback_waiting[shared_key] = []
-                self._wayback_waiting[shared_key].append(key)
+                waiting_keys = self._wayback_waiting[shared_key]
+                # The first waiting key is the key of the fetching task
+                if waiting_keys:
+                    self._renew_request(waiting_keys[0], scope)
+                if key not in waiting_keys:
+                    waiting_keys.append(key)
                 return
 
         if key in self._pending_tasks:
+            self._renew_request(key, scope)
             return
 
         self._pending_tasks.add(key)
@@ -723,6 +1006,10 @@ class PreviewManager(QObject):
             "is_default": is_default,
             "is_wayback": is_wayback,
             "retry_as_composite": True,
+            "host": host_key(url),
+            "deadline": time.monotonic() + self.PREVIEW_DEADLINE_MS / 1000,
+            "scope": scope,
+            "generation": self._scope_generations.get(scope, 0),
         }
 
         # For WMTS without resource_url, try to get it from cache
@@ -737,7 +1024,7 @@ class PreviewManager(QObject):
                     layer_data["resource_url"] = cached_url
                     Logger.info(f"Using cached ResourceURL for {layer_name_for_cache}")
 
-        self._request_queue.append(task)
+        self._enqueue(task)
         self._process_queue()
 
     def delete_preview(
@@ -748,7 +1035,7 @@ class PreviewManager(QObject):
         is_default: bool = False,
         url: str = "",
     ) -> bool:
-        """Delete a preview image file.
+        """Delete a preview image.
 
         Parameters
         ----------
@@ -766,19 +1053,12 @@ class PreviewManager(QObject):
         Returns
         -------
         bool
-            True if file was deleted, False otherwise
+            True if the preview was deleted, False otherwise
         """
         preview_path = self.get_preview_path(
             provider_name, layer_name, service_type, is_default, url
         )
-        if preview_path.exists():
-            try:
-                preview_path.unlink()
-                Logger.info(f"Deleted preview: {preview_path}")
-                return True
-            except OSError as e:
-                Logger.warning(f"Failed to delete preview {preview_path}: {e}")
-        return False
+        return self._delete_preview_path(preview_path)
 
     def delete_provider_previews(
         self,
@@ -806,9 +1086,8 @@ class PreviewManager(QObject):
         Returns
         -------
         int
-            Number of deleted preview files
+            Number of deleted previews
         """
-        deleted_paths: set[Path] = set()
         try:
             self._cancel_provider_preview_tasks(
                 provider_name,
@@ -819,7 +1098,7 @@ class PreviewManager(QObject):
         except Exception:
             Logger.warning(
                 f"Failed to cancel preview tasks for '{provider_name}', "
-                "proceeding with file deletion anyway"
+                "proceeding with preview deletion anyway"
             )
 
         Logger.info(
@@ -828,69 +1107,27 @@ class PreviewManager(QObject):
             f"{len(basemaps_or_layers) if basemaps_or_layers else 0} items"
         )
 
-        # For Wayback, just delete the shared preview once
-        if self._is_wayback_provider(provider_name, url):
-            preview_path = self.get_preview_path(
-                provider_name,
-                self.WAYBACK_SHARED_LAYER,
-                service_type,
-                is_default,
-                url,
-            )
-            if self._delete_preview_path(preview_path):
-                deleted_paths.add(preview_path)
-            return len(deleted_paths)
-
-        for item in basemaps_or_layers:
-            # XYZ uses 'name', WMS/WMTS uses 'layer_title'
-            layer_name = item.get("name") or item.get("layer_title", "")
-            if not layer_name:
-                continue
-            preview_path = self.get_preview_path(
-                provider_name,
-                layer_name,
-                service_type,
-                is_default,
-                url,
-            )
-            if self._delete_preview_path(preview_path):
-                deleted_paths.add(preview_path)
-
+        # Every preview of the provider (including the shared Wayback one)
+        # is filed under the same provider scope in the pack
         preview_dir = self._get_preview_dir(service_type, is_default)
-        safe_provider = "".join([c for c in provider_name if c.isalnum()])
-        glob_pattern = f"{safe_provider}_*.png"
-
-        def _delete_glob_matches():
-            """Delete all preview files matching the provider glob pattern."""
-            count = 0
-            for preview_path in preview_dir.glob(glob_pattern):
-                if self._delete_preview_path(preview_path):
-                    deleted_paths.add(preview_path)
-                    count += 1
-            return count
-
-        first_pass = _delete_glob_matches()
-        Logger.info(
-            f"Glob cleanup in {preview_dir}: pattern='{glob_pattern}' "
-            f"→ {first_pass} files"
-        )
+        safe_provider = safe_name(provider_name)
+        deleted_count = self._store.delete_provider(preview_dir, safe_provider)
 
         # Process pending events so that any in-progress vector render tasks
         # that already finished in background threads can emit their results
-        # and save their preview files.  Then do a second pass to remove
-        # anything that was recreated during the first pass.
+        # and save their previews.  Then do a second pass to remove anything
+        # that was recreated during the first pass.
         QCoreApplication.processEvents()
-        second_pass = _delete_glob_matches()
+        second_pass = self._store.delete_provider(preview_dir, safe_provider)
         if second_pass:
             Logger.info(
-                f"Second-pass glob cleanup removed {second_pass} recreated "
-                f"preview file(s) for provider '{provider_name}'"
+                f"Second-pass cleanup removed {second_pass} recreated "
+                f"preview(s) for provider '{provider_name}'"
             )
 
-        Logger.info(
-            f"Deleted {len(deleted_paths)} preview files for provider '{provider_name}'"
-        )
-        return len(deleted_paths)
+        deleted_count += second_pass
+        Logger.info(f"Deleted {deleted_count} previews for provider '{provider_name}'")
+        return deleted_count
 
     def _cancel_provider_preview_tasks(
         self,
@@ -938,14 +1175,9 @@ class PreviewManager(QObject):
 
         canceled_count = 0
 
-        kept_tasks = []
-        for task in self._request_queue:
-            if task_matches(task):
-                canceled_count += 1
-                self._cleanup_temp_style_file(task.get("resolved_style_path"))
-                continue
-            kept_tasks.append(task)
-        self._request_queue = kept_tasks
+        for task in self._request_queue.remove_if(task_matches):
+            canceled_count += 1
+            self._cleanup_temp_style_file(task.get("resolved_style_path"))
 
         for req_id, reply in list(self._active_requests.items()):
             active_task = self._active_request_tasks.get(req_id)
@@ -959,8 +1191,7 @@ class PreviewManager(QObject):
                 )
             )
             if request_matches:
-                self._active_requests.pop(req_id, None)
-                self._active_request_tasks.pop(req_id, None)
+                self._forget_request(req_id)
                 self._canceled_request_refs.add((req_id, id(reply)))
                 if reply and not reply.isFinished():
                     reply.abort()
@@ -980,6 +1211,16 @@ class PreviewManager(QObject):
                     renderer.cancel()
                 canceled_count += 1
 
+        for job in self._encode_jobs:
+            key = job.task["key"]
+            if not job.discarded and self._preview_key_matches(
+                key, target_keys, provider_prefix
+            ):
+                job.discarded = True
+                if job in self._encode_running:
+                    job.cancel()
+                canceled_count += 1
+
         for key, composite_data in list(self._active_composites.items()):
             if self._preview_key_matches(key, target_keys, provider_prefix):
                 self._active_composites.pop(key, None)
@@ -1011,6 +1252,8 @@ class PreviewManager(QObject):
             Logger.info(
                 f"Canceled {canceled_count} pending preview item(s) for {provider_name}"
             )
+            # Aborted requests freed their connection slots
+            self._process_queue()
         return canceled_count
 
     @staticmethod
@@ -1057,32 +1300,203 @@ class PreviewManager(QObject):
 
     @staticmethod
     def _delete_preview_path(preview_path: Path) -> bool:
-        """Delete a preview file path when it exists.
+        """Delete a preview from the preview pack when it exists.
 
         Parameters
         ----------
         preview_path : Path
-            Preview cache file to delete.
+            Preview location to delete.
 
         Returns
         -------
         bool
-            ``True`` when an existing file was deleted.
+            ``True`` when an existing preview was deleted.
         """
-        if not preview_path.exists():
-            return False
-        try:
-            preview_path.unlink()
-            Logger.info(f"Deleted preview: {preview_path}")
-            return True
-        except OSError as exc:
-            Logger.warning(f"Failed to delete preview {preview_path}: {exc}")
+        store = preview_store.store_for(preview_path)
+        if store is None or not store.delete(preview_path):
             return False
+        Logger.info(f"Deleted preview: {preview_path}")
+        return True
+
+    def prioritize_previews(
+        self, visible_keys: Iterable[str], near_keys: Iterable[str] = ()
+    ) -> None:
+        """Fetch the previews of the given keys before all others.
+
+        Called by the grid views whenever their viewport changes; keys
+        prioritized by an earlier call and missing from this one drop back
+        to background priority.
+
+        Parameters
+        ----------
+        visible_keys : Iterable[str]
+            Keys (``{provider}_{layer}``) of the cards in the viewport.
+        near_keys : Iterable[str], default=()
+            Keys of the cards close to the viewport.
+        """
+        priorities = dict.fromkeys(near_keys, PRIORITY_NEAR)
+        priorities.update(dict.fromkeys(visible_keys, PRIORITY_VISIBLE))
+        for key in self._key_priorities.keys() - priorities.keys():
+            self._request_queue.reprioritize(key, PRIORITY_BACKGROUND)
+        for key, priority in priorities.items():
+            if self._key_priorities.get(key) != priority:
+                self._request_queue.reprioritize(key, priority)
+        self._key_priorities = priorities
+
+    def cancel_queued_previews(self, keys: Iterable[str]) -> list[str]:
+        """Drop the previews of *keys* that are still waiting in the queue.
+
+        Used when their grid cards scroll away.  Requests already in flight
+        are left to finish, and shared Wayback fetches are kept since other
+        cards wait on them.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            Preview keys (``{provider}_{layer}``).
+
+        Returns
+        -------
+        list[str]
+            Keys whose queued request was dropped; requesting them again
+            queues a new one.
+        """
+        canceled = []
+        for key in keys:
+            task = self._request_queue.get(key)
+            if task is None or task.get("is_wayback"):
+                continue
+            self._request_queue.cancel(key)
+            self._drop_task(task)
+            canceled.append(key)
+        return canceled
+
+    def begin_scope(
+        self, scope: str, abort_in_flight_after_ms: int | None = None
+    ) -> int:
+        """Start a new generation of preview requests for *scope*.
+
+        A scope groups the requests of one view (e.g. the XYZ gallery), which
+        starts a new generation whenever it switches provider.  Queued
+        requests of earlier generations are dropped.  Their in-flight
+        requests keep running, so previews that finish downloading are still
+        cached, unless *abort_in_flight_after_ms* is given: requests still
+        running after that long are aborted.
+
+        Parameters
+        ----------
+        scope : str
+            Scope name passed to :meth:`request_preview` and
+            :meth:`request_vector_preview`.
+        abort_in_flight_after_ms : int | None, default=None
+            Grace period for in-flight requests of earlier generations, or
+            ``None`` to let them finish.
+
+        Returns
+        -------
+        int
+            The new generation.
+        """
+        generation = self._scope_generations.get(scope, 0) + 1
+        self._scope_generations[scope] = generation
+
+        dropped = self._request_queue.remove_if(self._is_superseded)
+        for provider_url, waiting_tasks in list(self._pending_capabilities.items()):
+            kept_tasks = [t for t in waiting_tasks if not self._is_superseded(t)]
+            if len(kept_tasks) == len(waiting_tasks):
+                continue
+            dropped.extend(t for t in waiting_tasks if self._is_superseded(t))
+            if kept_tasks:
+                self._pending_capabilities[provider_url] = kept_tasks
+            else:
+                self._pending_capabilities.pop(provider_url, None)
+        for task in dropped:
+            self._drop_task(task)
+        if dropped:
+            Logger.info(f"Dropped {len(dropped)} queued preview(s) of {scope}")
+
+        if abort_in_flight_after_ms is not None:
+            QTimer.singleShot(
+                abort_in_flight_after_ms,
+                lambda: self._abort_superseded(scope, generation),
+            )
+        return generation
+
+    def _renew_request(self, key: str, scope: str) -> None:
+        """Move the pending task *key* to the current generation of *scope*.
+
+        Called when a view requests a preview that is still being fetched
+        for an earlier generation (e.g. the user came back to a provider),
+        so the fetch is kept instead of being dropped as superseded.
+        """
+        if scope:
+            generation = self._scope_generations.get(scope, 0)
+            self._key_generations[key] = (scope, generation)
+
+    def _task_generation(self, task: dict) -> int:
+        """Return the latest generation that requested *task*."""
+        generation = task.get("generation", 0)
+        renewed = self._key_generations.get(task["key"])
+        if renewed is not None and renewed[0] == task.get("scope", ""):
+            generation = max(generation, renewed[1])
+        return generation
+
+    def _is_superseded(self, task: dict) -> bool:
+        """Return whether *task* belongs to an earlier generation of its scope."""
+        scope = task.get("scope", "")
+        return self._task_generation(task) < self._scope_generations.get(scope, 0)
+
+    def _drop_task(self, task: dict) -> None:
+        """Forget a preview task that will not be fetched."""
+        key = task["key"]
+        self._pending_tasks.discard(key)
+        self._key_priorities.pop(key, None)
+        self._key_generations.pop(key, None)
+        if task.get("is_wayback"):
+            shared_key = f"{task['provider']}_{self.WAYBACK_SHARED_LAYER}"
+            self._pending_tasks.discard(shared_key)
+            self._wayback_waiting.pop(shared_key, None)
+        self._cleanup_temp_style_file(task.get("resolved_style_path"))
+
+    def _abort_superseded(self, scope: str, generation: int) -> None:
+        """Abort in-flight requests of *scope* older than *generation*."""
+        aborted = set()
+        for req_id, task in list(self._active_request_tasks.items()):
+            if task.get("scope", "") != scope:
+                continue
+            if self._task_generation(task) >= generation:
+                continue
+            reply = self._active_requests.get(req_id)
+            self._forget_request(req_id)
+            if reply is not None:
+                self._canceled_request_refs.add((req_id, id(reply)))
+                if not reply.isFinished():
+                    reply.abort()
+            self._active_composites.pop(task["key"], None)
+            self._drop_task(task)
+            aborted.add(task["key"])
+        if aborted:
+            Logger.info(f"Aborted {len(aborted)} superseded preview(s) of {scope}")
+            self._process_queue()
+
+    def _enqueue(self, task: dict, front: bool = False) -> None:
+        """Queue *task* at the priority its grid card currently has.
+
+        Retries of a task whose scope has moved on are dropped instead.
+        """
+        if self._is_superseded(task):
+            self._drop_task(task)
+            return
+        priority = self._key_priorities.get(task["key"], PRIORITY_BACKGROUND)
+        self._request_queue.push(task, priority, front)
 
     def _process_queue(self) -> None:
-        """Process queued requests up to max concurrent limit."""
-        while len(self._active_requests) < self._max_concurrent and self._request_queue:
-            task = self._request_queue.pop(0)
+        """Start queued requests within the total and per-host limits."""
+        self._start_composite_retries()
+        while True:
+            task = self._request_queue.pop()
+            if task is None:
+                break
             key = task["key"]
 
             if task["type"] == "single":
@@ -1137,6 +1551,8 @@ class PreviewManager(QObject):
                     "tiles": tiles,
                     "z": z,
                     "retry_count": 0,
+                    # Failed tiles that may succeed when retried
+                    "transient": set(),
                     "task": task,
                 }
 
@@ -1208,6 +1624,107 @@ class PreviewManager(QObject):
         )
         self._active_requests[req_id] = reply
         self._active_request_tasks[req_id] = task
+        self._request_queue.acquire(task.get("host", ""))
+        self._watch_request(req_id, reply, task)
+
+    def _watch_request(self, req_id: str, reply, task: dict) -> None:
+        """Abort *reply* when it connects or transfers too slowly.
+
+        The watchdog allows :attr:`CONNECT_TIMEOUT_MS` until the response
+        headers arrive, then :attr:`TRANSFER_TIMEOUT_MS` between chunks of
+        data, never past the preview's deadline.
+        """
+        watchdog = QTimer(self)
+        watchdog.setSingleShot(True)
+        watchdog.timeout.connect(lambda: self._on_request_timeout(req_id, reply))
+
+        def rearm(*_args) -> None:
+            watchdog.start(
+                min(self.TRANSFER_TIMEOUT_MS, self._deadline_remaining_ms(task))
+            )
+
+        reply.metaDataChanged.connect(rearm)
+        reply.downloadProgress.connect(rearm)
+        watchdog.start(min(self.CONNECT_TIMEOUT_MS, self._deadline_remaining_ms(task)))
+        self._request_watchdogs[req_id] = watchdog
+
+    def _on_request_timeout(self, req_id: str, reply) -> None:
+        if self._active_requests.get(req_id) is not reply:
+            return
+        Logger.info(f"Preview request timed out: {req_id}")
+        self._timed_out_refs.add((req_id, id(reply)))
+        reply.abort()
+
+    def _forget_request(self, req_id: str, reply: object = None) -> None:
+        """Stop tracking request *req_id* and free its host slot.
+
+        With *reply*, nothing happens unless *req_id* is still tracked for
+        that reply (a canceled request id may have been reused).
+        """
+        if reply is not None and self._active_requests.get(req_id) is not reply:
+            return
+        self._active_requests.pop(req_id, None)
+        task = self._active_request_tasks.pop(req_id, None)
+        if task is not None:
+            self._request_queue.release(task.get("host", ""))
+        watchdog = self._request_watchdogs.pop(req_id, None)
+        if watchdog is not None:
+            watchdog.stop()
+            watchdog.deleteLater()
+
+    def _deadline_remaining_ms(self, task: dict) -> int:
+        """Milliseconds left before *task*'s preview deadline (at least 0)."""
+        deadline = task.get("deadline")
+        if deadline is None:
+            return self.PREVIEW_DEADLINE_MS
+        return max(0, int((deadline - time.monotonic()) * 1000))
+
+    def _retry_delay_ms(self, attempt: int) -> int:
+        """Backoff before retry number *attempt* (0-based), with jitter.
+
+        The delay doubles with every attempt up to
+        :attr:`RETRY_MAX_DELAY_MS`; a random half of it is dropped so that
+        previews failing together do not retry in lockstep.
+        """
+        delay = min(self.RETRY_MAX_DELAY_MS, self.RETRY_BASE_DELAY_MS << attempt)
+        return int(delay / 2 + random.uniform(0, delay / 2))
+
+    def _schedule_retry(self, task: dict) -> bool:
+        """Queue *task* again after a backoff, if retries and time remain."""
+        attempt = task.get("attempts", 0)
+        delay = self._retry_delay_ms(attempt)
+        if attempt >= self.MAX_FETCH_RETRIES or delay >= self._deadline_remaining_ms(
+            task
+        ):
+            return False
+        task["attempts"] = attempt + 1
+        Logger.info(f"Retrying preview {task['key']} in {delay} ms")
+        QTimer.singleShot(delay, lambda: self._requeue_retry(task))
+        return True
+
+    def _requeue_retry(self, task: dict) -> None:
+        # Canceled or cleaned up while waiting
+        if task["key"] not in self._pending_tasks:
+            return
+        self._enqueue(task, front=True)
+        self._process_queue()
+
+    @staticmethod
+    def _task_request_count(task: dict) -> int:
+        """Number of requests *task* starts at once when dequeued."""
+        return 4 if task["type"] == "composite" else 1
+
+    def host_metrics(self) -> dict[str, dict[str, int]]:
+        """Return queued, in-flight and started preview requests per host.
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            ``{"https://tile.example.com": {"queued": 12, "in_flight": 4,
+            "started": 30}, ...}``; ``queued`` counts tasks, the others
+            count requests.
+        """
+        return self._request_queue.metrics()
 
     def _construct_preview_url(
         self,
@@ -1401,9 +1918,9 @@ class PreviewManager(QObject):
         Returns
         -------
         bool
-            ``True`` when the cache file is a placeholder or a blank render.
+            ``True`` when the cached preview is a placeholder or a blank render.
         """
-        image = QImage(str(preview_path))
+        image = load_preview_image(preview_path)
         if image.isNull():
             return True
 
@@ -1440,43 +1957,19 @@ class PreviewManager(QObject):
         Returns
         -------
         bool
-            ``True`` when the image contains almost no meaningful content.
+            ``True`` when the image contains almost no meaningful content
+            (see :mod:`blank_detect` for the thresholds).
         """
         if image.isNull() or image.size() != QSize(256, 256):
             return False
 
-        sample_counts: dict[tuple[int, int, int], int] = {}
-        for y in range(0, image.height(), 4):
-            for x in range(0, image.width(), 4):
-                color = QColor(image.pixel(x, y))
-                key = (color.red(), color.green(), color.blue())
-                sample_counts[key] = sample_counts.get(key, 0) + 1
-
-        if not sample_counts:
-            return True
-
-        background_rgb = max(sample_counts.items(), key=lambda item: item[1])[0]
-        background = QColor(*background_rgb)
-        total_samples = 0
-        distinct_samples = 0
-
-        for y in range(0, image.height(), 4):
-            for x in range(0, image.width(), 4):
-                color = QColor(image.pixel(x, y))
-                total_samples += 1
-                delta = max(
-                    abs(color.red() - background.red()),
-                    abs(color.green() - background.green()),
-                    abs(color.blue() - background.blue()),
-                )
-                if delta > 25:
-                    distinct_samples += 1
-
-        if total_samples == 0:
-            return True
-
-        distinct_ratio = distinct_samples / total_samples
-        return distinct_ratio < 0.012
+        if image.format() not in _ARGB_WORD_FORMATS:
+            image = image.convertToFormat(qimage_format_argb32)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        return blank_detect.is_blank(
+            bits, image.width(), image.height(), image.bytesPerLine() // 4
+        )
 
     @classmethod
     def render_vector_preview_image(
@@ -1624,6 +2117,7 @@ class PreviewManager(QObject):
             return
 
         if result.success and result.image_path:
+            self._flush_timer.start()
             Logger.info(f"Vector preview saved for {result.key}: {result.image_path}")
             self.preview_readied.emit(result.key, result.image_path)
             return
@@ -2246,6 +2740,13 @@ class PreviewManager(QObject):
             return QIODevice.OpenModeFlag.WriteOnly
         return QIODevice.WriteOnly
 
+    @staticmethod
+    def _read_only_mode() -> object:
+        """Return the Qt read-only mode for both Qt5 and Qt6."""
+        if hasattr(QIODevice, "OpenModeFlag"):
+            return QIODevice.OpenModeFlag.ReadOnly
+        return QIODevice.ReadOnly
+
     @staticmethod
     def _flatten_preview_image(image: QImage) -> QImage:
         """Convert a preview image to an opaque RGB image.
@@ -2333,32 +2834,218 @@ class PreviewManager(QObject):
 
     @staticmethod
     def _write_preview_bytes(path: Path, image_bytes: bytes) -> bool:
-        """Write encoded preview bytes to disk.
+        """Write encoded preview bytes to the preview pack.
 
         Parameters
         ----------
         path : Path
-            Target cache path.
+            Target preview location.
         image_bytes : bytes
             Encoded preview bytes.
 
         Returns
         -------
         bool
-            ``True`` when the bytes were written successfully.
+            ``True`` when the bytes were stored successfully.
         """
-        try:
-            path.write_bytes(image_bytes)
-            return True
-        except OSError as exc:
-            Logger.warning(f"Failed to write compressed preview {path}: {exc}")
+        store = preview_store.store_for(path)
+        if store is None:
+            Logger.warning(f"No preview pack open for {path}")
             return False
+        store.write(path, image_bytes)
+        return True
+
+    @staticmethod
+    def _search_quality(
+        image: QImage, max_bytes: int, floor_bytes: bytes, image_format: str
+    ) -> tuple[bytes, int]:
+        """Find the highest quality of *image* that fits *max_bytes*.
+
+        Parameters
+        ----------
+        image : QImage
+            Opaque image to encode.
+        max_bytes : int
+            Maximum encoded size in bytes.
+        floor_bytes : bytes
+            Encoding at :attr:`PREVIEW_MIN_QUALITY`, known to fit; the
+            encoding at :attr:`PREVIEW_MAX_QUALITY` is known not to.
+        image_format : str
+            Lossy Qt image format name, ``"WEBP"`` or ``"JPEG"``.
+
+        Returns
+        -------
+        tuple[bytes, int]
+            Encoded bytes and the quality they were encoded with.
+        """
+        low = PreviewManager.PREVIEW_MIN_QUALITY
+        high = PreviewManager.PREVIEW_MAX_QUALITY
+        # Sizes grow with quality: keep ``low`` fitting, ``high`` too large
+        best = floor_bytes
+        while high - low > 1:
+            quality = (low + high) // 2
+            image_bytes = PreviewManager._encode_preview_image(
+                image, image_format, quality
+            )
+            if image_bytes and len(image_bytes) <= max_bytes:
+                low, best = quality, image_bytes
+            else:
+                high = quality
+        return best, low
+
+    @staticmethod
+    def _preview_fidelity(reference: QImage, image_bytes: bytes) -> float:
+        """Return the PSNR in dB of encoded *image_bytes* against *reference*.
+
+        The decoded image is scaled back to the reference size, so smaller
+        encodings pay for the detail they lost (see :mod:`image_fidelity`
+        for how pixels are compared).
+        """
+        decoded = QImage.fromData(image_bytes)
+        if decoded.isNull():
+            return 0.0
+        if decoded.size() != reference.size():
+            decoded = decoded.scaled(
+                reference.size(),
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+
+        buffers = []
+        for image in (reference, decoded):
+            if image.format() not in _ARGB_WORD_FORMATS:
+                image = image.convertToFormat(qimage_format_argb32)
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            # Keep the image alive for as long as its bits are read
+            buffers.append((image, bits))
+        (reference, reference_bits), (decoded, decoded_bits) = buffers
+        return image_fidelity.psnr(
+            reference_bits,
+            decoded_bits,
+            reference.width(),
+            reference.height(),
+            reference.bytesPerLine() // 4,
+            decoded.bytesPerLine() // 4,
+        )
+
+    @staticmethod
+    def _encode_preview_lossy(
+        image: QImage, max_bytes: int, image_format: str = "JPEG"
+    ) -> bytes:
+        """Encode *image* in a lossy format, as faithfully as *max_bytes* allows.
+
+        Scales are tried from largest to smallest, each first at the
+        maximum quality; a scale that fits there ends the search.  Otherwise
+        the minimum quality is tried: when even that does not fit, it gives
+        a bytes-per-pixel estimate, and later scales whose estimated minimum
+        size still exceeds the budget are skipped without encoding (bytes
+        per pixel only grow as images shrink, so the estimate never skips a
+        scale that fits).  Between the two, the quality is binary-searched.
+        Candidates of successive scales are compared by
+        :meth:`_preview_fidelity` until one loses to its predecessor; the
+        fidelity is only computed once there are two candidates to compare.
+
+        Parameters
+        ----------
+        image : QImage
+            Preview image; transparency is flattened onto white.
+        max_bytes : int
+            Maximum encoded size in bytes.
+        image_format : str, default="JPEG"
+            Lossy Qt image format name, ``"WEBP"`` or ``"JPEG"``.
+
+        Returns
+        -------
+        bytes
+            Best encoding found, or empty bytes when nothing fits.
+        """
+        rgb_image = PreviewManager._flatten_preview_image(image)
+        min_bytes_per_pixel = 0.0
+        best = b""
+        best_fidelity = None
+
+        for scale_factor in PreviewManager.PREVIEW_SCALE_FACTORS:
+            width = max(1, int(rgb_image.width() * min(scale_factor, 1.0)))
+            height = max(1, int(rgb_image.height() * min(scale_factor, 1.0)))
+            pixels = width * height
+            if min_bytes_per_pixel * pixels > max_bytes:
+                continue
+
+            scaled_image = PreviewManager._scaled_preview_image(rgb_image, scale_factor)
+            quality = PreviewManager.PREVIEW_MAX_QUALITY
+            image_bytes = PreviewManager._encode_preview_image(
+                scaled_image, image_format, quality
+            )
+            if not image_bytes or len(image_bytes) > max_bytes:
+                floor_bytes = PreviewManager._encode_preview_image(
+                    scaled_image, image_format, PreviewManager.PREVIEW_MIN_QUALITY
+                )
+                if not floor_bytes:
+                    continue
+                if len(floor_bytes) > max_bytes:
+                    min_bytes_per_pixel = len(floor_bytes) / pixels
+                    continue
+                image_bytes, quality = PreviewManager._search_quality(
+                    scaled_image, max_bytes, floor_bytes, image_format
+                )
+
+            if best:
+                if best_fidelity is None:
+                    best_fidelity = PreviewManager._preview_fidelity(rgb_image, best)
+                fidelity = PreviewManager._preview_fidelity(rgb_image, image_bytes)
+                if fidelity <= best_fidelity:
+                    break
+                best_fidelity = fidelity
+            best = image_bytes
+            # Smaller scales cannot raise the quality any further
+            if quality >= PreviewManager.PREVIEW_MAX_QUALITY:
+                break
+
+        return best
+
+    @staticmethod
+    def _compress_preview_image(
+        image: QImage,
+        max_bytes: int = PREVIEW_MAX_BYTES,
+        image_formats: tuple[str, ...] | None = None,
+    ) -> bytes:
+        """Encode a preview image within the configured size budget.
+
+        Parameters
+        ----------
+        image : QImage
+            Preview image to encode.
+        max_bytes : int, default=PREVIEW_MAX_BYTES
+            Maximum encoded size in bytes.
+        image_formats : tuple[str, ...] | None, default=None
+            Lossy formats to try in order; :func:`preview_lossy_formats`
+            when ``None``.
+
+        Returns
+        -------
+        bytes
+            PNG bytes when they fit, otherwise the first lossy encoding
+            chosen by :meth:`_encode_preview_lossy` that fits; empty bytes
+            when nothing fits.
+        """
+        png_bytes = PreviewManager._encode_preview_image(image, "PNG")
+        if png_bytes and len(png_bytes) <= max_bytes:
+            return png_bytes
+        for image_format in image_formats or preview_lossy_formats():
+            image_bytes = PreviewManager._encode_preview_lossy(
+                image, max_bytes, image_format
+            )
+            if image_bytes:
+                return image_bytes
+        return b""
 
     @staticmethod
     def _save_preview_image(
         image: QImage,
         path: Path,
         max_bytes: int = PREVIEW_MAX_BYTES,
+        canceled: Callable[[], bool] | None = None,
     ) -> bool:
         """Save a preview image within the configured size budget.
 
@@ -2367,43 +3054,27 @@ class PreviewManager(QObject):
         image : QImage
             Preview image to save.
         path : Path
-            Target cache path.
+            Target preview location.
         max_bytes : int, default=PREVIEW_MAX_BYTES
-            Maximum encoded file size in bytes.
+            Maximum encoded size in bytes.
+        canceled : Callable[[], bool] | None, default=None
+            Checked once the image is encoded; nothing is stored when it
+            returns ``True``.
 
         Returns
         -------
         bool
-            ``True`` when a preview file was written successfully.
+            ``True`` when the preview was stored successfully.
         """
         if image.isNull():
             Logger.warning(f"Cannot save null preview image to {path}")
             return False
 
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-        except OSError as exc:
-            Logger.warning(
-                f"Failed to create preview cache directory {path.parent}: {exc}"
-            )
+        image_bytes = PreviewManager._compress_preview_image(image, max_bytes)
+        if canceled is not None and canceled():
             return False
-
-        png_bytes = PreviewManager._encode_preview_image(image, "PNG")
-        if png_bytes and len(png_bytes) <= max_bytes:
-            return PreviewManager._write_preview_bytes(path, png_bytes)
-
-        rgb_image = PreviewManager._flatten_preview_image(image)
-
-        for scale_factor in PreviewManager.PREVIEW_SCALE_FACTORS:
-            scaled_image = PreviewManager._scaled_preview_image(rgb_image, scale_factor)
-            for quality in PreviewManager.PREVIEW_JPEG_QUALITIES:
-                jpeg_bytes = PreviewManager._encode_preview_image(
-                    scaled_image, "JPEG", quality
-                )
-                if not jpeg_bytes:
-                    continue
-                if len(jpeg_bytes) <= max_bytes:
-                    return PreviewManager._write_preview_bytes(path, jpeg_bytes)
+        if image_bytes:
+            return PreviewManager._write_preview_bytes(path, image_bytes)
 
         Logger.warning(f"Failed to compress preview below {max_bytes} bytes: {path}")
         return False
@@ -2413,23 +3084,21 @@ class PreviewManager(QObject):
         preview_path: Path,
         max_bytes: int = PREVIEW_MAX_BYTES,
     ) -> None:
-        """Compress an existing preview cache file when it exceeds the budget.
+        """Compress an existing cached preview when it exceeds the budget.
 
         Parameters
         ----------
         preview_path : Path
-            Existing preview cache file.
+            Existing preview location.
         max_bytes : int, default=PREVIEW_MAX_BYTES
             Maximum allowed cache size in bytes.
         """
-        try:
-            if preview_path.stat().st_size <= max_bytes:
-                return
-        except OSError as exc:
-            Logger.warning(f"Failed to inspect preview cache {preview_path}: {exc}")
+        store = preview_store.store_for(preview_path)
+        size = store.size(preview_path) if store is not None else None
+        if size is None or size <= max_bytes:
             return
 
-        image = QImage(str(preview_path))
+        image = load_preview_image(preview_path)
         if image.isNull():
             Logger.warning(f"Cannot recompress unreadable preview cache {preview_path}")
             return
@@ -2448,25 +3117,22 @@ class PreviewManager(QObject):
         if canceled_request_ref in self._canceled_request_refs:
             self._canceled_request_refs.discard(canceled_request_ref)
             reply.deleteLater()
-            self._active_requests.pop(req_id, None)
-            self._active_request_tasks.pop(req_id, None)
+            self._forget_request(req_id, reply)
             return
 
         content = reply.readAll()
         error_code = reply.error()
         http_status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
         reply.deleteLater()
-        self._active_requests.pop(req_id, None)
-        self._active_request_tasks.pop(req_id, None)
+        self._forget_request(req_id, reply)
+        timed_out = canceled_request_ref in self._timed_out_refs
+        self._timed_out_refs.discard(canceled_request_ref)
 
         key = task["key"]
 
-        success = False
-        image = QImage()
-        if content and len(content) > 50:
-            image.loadFromData(content)
-            if not image.isNull() and image.width() > 10:
-                success = True
+        # Only the image header is read here; tiles are decoded by the
+        # background save (see _PreviewEncodeTask)
+        success = self._looks_like_tile_image(content)
 
         # Log for WMTS requests (including Wayback)
         if task.get("service_type") == "wmts":
@@ -2507,28 +3173,30 @@ class PreviewManager(QObject):
             self._process_queue()
 
         elif task["type"] == "single":
+            transient = timed_out or network_reply_is_transient(
+                error_code, http_status
+            )
             if success:
-                self._finalize_image(task, image)
-            elif task.get("retry_as_composite", False):
-                Logger.info(f"Preview z=0 failed for {key}, retrying as composite z=1")
-                task["type"] = "composite"
-                task["z"] = 1
-                task["retry_as_composite"] = False
-                self._request_queue.insert(0, task)
+                self._finalize_image(task, bytes(content))
+            elif transient and self._schedule_retry(task):
                 self._process_queue()
-            else:
+            elif not self._retry_as_composite(task):
                 Logger.warning(f"Preview failed for {key}")
                 self._on_fetch_failed(task)
 
         elif task["type"] == "composite":
             comp_data = self._active_composites.get(key)
             if not comp_data:
+                # The freed slot may start a waiting request
+                self._process_queue()
                 return
 
             if success:
-                comp_data["received"][composite_idx] = image
+                comp_data["received"][composite_idx] = bytes(content)
             else:
                 comp_data["failed"].add(composite_idx)
+                if timed_out or network_reply_is_transient(error_code, http_status):
+                    comp_data["transient"].add(composite_idx)
 
             comp_data["completed"] = comp_data.get("completed", 0) + 1
 
@@ -2538,7 +3206,14 @@ class PreviewManager(QObject):
             self._process_queue()
 
     def _handle_composite_complete(self, key: str, task: dict) -> None:
-        """Process a composite once all in-flight tiles have reported."""
+        """Process a composite once all in-flight tiles have reported.
+
+        Tiles that failed transiently are retried at the same zoom after a
+        backoff (at most :attr:`MAX_FETCH_RETRIES` rounds).  Otherwise a
+        full or partial result is saved, and zoom escalation tries the next
+        level when tiles are missing; retries and escalation stop at the
+        preview's deadline.
+        """
         comp_data = self._active_composites.get(key)
         if not comp_data:
             return
@@ -2553,107 +3228,250 @@ class PreviewManager(QObject):
             self._merge_and_save(task, received)
             return
 
+        retry_tiles = comp_data.get("transient", set()) & failed
+        attempt = comp_data.get("retry_count", 0)
+        delay = self._retry_delay_ms(attempt)
+        if (
+            retry_tiles
+            and attempt < self.MAX_FETCH_RETRIES
+            and delay < self._deadline_remaining_ms(task)
+        ):
+            comp_data["retry_count"] = attempt + 1
+            Logger.info(
+                f"Composite z={comp_data['z']} for {key}: {len(received)}/{total} "
+                f"ok, retrying {len(retry_tiles)} tile(s) in {delay} ms"
+            )
+            QTimer.singleShot(
+                delay,
+                lambda: self._retry_composite_tiles(
+                    key, task, comp_data, set(retry_tiles)
+                ),
+            )
+            return
+
+        self._active_composites.pop(key, None)
+        current_z = task.get("z", 1)
+        can_escalate = current_z < 3 and self._deadline_remaining_ms(task) > 0
+
         # All tiles failed → escalate zoom or give up
         if len(received) == 0:
-            self._active_composites.pop(key, None)
-            current_z = task.get("z", 1)
-            if current_z < 3:
+            if can_escalate:
                 Logger.info(
                     f"Composite z={current_z} all failed for {key}, "
                     f"retrying z={current_z + 1}"
                 )
                 task["z"] = current_z + 1
-                self._request_queue.insert(0, task)
+                self._enqueue(task, front=True)
                 self._process_queue()
             else:
                 Logger.warning(
-                    f"Composite preview failed for {key} - all tiles failed at max zoom"
+                    f"Composite preview failed for {key} - all tiles failed "
+                    f"at z={current_z}"
                 )
                 self._on_fetch_failed(task)
             return
 
-        # Partial: some succeeded, some failed
-        if comp_data.get("retry_count", 0) < 5:
-            # Retry each failed tile once
-            comp_data["retry_count"] = comp_data.get("retry_count", 0) + 1
-            comp_data["completed"] = len(received)
-            retry_failed = set(failed)
-            comp_data["failed"] = set()
-            z = comp_data["z"]
-            tiles = comp_data["tiles"]
-            Logger.info(
-                f"Composite z={z} partial for {key}: "
-                f"{len(received)}/{total} ok, retrying {len(retry_failed)} failed"
-            )
-            for x, y, idx in tiles:
-                if idx in retry_failed:
-                    fetch_url = self._construct_preview_url(
-                        task["url"],
-                        task["service_type"],
-                        task["layer_data"],
-                        z=z,
-                        x=x,
-                        y=y,
-                    )
-                    if fetch_url:
-                        req_id = f"{key}_comp_retry_{idx}"
-                        self._start_request(fetch_url, req_id, task, composite_idx=idx)
-                    else:
-                        comp_data["failed"].add(idx)
-                        comp_data["completed"] = comp_data.get("completed", 0) + 1
-            # Check if all retries failed immediately
-            if comp_data.get("completed", 0) >= total:
-                self._handle_composite_complete(key, task)
-        else:
-            # Already retried — accept partial, but also try next zoom
-            # to get better coverage (higher zoom = smaller, denser tiles)
-            self._active_composites.pop(key, None)
+        # Partial: accept it, but also try the next zoom for better coverage
+        # (higher zoom = smaller, denser tiles)
+        Logger.info(
+            f"Composite z={current_z} accepted partial for {key}: "
+            f"{len(received)}/{total} tiles"
+        )
+        self._merge_and_save(task, received)
+        if can_escalate:
             Logger.info(
-                f"Composite z={comp_data['z']} accepted partial for {key}: "
-                f"{len(received)}/{total} tiles"
+                f"Composite z={current_z} partial for {key}, "
+                f"also trying z={current_z + 1}"
             )
-            self._merge_and_save(task, received)
+            task["z"] = current_z + 1
+            self._enqueue(task, front=True)
+            self._process_queue()
 
-            current_z = task.get("z", 1)
-            if current_z < 3:
-                Logger.info(
-                    f"Composite z={current_z} partial for {key}, "
-                    f"also trying z={current_z + 1}"
+    def _retry_composite_tiles(
+        self, key: str, task: dict, comp_data: dict, indices: set[int]
+    ) -> None:
+        """Fetch the composite tiles *indices* of *key* again.
+
+        The tiles wait in :attr:`_composite_retries` and are started by
+        :meth:`_process_queue` as the host and connection limits allow.
+        """
+        if self._active_composites.get(key) is not comp_data:
+            # Canceled or cleaned up while waiting
+            return
+        comp_data["failed"] -= indices
+        comp_data["transient"] -= indices
+        comp_data["completed"] -= len(indices)
+        self._composite_retries.append((key, task, comp_data, sorted(indices)))
+        self._process_queue()
+
+    def _start_composite_retries(self) -> None:
+        """Start waiting composite tile retries, one request at a time.
+
+        Retried tiles belong to previews already partly fetched, so they
+        take free request slots before queued tasks.  Tiles that do not fit
+        yet keep waiting for the next call.
+        """
+        waiting, self._composite_retries = self._composite_retries, deque()
+        for key, task, comp_data, indices in waiting:
+            if self._active_composites.get(key) is not comp_data:
+                # Canceled or cleaned up while waiting
+                continue
+            if self._is_superseded(task):
+                self._active_composites.pop(key, None)
+                self._drop_task(task)
+                continue
+            host = task.get("host", "")
+            tiles = {idx: (x, y) for x, y, idx in comp_data["tiles"]}
+            while indices and self._request_queue.fits(host):
+                idx = indices.pop(0)
+                x, y = tiles[idx]
+                fetch_url = self._construct_preview_url(
+                    task["url"],
+                    task["service_type"],
+                    task["layer_data"],
+                    z=comp_data["z"],
+                    x=x,
+                    y=y,
                 )
-                task["z"] = current_z + 1
-                self._request_queue.insert(0, task)
-                self._process_queue()
+                if fetch_url:
+                    req_id = f"{key}_comp_retry_{idx}"
+                    self._start_request(fetch_url, req_id, task, composite_idx=idx)
+                else:
+                    comp_data["failed"].add(idx)
+                    comp_data["completed"] += 1
+            if indices:
+                self._composite_retries.append((key, task, comp_data, indices))
+            elif comp_data["completed"] >= comp_data["total"]:
+                # Every retry failed immediately
+                self._handle_composite_complete(key, task)
 
-    def _merge_and_save(self, task: dict, images: dict) -> None:
+    @staticmethod
+    def _looks_like_tile_image(content) -> bool:
+        """Return whether a reply body is a usable tile image.
+
+        Only the image header is parsed: the format must be readable and,
+        when the header records it, the image wider than 10 pixels.
+        """
+        if not content or len(content) <= 50:
+            return False
+        buffer = QBuffer()
+        buffer.setData(content)
+        if not buffer.open(PreviewManager._read_only_mode()):
+            return False
+        try:
+            reader = QImageReader(buffer)
+            if not reader.canRead():
+                return False
+            size = reader.size()
+            return not size.isValid() or size.width() > 10
+        finally:
+            buffer.close()
+
+    @staticmethod
+    def _merge_preview_tiles(tiles: dict[int, bytes]) -> QImage:
+        """Decode composite *tiles* and merge them into a 256×256 preview.
+
+        Tiles are placed in a 2×2 mosaic by index (0 top-left, 1 top-right,
+        2 bottom-left, 3 bottom-right); tiles that fail to decode stay
+        transparent.  Safe to call from worker threads.
+
+        Returns
+        -------
+        QImage
+            The merged preview; null when no tile could be decoded.
+        """
         canvas = QImage(512, 512, qimage_format_argb32_premultiplied)
         canvas.fill(0)
         painter = QPainter(canvas)
 
         positions = {0: (0, 0), 1: (256, 0), 2: (0, 256), 3: (256, 256)}
 
-        for idx, img in images.items():
-            if img and not img.isNull():
+        decoded = 0
+        for idx, data in tiles.items():
+            img = QImage()
+            if data and img.loadFromData(data):
                 x, y = positions.get(idx, (0, 0))
                 painter.drawImage(x, y, img)
+                decoded += 1
 
         painter.end()
+        if not decoded:
+            return QImage()
 
-        final_img = canvas.scaled(
+        return canvas.scaled(
             256,
             256,
             Qt.AspectRatioMode.IgnoreAspectRatio,
             Qt.TransformationMode.SmoothTransformation,
         )
 
-        key = task["key"]
-        path = task["path"]
-        is_wayback = task.get("is_wayback", False)
-        provider_name = task.get("provider", "")
+    def _merge_and_save(self, task: dict, tiles: dict[int, bytes]) -> None:
+        self._save_preview_async(task, dict(tiles))
 
-        if self._save_preview_image(final_img, path):
+    def _finalize_image(self, task: dict, data: bytes) -> None:
+        self._save_preview_async(task, data)
+        self._process_queue()
+
+    def _save_preview_async(
+        self, task: dict, source: bytes | dict[int, bytes]
+    ) -> None:
+        """Decode and store *source* as the preview of *task* in the background.
+
+        At most :attr:`PREVIEW_ENCODE_WORKERS` saves run at once; results
+        are delivered (and :attr:`preview_readied` emitted) in the order
+        the saves were submitted.
+        """
+        job = _PreviewEncodeTask(task, source)
+        job.taskCompleted.connect(lambda: self._on_encode_done(job))
+        job.taskTerminated.connect(lambda: self._on_encode_done(job))
+        self._encode_jobs.append(job)
+        self._encode_waiting.append(job)
+        self._start_encode_jobs()
+
+    def _start_encode_jobs(self) -> None:
+        while (
+            self._encode_waiting
+            and len(self._encode_running) < self.PREVIEW_ENCODE_WORKERS
+        ):
+            job = self._encode_waiting.popleft()
+            if job.discarded:
+                job.done = True
+                continue
+            self._encode_running.add(job)
+            QgsApplication.taskManager().addTask(job)
+        self._deliver_encoded_previews()
+
+    def _on_encode_done(self, job: _PreviewEncodeTask) -> None:
+        if job not in self._encode_running:
+            # Finished after cleanup()
+            return
+        self._encode_running.discard(job)
+        job.done = True
+        self._start_encode_jobs()
+
+    def _deliver_encoded_previews(self) -> None:
+        """Report finished saves at the head of the submission order."""
+        while self._encode_jobs and self._encode_jobs[0].done:
+            job = self._encode_jobs.popleft()
+            task = job.task
+            key = task["key"]
+            path = task["path"]
+            if job.discarded:
+                if job.saved:
+                    Logger.info(f"Discarding preview for deleted provider: {key}")
+                    self._delete_preview_path(Path(path))
+                continue
+            if not job.saved:
+                # A z=0 tile whose header parsed but whose data did not
+                # decode gets the same composite fallback as a failed fetch
+                if job.decoded or not self._retry_as_composite(task):
+                    self._on_fetch_failed(task)
+                continue
+
+            self._flush_timer.start()
             self._pending_tasks.discard(key)
-            if is_wayback:
-                shared_key = f"{provider_name}_{self.WAYBACK_SHARED_LAYER}"
+            if task.get("is_wayback", False):
+                shared_key = f"{task.get('provider', '')}_{self.WAYBACK_SHARED_LAYER}"
                 self._pending_tasks.discard(shared_key)
                 # Emit signal for all waiting keys
                 waiting_keys = self._wayback_waiting.pop(shared_key, [])
@@ -2664,31 +3482,28 @@ class PreviewManager(QObject):
                     self.preview_readied.emit(wkey, str(path))
             else:
                 self.preview_readied.emit(key, str(path))
-            Logger.info(f"Composite preview saved for {key}")
-        else:
-            self._on_fetch_failed(task)
-
-    def _finalize_image(self, task: dict, image: QImage) -> None:
-        key = task["key"]
-        path = task["path"]
-        is_wayback = task.get("is_wayback", False)
-        provider_name = task.get("provider", "")
+            if task["type"] == "composite":
+                Logger.info(f"Composite preview saved for {key}")
 
-        if self._save_preview_image(image, path):
-            self._pending_tasks.discard(key)
-            if is_wayback:
-                shared_key = f"{provider_name}_{self.WAYBACK_SHARED_LAYER}"
-                self._pending_tasks.discard(shared_key)
-                # Emit signal for all waiting keys
-                waiting_keys = self._wayback_waiting.pop(shared_key, [])
-                for wkey in waiting_keys:
-                    self.preview_readied.emit(wkey, str(path))
-            else:
-                self.preview_readied.emit(key, str(path))
-        else:
-            self._on_fetch_failed(task)
+    def _retry_as_composite(self, task: dict) -> bool:
+        """Fetch a failed z=0 preview again as a z=1 composite, if allowed.
 
+        Returns
+        -------
+        bool
+            ``True`` when the composite was queued.
+        """
+        if task["type"] != "single" or not task.get("retry_as_composite", False):
+            return False
+        if not self._deadline_remaining_ms(task):
+            return False
+        Logger.info(f"Preview z=0 failed for {task['key']}, retrying as composite z=1")
+        task["type"] = "composite"
+        task["z"] = 1
+        task["retry_as_composite"] = False
+        self._enqueue(task, front=True)
         self._process_queue()
+        return True
 
     def _on_fetch_failed(self, task: dict) -> None:
         key = task["key"]
@@ -2758,7 +3573,7 @@ class PreviewManager(QObject):
             Logger.warning(f"Failed to fetch WMTS capabilities: {provider_url}")
             # Fall back to KVP for all waiting tasks
             for task in waiting_tasks:
-                self._request_queue.insert(0, task)
+                self._enqueue(task, front=True)
             self._process_queue()
             return
 
@@ -2790,7 +3605,7 @@ class PreviewManager(QObject):
                     )
                     if cached_url:
                         layer_data["resource_url"] = cached_url
-                self._request_queue.insert(0, task)
+                self._enqueue(task, front=True)
 
             self._process_queue()
 
@@ -2798,9 +3613,41 @@ class PreviewManager(QObject):
             Logger.warning(f"Failed to parse WMTS capabilities: {e}")
             # Fall back to KVP for all waiting tasks
             for task in waiting_tasks:
-                self._request_queue.insert(0, task)
+                self._enqueue(task, front=True)
             self._process_queue()
 
+    def cache_stats(self) -> dict[str, int]:
+        """Return preview cache counters and sizes.
+
+        Returns
+        -------
+        dict[str, int]
+            :meth:`preview_store.PreviewStore.stats` plus the ``budget`` in
+            bytes.
+        """
+        stats = self._store.stats()
+        stats["budget"] = preview_cache_budget()
+        return stats
+
+    def _on_flush_timeout(self) -> None:
+        self._store.flush()
+        self._schedule_eviction()
+
+    def _schedule_eviction(self) -> None:
+        """Start a background eviction when the cache is over budget."""
+        budget = preview_cache_budget()
+        if self._eviction_task is not None or not self._store.over_budget(budget):
+            return
+        task = _PreviewEvictionTask(self._store, budget)
+        task.taskCompleted.connect(lambda: self._on_eviction_done(task))
+        task.taskTerminated.connect(lambda: self._on_eviction_done(task))
+        self._eviction_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_eviction_done(self, task: _PreviewEvictionTask) -> None:
+        if self._eviction_task is task:
+            self._eviction_task = None
+
     def cleanup(self) -> None:
         """Cancel all pending network requests and clear queues."""
         for reply in list(self._active_requests.values()):
@@ -2812,12 +3659,29 @@ class PreviewManager(QObject):
             if task:
                 task.cancel()
 
-        self._active_requests.clear()
-        self._active_request_tasks.clear()
+        # Saves still running store nothing once canceled, and their
+        # results are ignored (see _on_encode_done)
+        for job in self._encode_running:
+            try:
+                job.cancel()
+            except RuntimeError:
+                pass  # Already finished and deleted by the task manager
+
+        for req_id in list(self._active_requests):
+            self._forget_request(req_id)
         self._canceled_request_refs.clear()
+        self._timed_out_refs.clear()
         self._request_queue.clear()
+        self._key_priorities.clear()
+        self._key_generations.clear()
         self._pending_tasks.clear()
         self._active_composites.clear()
+        self._composite_retries.clear()
         self._wayback_waiting.clear()
         self._pending_capabilities.clear()
         self._vector_preview_tasks.clear()
+        self._encode_jobs.clear()
+        self._encode_waiting.clear()
+        self._encode_running.clear()
+        self._flush_timer.stop()
+        self._store.flush()
@@ -0,0 +1,371 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Priority queue of pending preview fetches.
+
+Opening a large provider (1,236 layers for NASA GIBS) queues one preview
+task per grid card in catalog order, so the cards on screen used to wait
+behind hundreds of off-screen ones.  :class:`PreviewQueue` orders tasks by
+priority level instead:
+
+* :data:`PRIORITY_VISIBLE` – the card is in the grid's viewport;
+* :data:`PRIORITY_NEAR` – the card is within a screen of the viewport;
+* :data:`PRIORITY_BACKGROUND` – everything else.
+
+Within a level tasks keep their queue order.  The queue is a binary heap
+with lazy deletion, keyed by the task's preview ``key``.  Push and pop are
+O(log n).  :meth:`PreviewQueue.reprioritize` and
+:meth:`PreviewQueue.cancel` mark the task's heap entry stale
+(reprioritize also pushes a new one) and are amortized O(log n): the heap
+is rebuilt in O(n) once stale entries outnumber live ones.
+
+:class:`HostScheduler` keeps one such queue per host (scheme and
+authority of the tile URL) and decides which task may start next: no more
+than ``max_per_host`` requests go to one host and ``max_connections`` in
+total, and hosts with work of the most urgent waiting priority take turns,
+so one slow server cannot hold every connection.
+
+This module has no QGIS dependency.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit
+
+PRIORITY_VISIBLE = 0
+PRIORITY_NEAR = 1
+PRIORITY_BACKGROUND = 2
+
+# Marks a heap entry whose task was popped elsewhere, re-queued or canceled.
+_REMOVED: Any = object()
+
+# Rebuild the heap when it holds this many more entries than live tasks.
+_COMPACT_SLACK = 64
+
+
+def host_key(url: str) -> str:
+    """Return the scheme and authority of *url*, e.g. ``https://a.b.org``."""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class PreviewQueue:
+    """Preview tasks ordered by priority, then by queue order.
+
+    Tasks are the task dicts of :class:`preview_manager.PreviewManager`;
+    each has a unique ``"key"``.  Pushing a task whose key is already
+    queued replaces the queued one.
+    """
+
+    def __init__(self) -> None:
+        # Heap of [priority, sequence, key, task]; sequences are unique, so
+        # tasks themselves are never compared
+        self._heap: list[list[Any]] = []
+        self._entries: dict[str, list[Any]] = {}
+        self._back = itertools.count()
+        self._front = itertools.count(-1, -1)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over the queued tasks in no particular order."""
+        return (entry[3] for entry in list(self._entries.values()))
+
+    def push(
+        self,
+        task: dict,
+        priority: int = PRIORITY_BACKGROUND,
+        front: bool = False,
+    ) -> None:
+        """Queue *task* at *priority*.
+
+        Parameters
+        ----------
+        task : dict
+            Preview task with a ``"key"`` entry.
+        priority : int, default=PRIORITY_BACKGROUND
+            Priority level; lower values are fetched first.
+        front : bool, default=False
+            Queue ahead of the tasks already waiting at the same level
+            (used for retries of a task that was already dequeued).
+        """
+        key = task["key"]
+        self._invalidate(key)
+        sequence = next(self._front if front else self._back)
+        entry = [priority, sequence, key, task]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def pop(self) -> dict:
+        """Remove and return the most urgent task.
+
+        Raises
+        ------
+        IndexError
+            The queue is empty.
+        """
+        while self._heap:
+            _, _, key, task = heapq.heappop(self._heap)
+            if task is not _REMOVED:
+                del self._entries[key]
+                return task
+        raise IndexError("pop from an empty PreviewQueue")
+
+    def peek(self) -> tuple[int, dict] | None:
+        """Return the priority and task :meth:`pop` would return, or ``None``."""
+        heap = self._heap
+        while heap and heap[0][3] is _REMOVED:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return heap[0][0], heap[0][3]
+
+    def get(self, key: str) -> dict | None:
+        """Return the queued task *key* without removing it, or ``None``."""
+        entry = self._entries.get(key)
+        return entry[3] if entry is not None else None
+
+    def priority(self, key: str) -> int | None:
+        """Return the priority of the queued task *key*, or ``None``."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def reprioritize(self, key: str, priority: int) -> bool:
+        """Move the queued task *key* to *priority*.
+
+        The task keeps its queue order relative to the other tasks of the
+        new level.
+
+        Returns
+        -------
+        bool
+            Whether *key* is queued.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if entry[0] != priority:
+            task = entry[3]
+            entry[3] = _REMOVED
+            new_entry = [priority, entry[1], key, task]
+            self._entries[key] = new_entry
+            heapq.heappush(self._heap, new_entry)
+            self._maybe_compact()
+        return True
+
+    def cancel(self, key: str) -> dict | None:
+        """Remove the queued task *key*; return it, or ``None``."""
+        task = self._invalidate(key)
+        if task is not None:
+            self._maybe_compact()
+        return task
+
+    def remove_if(self, predicate: Callable[[dict], bool]) -> list[dict]:
+        """Remove and return every queued task matching *predicate*."""
+        removed = [
+            self.cancel(key)
+            for key, entry in list(self._entries.items())
+            if predicate(entry[3])
+        ]
+        return [task for task in removed if task is not None]
+
+    def clear(self) -> None:
+        """Remove all queued tasks."""
+        self._heap.clear()
+        self._entries.clear()
+
+    def _invalidate(self, key: str) -> dict | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        task, entry[3] = entry[3], _REMOVED
+        return task
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + _COMPACT_SLACK:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+
+class HostScheduler:
+    """Per-host preview queues started within connection limits.
+
+    Tasks are queued by their ``"host"`` entry (see :func:`host_key`).
+    :meth:`pop` returns the next task that may start: among the hosts whose
+    next task fits their limits, the most urgent priority wins and hosts
+    tied on it are served round-robin.  Callers report every request
+    they start and finish with :meth:`acquire` and :meth:`release`.
+
+    Parameters
+    ----------
+    max_connections : int
+        Requests in flight across all hosts.
+    max_per_host : int
+        Requests in flight to a single host.
+    cost : Callable[[dict], int] | None, default=None
+        Number of requests a task starts at once (1 when ``None``).  A task
+        costing more than a limit starts once nothing counted against that
+        limit is in flight.  While such a multi-request task waits at the
+        head of its host's queue, tasks that are not more urgent may only
+        use the connections it does not need, so a steady stream of cheaper
+        tasks from other hosts cannot hold it back indefinitely.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_per_host: int,
+        cost: Callable[[dict], int] | None = None,
+    ) -> None:
+        self.max_connections = max(1, max_connections)
+        self.max_per_host = max(1, max_per_host)
+        self._cost = cost or (lambda task: 1)
+        self._queues: dict[str, PreviewQueue] = {}
+        # Preview key -> host whose queue holds it
+        self._host_of: dict[str, str] = {}
+        # Round-robin order of hosts and the position to start from
+        self._hosts: list[str] = []
+        self._next = 0
+        self._in_flight: dict[str, int] = {}
+        self._total_in_flight = 0
+        self._started: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._host_of)
+
+    def __bool__(self) -> bool:
+        return bool(self._host_of)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._host_of
+
+    def push(
+        self,
+        task: dict,
+        priority: int = PRIORITY_BACKGROUND,
+        front: bool = False,
+    ) -> None:
+        """Queue *task* on its host (see :meth:`PreviewQueue.push`)."""
+        key = task["key"]
+        host = task.get("host", "")
+        previous = self._host_of.get(key)
+        if previous is not None and previous != host:
+            self._queues[previous].cancel(key)
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = PreviewQueue()
+            self._hosts.append(host)
+        queue.push(task, priority, front)
+        self._host_of[key] = host
+
+    def pop(self) -> dict | None:
+        """Remove and return the next task allowed to start, or ``None``."""
+        # Queue heads by priority, hosts tied on it in round-robin order
+        heads = []
+        count = len(self._hosts)
+        for offset in range(count):
+            index = (self._next + offset) % count
+            head = self._queues[self._hosts[index]].peek()
+            if head is not None:
+                heads.append((head[0], offset, index, head[1]))
+        heads.sort(key=lambda head: head[:2])
+
+        # Connections held back for more urgent multi-request tasks that
+        # are waiting for them
+        reserved = 0
+        for _, _, index, task in heads:
+            host = self._hosts[index]
+            cost = min(self._cost(task), self.max_connections)
+            if not self.fits(host, cost):
+                if cost > 1:
+                    reserved += cost
+                continue
+            if self._total_in_flight + cost + reserved > self.max_connections:
+                continue
+            self._next = index + 1
+            task = self._queues[host].pop()
+            del self._host_of[task["key"]]
+            return task
+        return None
+
+    def get(self, key: str) -> dict | None:
+        """Return the queued task *key* without removing it, or ``None``."""
+        host = self._host_of.get(key)
+        return self._queues[host].get(key) if host is not None else None
+
+    def reprioritize(self, key: str, priority: int) -> bool:
+        """Move the queued task *key* to *priority*; return whether it is queued."""
+        host = self._host_of.get(key)
+        return host is not None and self._queues[host].reprioritize(key, priority)
+
+    def cancel(self, key: str) -> dict | None:
+        """Remove the queued task *key*; return it, or ``None``."""
+        host = self._host_of.pop(key, None)
+        return self._queues[host].cancel(key) if host is not None else None
+
+    def remove_if(self, predicate: Callable[[dict], bool]) -> list[dict]:
+        """Remove and return every queued task matching *predicate*."""
+        removed = []
+        for queue in self._queues.values():
+            for task in queue.remove_if(predicate):
+                self._host_of.pop(task["key"], None)
+                removed.append(task)
+        return removed
+
+    def clear(self) -> None:
+        """Remove all queued tasks (requests in flight stay counted)."""
+        for queue in self._queues.values():
+            queue.clear()
+        self._host_of.clear()
+
+    def acquire(self, host: str) -> None:
+        """Count a request to *host* as started."""
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self._started[host] = self._started.get(host, 0) + 1
+        self._total_in_flight += 1
+
+    def release(self, host: str) -> None:
+        """Count a request to *host* as finished."""
+        if self._in_flight.get(host, 0) > 0:
+            self._in_flight[host] -= 1
+            self._total_in_flight -= 1
+
+    def metrics(self) -> dict[str, dict[str, int]]:
+        """Return ``{host: {"queued", "in_flight", "started"}}`` for every host."""
+        hosts = set(self._queues) | set(self._in_flight)
+        return {
+            host: {
+                "queued": len(self._queues[host]) if host in self._queues else 0,
+                "in_flight": self._in_flight.get(host, 0),
+                "started": self._started.get(host, 0),
+            }
+            for host in sorted(hosts)
+        }
+
+    def fits(self, host: str, cost: int = 1) -> bool:
+        """Return whether *cost* more requests to *host* fit the limits."""
+        # An oversized task needs its whole limit, i.e. an idle host/pool
+        total = self._total_in_flight + min(cost, self.max_connections)
+        if total > self.max_connections:
+            return False
+        in_flight = self._in_flight.get(host, 0) + min(cost, self.max_per_host)
+        return in_flight <= self.max_per_host
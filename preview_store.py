@@ -0,0 +1,640 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Preview thumbnail pack.
+
+Preview thumbnails used to be one small PNG/JPEG file per basemap under
+``resources/previews/{default,user}/{xyz,wms}/``.  They now live in a
+single SQLite database, ``resources/previews/previews.sqlite``:
+
+* previews keep their historical locations as keys (e.g.
+  ``default/xyz/OpenStreetMap_Standard.png``), so
+  :meth:`PreviewManager.get_preview_path` still names a preview even though
+  no such file exists on disk;
+* the database is read through SQLite's memory-mapped I/O;
+* writes are buffered in memory and committed in batches, and pending
+  writes are visible to readers immediately;
+* every row records its provider scope (``default/xyz/SafeProvider``),
+  which is indexed, so a provider's previews are removed by one indexed
+  ``DELETE`` instead of a directory glob;
+* a manifest of every stored key with its size, mtime and last access
+  time is loaded once and kept in memory, so "is this preview cached?"
+  never costs a query or a syscall.
+
+Keys keep their historical ``.png`` names whatever the stored encoding
+(PNG, JPEG or WebP); the encoding is detected from the data when it is
+written and recorded per row, see :func:`sniff_format`.
+
+Loose preview files found in the old directories are imported on open:
+
+* files under ``default/`` are the previews shipped with the plugin.  They
+  are part of the plugin and are never removed; they are imported (and
+  *pinned*) when the pack lacks them or holds an older copy, e.g. after a
+  plugin update;
+* files under ``user/`` are a cache written by an older plugin version.
+  They are removed once the import is committed to the on-disk pack, and
+  never while the pack is held in memory.
+
+Every other preview counts against the cache budget: :meth:`PreviewStore.evict`
+drops the least recently used unpinned previews once their total size
+exceeds it, which also clears out previews of deleted providers and
+renamed layers that nothing requests any more.  Hits, misses and
+evictions are counted (see :meth:`PreviewStore.stats`).
+
+The store is shared by the dialog, the Browser panel and background
+render tasks; all access is serialized by a lock.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .messageTool import Logger
+
+PACK_FILENAME = "previews.sqlite"
+
+# Old one-file-per-preview directories, relative to the previews dir.
+LEGACY_DIRS = ("default/xyz", "default/wms", "user/xyz", "user/wms")
+LEGACY_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# Pending writes are committed once this many have accumulated (callers
+# flush earlier from an idle timer).
+WRITE_BATCH_SIZE = 32
+_MMAP_SIZE = 64 * 1024 * 1024
+
+# Eviction frees space down to this fraction of the budget, so a cache at
+# its limit is not trimmed again after every new preview.
+EVICTION_TARGET = 0.9
+
+# Keys under this prefix that are imported from loose files are the shipped
+# previews; they are pinned and never evicted.
+_SHIPPED_PREFIX = "default/"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS previews (
+    path TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    atime REAL NOT NULL DEFAULT 0,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    format TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS previews_provider ON previews (provider);
+"""
+
+# Columns added after the first pack format, with their definitions.
+_ADDED_COLUMNS = {
+    "atime": "REAL NOT NULL DEFAULT 0",
+    "pinned": "INTEGER NOT NULL DEFAULT 0",
+    "format": "TEXT NOT NULL DEFAULT ''",
+}
+
+_INSERT = (
+    "INSERT OR REPLACE INTO previews "
+    "(path, provider, data, size, mtime, atime, pinned, format) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# One store per previews directory, shared by every user in the process.
+_stores: dict[Path, PreviewStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_preview_store(previews_dir: Path) -> PreviewStore:
+    """Return the shared :class:`PreviewStore` for *previews_dir*."""
+    previews_dir = Path(previews_dir).absolute()
+    with _stores_lock:
+        store = _stores.get(previews_dir)
+        if store is None:
+            store = PreviewStore(previews_dir)
+            _stores[previews_dir] = store
+        return store
+
+
+def store_for(preview_path: Path | str) -> PreviewStore | None:
+    """Return the open store that *preview_path* belongs to, if any.
+
+    Paths outside every previews directory (e.g. the failure icon) give
+    ``None``.
+    """
+    with _stores_lock:
+        for store in _stores.values():
+            if store.owns(preview_path):
+                return store
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def safe_name(text: str) -> str:
+    """Return *text* reduced to the alphanumeric characters used in keys."""
+    return "".join(c for c in text if c.isalnum())
+
+
+def sniff_format(data: bytes) -> str:
+    """Return the image format of encoded *data* from its signature.
+
+    Returns
+    -------
+    str
+        ``"png"``, ``"jpeg"`` or ``"webp"`` (Qt image format names), or an
+        empty string for anything else.
+    """
+    data = bytes(data[:12])
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return ""
+
+
+def provider_scope(key: str) -> str:
+    """Return the provider scope of a pack key.
+
+    ``default/xyz/Foo_Bar.png`` belongs to ``default/xyz/Foo``: preview
+    file names are ``{SafeProvider}_{SafeLayer}`` with alphanumeric parts.
+    """
+    directory, _, filename = key.rpartition("/")
+    return f"{directory}/{filename.split('_', 1)[0]}"
+
+
+class _Entry:
+    """Manifest entry of one stored preview."""
+
+    __slots__ = ("size", "mtime", "atime", "pinned", "format")
+
+    def __init__(
+        self, size: int, mtime: float, atime: float, pinned: bool, image_format: str
+    ) -> None:
+        self.size = size
+        self.mtime = mtime
+        self.atime = atime
+        self.pinned = pinned
+        self.format = image_format
+
+
+class PreviewStore:
+    """SQLite-backed pack of preview thumbnails.
+
+    Parameters
+    ----------
+    previews_dir : Path
+        The ``resources/previews`` directory; keys are paths relative to it.
+    """
+
+    def __init__(self, previews_dir: Path) -> None:
+        self.root = Path(previews_dir)
+        self.path = self.root / PACK_FILENAME
+        self._prefix = os.path.join(str(self.root), "")
+        self._lock = threading.RLock()
+        # key -> encoded bytes, or None for a pending delete
+        self._pending: dict[str, bytes | None] = {}
+        # Set by _connect when the pack cannot be opened on disk
+        self.in_memory = False
+        self._db = self._connect()
+        self._migrate_loose_files()
+        # In-memory manifest, loaded once and kept in step with every write
+        # and delete, so lookups never touch SQLite
+        self._manifest: dict[str, _Entry] = {}
+        self._scopes: dict[str, set[str]] = {}
+        # Total size of the previews that may be evicted
+        self._unpinned_bytes = 0
+        # Keys whose access time changed since the last flush
+        self._touched: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        for key, size, mtime, atime, pinned, image_format in self._db.execute(
+            "SELECT path, size, mtime, atime, pinned, format FROM previews"
+        ):
+            entry = _Entry(size, mtime, atime or mtime, bool(pinned), image_format)
+            self._add_to_manifest(key, entry)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def key(self, preview_path: Path | str) -> str:
+        """Return the pack key of *preview_path* (relative POSIX path).
+
+        Raises
+        ------
+        ValueError
+            *preview_path* is not inside the previews directory.
+        """
+        path = os.path.abspath(preview_path)
+        if not path.startswith(self._prefix):
+            raise ValueError(f"{preview_path} is not in {self.root}")
+        return path[len(self._prefix) :].replace(os.sep, "/")
+
+    def owns(self, preview_path: Path | str) -> bool:
+        """Return whether *preview_path* lies inside this store's directory."""
+        return os.path.abspath(preview_path).startswith(self._prefix)
+
+    def contains(self, preview_path: Path | str) -> bool:
+        """Return whether a preview is stored at *preview_path*."""
+        return self.key(preview_path) in self._manifest
+
+    def lookup(self, preview_path: Path | str) -> bool:
+        """Return whether a preview is stored at *preview_path*.
+
+        Unlike :meth:`contains`, this is a cache access: it counts a hit or
+        a miss and marks the preview as recently used.
+        """
+        key = self.key(preview_path)
+        with self._lock:
+            entry = self._manifest.get(key)
+            if entry is None:
+                self.misses += 1
+                return False
+            self.hits += 1
+            self._touch(key, entry)
+        return True
+
+    def size(self, preview_path: Path | str) -> int | None:
+        """Return the stored size of a preview in bytes, or ``None``."""
+        entry = self._manifest.get(self.key(preview_path))
+        return entry.size if entry else None
+
+    def mtime(self, preview_path: Path | str) -> float | None:
+        """Return when a preview was stored (seconds since the epoch)."""
+        entry = self._manifest.get(self.key(preview_path))
+        return entry.mtime if entry else None
+
+    def is_pinned(self, preview_path: Path | str) -> bool:
+        """Return whether the preview at *preview_path* is exempt from eviction."""
+        entry = self._manifest.get(self.key(preview_path))
+        return bool(entry and entry.pinned)
+
+    def image_format(self, preview_path: Path | str) -> str:
+        """Return the format of the preview at *preview_path*.
+
+        See :func:`sniff_format`; an empty string means the preview is
+        missing or its format unknown.
+        """
+        entry = self._manifest.get(self.key(preview_path))
+        return entry.format if entry else ""
+
+    def keys(self) -> list[str]:
+        """Return the keys of all stored previews."""
+        with self._lock:
+            return list(self._manifest)
+
+    def read(self, preview_path: Path | str) -> bytes | None:
+        """Return the encoded image stored at *preview_path*, or ``None``."""
+        key = self.key(preview_path)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            entry = self._manifest.get(key)
+            if entry is None:
+                return None
+            self._touch(key, entry)
+            row = self._db.execute(
+                "SELECT data FROM previews WHERE path = ?", (key,)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def write(self, preview_path: Path | str, data: bytes) -> None:
+        """Store *data* at *preview_path* (committed with the next batch)."""
+        key = self.key(preview_path)
+        now = time.time()
+        with self._lock:
+            previous = self._manifest.get(key)
+            self._pending[key] = bytes(data)
+            # A re-encoded shipped preview stays pinned
+            self._add_to_manifest(
+                key,
+                _Entry(
+                    len(data),
+                    now,
+                    now,
+                    bool(previous and previous.pinned),
+                    sniff_format(data),
+                ),
+            )
+            if len(self._pending) >= WRITE_BATCH_SIZE:
+                self.flush()
+
+    def delete(self, preview_path: Path | str) -> bool:
+        """Remove the preview at *preview_path*; return whether it existed."""
+        key = self.key(preview_path)
+        with self._lock:
+            if key not in self._manifest:
+                return False
+            self._remove_from_manifest(key)
+            self._pending[key] = None
+            self.flush()
+        return True
+
+    def delete_provider(self, preview_dir: Path | str, safe_provider: str) -> int:
+        """Remove every preview of one provider in *preview_dir*.
+
+        Parameters
+        ----------
+        preview_dir : Path | str
+            Preview directory of the provider, e.g. ``<previews>/user/xyz``.
+        safe_provider : str
+            Alphanumeric provider name used in preview file names.
+
+        Returns
+        -------
+        int
+            Number of previews removed.
+        """
+        scope = f"{self.key(preview_dir)}/{safe_provider}"
+        with self._lock:
+            keys = self._scopes.pop(scope, set())
+            if not keys:
+                return 0
+            for key in keys:
+                entry = self._manifest.pop(key, None)
+                if entry is not None and not entry.pinned:
+                    self._unpinned_bytes -= entry.size
+                self._pending.pop(key, None)
+                self._touched.discard(key)
+            self.flush()
+            try:
+                with self._db:
+                    self._db.execute(
+                        "DELETE FROM previews WHERE provider = ?", (scope,)
+                    )
+            except sqlite3.Error as exc:
+                Logger.warning(f"Failed to delete previews of {scope}: {exc}")
+        return len(keys)
+
+    def over_budget(self, budget: int) -> bool:
+        """Return whether the unpinned previews take more than *budget* bytes."""
+        return self._unpinned_bytes > budget
+
+    def evict(self, budget: int) -> int:
+        """Drop least recently used previews until they fit in *budget*.
+
+        Pinned previews are never evicted and do not count against the
+        budget.  Once over budget, previews are dropped down to
+        :data:`EVICTION_TARGET` of it.
+
+        Parameters
+        ----------
+        budget : int
+            Size budget of the unpinned previews, in bytes.
+
+        Returns
+        -------
+        int
+            Number of previews evicted.
+        """
+        with self._lock:
+            if self._unpinned_bytes <= budget:
+                return 0
+            target = int(budget * EVICTION_TARGET)
+            candidates = sorted(
+                (entry.atime, key)
+                for key, entry in self._manifest.items()
+                if not entry.pinned
+            )
+            victims = []
+            freed = 0
+            for _, key in candidates:
+                if self._unpinned_bytes <= target:
+                    break
+                freed += self._manifest[key].size
+                self._remove_from_manifest(key)
+                self._pending[key] = None
+                victims.append(key)
+            self.evictions += len(victims)
+            self.evicted_bytes += freed
+            self.flush()
+        Logger.info(
+            f"Evicted {len(victims)} preview(s) ({freed // 1024} KB) from {self.path}"
+        )
+        return len(victims)
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters and sizes.
+
+        Returns
+        -------
+        dict[str, int]
+            ``hits``, ``misses``, ``evictions`` and ``evicted_bytes`` since
+            the store was opened, plus the current ``previews``, ``pinned``,
+            ``bytes`` (all previews) and ``unpinned_bytes``.
+        """
+        with self._lock:
+            pinned = [e.size for e in self._manifest.values() if e.pinned]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "previews": len(self._manifest),
+                "pinned": len(pinned),
+                "bytes": self._unpinned_bytes + sum(pinned),
+                "unpinned_bytes": self._unpinned_bytes,
+            }
+
+    def flush(self) -> None:
+        """Commit pending writes, deletes and access times in one transaction."""
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, set()
+            deletes, rows, accesses = [], [], []
+            for key, data in pending.items():
+                if data is None:
+                    deletes.append((key,))
+                    continue
+                entry = self._manifest.get(key)
+                if entry is None:
+                    continue
+                rows.append(
+                    (
+                        key,
+                        provider_scope(key),
+                        data,
+                        len(data),
+                        entry.mtime,
+                        entry.atime,
+                        int(entry.pinned),
+                        entry.format,
+                    )
+                )
+            for key in touched:
+                entry = self._manifest.get(key)
+                if entry is not None and key not in pending:
+                    accesses.append((entry.atime, key))
+            try:
+                with self._db:
+                    self._db.executemany("DELETE FROM previews WHERE path = ?", deletes)
+                    self._db.executemany(_INSERT, rows)
+                    self._db.executemany(
+                        "UPDATE previews SET atime = ? WHERE path = ?", accesses
+                    )
+            except sqlite3.Error as exc:
+                Logger.warning(f"Failed to write preview pack {self.path}: {exc}")
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _add_to_manifest(self, key: str, entry: _Entry) -> None:
+        previous = self._manifest.get(key)
+        if previous is not None and not previous.pinned:
+            self._unpinned_bytes -= previous.size
+        self._manifest[key] = entry
+        if not entry.pinned:
+            self._unpinned_bytes += entry.size
+        self._scopes.setdefault(provider_scope(key), set()).add(key)
+
+    def _remove_from_manifest(self, key: str) -> None:
+        entry = self._manifest.pop(key, None)
+        if entry is not None and not entry.pinned:
+            self._unpinned_bytes -= entry.size
+        self._touched.discard(key)
+        scope = provider_scope(key)
+        keys = self._scopes.get(scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[scope]
+
+    def _touch(self, key: str, entry: _Entry) -> None:
+        entry.atime = time.time()
+        self._touched.add(key)
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+            db.executescript(_SCHEMA)
+            self._upgrade_schema(db)
+            return db
+        except (OSError, sqlite3.Error) as exc:
+            Logger.warning(
+                f"Preview pack {self.path} unavailable, caching in memory: {exc}"
+            )
+            self.in_memory = True
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+            db.executescript(_SCHEMA)
+            return db
+
+    @staticmethod
+    def _upgrade_schema(db: sqlite3.Connection) -> None:
+        """Add the columns a pack written by an older version lacks."""
+        columns = {row[1] for row in db.execute("PRAGMA table_info(previews)")}
+        missing = [name for name in _ADDED_COLUMNS if name not in columns]
+        if not missing:
+            return
+        with db:
+            for name in missing:
+                db.execute(
+                    f"ALTER TABLE previews ADD COLUMN {name} {_ADDED_COLUMNS[name]}"
+                )
+            db.execute("UPDATE previews SET atime = mtime WHERE atime = 0")
+            if "format" in missing:
+                # Older packs stored every encoding under a ``.png`` key
+                db.create_function("sniff_format", 1, sniff_format)
+                db.execute("UPDATE previews SET format = sniff_format(data)")
+            if "pinned" in missing:
+                # Older packs did not record which previews were shipped
+                db.execute(
+                    "UPDATE previews SET pinned = 1 WHERE path LIKE ?",
+                    (_SHIPPED_PREFIX + "%",),
+                )
+
+    def _migrate_loose_files(self) -> None:
+        """Import preview files from the old directories.
+
+        Shipped ``default/`` files are only read; legacy ``user/`` cache
+        files are removed after their import is committed to disk.
+        """
+        # Stored copies of shipped previews, to skip files already imported
+        stored_mtimes = dict(
+            self._db.execute(
+                "SELECT path, mtime FROM previews WHERE path LIKE ?",
+                (_SHIPPED_PREFIX + "%",),
+            )
+        )
+        rows = []
+        files = []
+        for legacy_dir in LEGACY_DIRS:
+            directory = self.root / legacy_dir
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(
+                    LEGACY_SUFFIXES
+                ):
+                    continue
+                key = f"{legacy_dir}/{entry.name}"
+                shipped = key.startswith(_SHIPPED_PREFIX)
+                try:
+                    mtime = entry.stat().st_mtime
+                    # A re-encoded copy is newer than the file it came from
+                    if shipped and stored_mtimes.get(key, -1.0) >= mtime:
+                        continue
+                    data = Path(entry.path).read_bytes()
+                except OSError as exc:
+                    Logger.warning(f"Failed to read preview {entry.path}: {exc}")
+                    continue
+                rows.append(
+                    (
+                        key,
+                        provider_scope(key),
+                        data,
+                        len(data),
+                        mtime,
+                        mtime,
+                        int(shipped),
+                        sniff_format(data),
+                    )
+                )
+                if not shipped:
+                    files.append(Path(entry.path))
+        if not rows:
+            return
+        try:
+            with self._db:
+                self._db.executemany(_INSERT, rows)
+        except sqlite3.Error as exc:
+            Logger.warning(f"Failed to import previews into {self.path}: {exc}")
+            return
+        Logger.info(f"Imported {len(rows)} preview file(s) into {self.path}")
+        if self.in_memory:
+            # The import is lost on exit; keep the cache files
+            return
+        for path in files:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,176 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Background, coalescing writer for provider YAML files.
+
+:class:`ProviderSaveQueue` takes the providers that need saving, captures
+their YAML data on the GUI thread (so later edits cannot race the writer)
+and writes them in a :class:`QgsTask`.  Saves of the same file that are
+queued while a write is in progress are coalesced: only the latest data
+is written.  Files are written through :func:`yaml_io.dump_file`, i.e. to
+a temporary file that is renamed over the target, so a crash never leaves
+a truncated YAML behind.
+"""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+from qgis.core import QgsApplication, QgsTask
+from qgis.PyQt.QtCore import QCoreApplication, QObject, pyqtSignal
+
+from . import config_loader, yaml_io
+from .messageTool import Logger
+
+# How long plugin unload waits for a running write before finishing the
+# remaining ones itself.
+_FLUSH_TIMEOUT_MS = 5000
+
+
+class _SaveJob(NamedTuple):
+    path: Path
+    yaml_data: dict[str, Any]
+    # Previous file of a renamed provider, removed once the new one exists
+    stale_path: Path | None
+    provider_name: str
+
+
+def _write_jobs(jobs: list[_SaveJob]) -> tuple[list[Path], list[str]]:
+    """Write *jobs*; return the written paths and the error messages."""
+    written, errors = [], []
+    for job in jobs:
+        try:
+            job.path.parent.mkdir(parents=True, exist_ok=True)
+            yaml_io.dump_file(job.path, job.yaml_data)
+            written.append(job.path)
+        except Exception as e:
+            errors.append(f"Failed to save provider '{job.provider_name}': {e}")
+            continue
+        if job.stale_path is not None:
+            try:
+                job.stale_path.unlink(missing_ok=True)
+            except OSError as e:
+                errors.append(
+                    f"Failed to remove old provider file '{job.stale_path}': {e}"
+                )
+    return written, errors
+
+
+class _SaveTask(QgsTask):
+    """Writes a batch of provider files off the GUI thread."""
+
+    def __init__(self, jobs: list[_SaveJob]) -> None:
+        super().__init__(
+            QCoreApplication.translate("BasemapsDialog", "Saving providers...")
+        )
+        self.jobs = jobs
+        self.written: list[Path] = []
+        self.errors: list[str] = []
+
+    def run(self) -> bool:
+        self.written, self.errors = _write_jobs(self.jobs)
+        return not self.errors
+
+
+class ProviderSaveQueue(QObject):
+    """Queue of provider files to write in the background."""
+
+    # Files written by a finished batch (list[Path])
+    saved = pyqtSignal(list)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        # Target path -> latest job; insertion order is save order
+        self._pending: dict[Path, _SaveJob] = {}
+        self._task: _SaveTask | None = None
+
+    def enqueue(
+        self,
+        directory: Path,
+        provider: dict[str, Any],
+        prefix: Literal["default", "user"] = "user",
+    ) -> Path | None:
+        """Queue *provider* for writing to its auto-generated file path.
+
+        Like :func:`config_loader.save_provider_to_yaml`, ``source_file`` is
+        updated right away and a renamed provider's old file is removed once
+        the new one is written.
+
+        Returns
+        -------
+        Path | None
+            The file that will be written, or ``None`` for separators.
+        """
+        if provider.get("type") == "separator":
+            return None
+        path = config_loader.provider_yaml_path(directory, provider, prefix).resolve()
+        old_source = provider.get("source_file")
+        stale_path = None
+        if old_source and Path(old_source).resolve() != path:
+            stale_path = Path(old_source).resolve()
+        job = _SaveJob(
+            path,
+            copy.deepcopy(config_loader.build_provider_yaml_data(provider)),
+            stale_path,
+            provider.get("name", "unknown"),
+        )
+        previous = self._pending.pop(path, None)
+        if previous is not None and job.stale_path is None:
+            job = job._replace(stale_path=previous.stale_path)
+        self._pending[path] = job
+        provider["source_file"] = str(path)
+        self._start()
+        return path
+
+    def busy_paths(self) -> set[str]:
+        """Return the files that are queued or being written."""
+        paths = set(self._pending)
+        if self._task is not None:
+            paths.update(job.path for job in self._task.jobs)
+            paths.update(job.stale_path for job in self._task.jobs if job.stale_path)
+        paths.update(job.stale_path for job in self._pending.values() if job.stale_path)
+        return {str(path) for path in paths}
+
+    def flush(self) -> None:
+        """Finish all writes now (called on plugin unload)."""
+        if self._task is not None:
+            self._task.waitForFinished(_FLUSH_TIMEOUT_MS)
+        jobs = list(self._pending.values())
+        self._pending.clear()
+        if jobs:
+            written, errors = _write_jobs(jobs)
+            self._report(written, errors)
+
+    def _start(self) -> None:
+        if self._task is not None or not self._pending:
+            return
+        task = _SaveTask(list(self._pending.values()))
+        self._pending.clear()
+        task.taskCompleted.connect(lambda: self._on_task_done(task))
+        task.taskTerminated.connect(lambda: self._on_task_done(task))
+        self._task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_task_done(self, task: _SaveTask) -> None:
+        if self._task is task:
+            self._task = None
+        self._report(task.written, task.errors)
+        self._start()
+
+    def _report(self, written: list[Path], errors: list[str]) -> None:
+        for error in errors:
+            Logger.critical(error)
+        if written:
+            Logger.info(f"Saved {len(written)} provider file(s)")
+            self.saved.emit(written)
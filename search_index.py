@@ -0,0 +1,224 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Inverted search index over every basemap and layer in the catalog.
+
+Each item (XYZ basemap or WMS/WMTS layer) becomes one document made of its
+``name``, ``layer_title``, ``layer_name``, ``description`` and tags.  Two
+inverted maps point from text to documents:
+
+* **trigrams** of the whole normalized document – any query term of three
+  or more characters is answered by intersecting the posting sets of its
+  trigrams and confirming the few candidates with a substring check, so
+  results keep the dialog's original "contains" semantics;
+* **tokens** (whole words) – used to rank exact word hits first.
+
+Terms shorter than three characters fall back to a scan of the stored
+document strings, which is still well below a millisecond for the whole
+catalog.  Providers are indexed and removed as a unit, so the index can be
+kept current incrementally from catalog change notifications.
+
+This module has no QGIS dependency.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from typing import Any, Iterable
+
+# (provider type, provider name, item name) – item name is the basemap
+# ``name`` (XYZ) or the ``layer_name`` (WMS/WMTS).
+ItemRef = tuple[str, str, str]
+
+_TEXT_FIELDS = ("name", "layer_title", "layer_name", "description")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def item_name(item: dict[str, Any]) -> str:
+    """Return the identifier used for *item* inside its provider."""
+    return str(item.get("name") or item.get("layer_name") or "")
+
+
+def normalize(text: str) -> str:
+    """Normalize text for matching (case-insensitive)."""
+    return text.casefold()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def item_title(item: dict[str, Any]) -> str:
+    """Return the display title of *item* (as shown in the dialog lists)."""
+    return str(item.get("layer_title") or item_name(item))
+
+
+def _document(item: dict[str, Any]) -> str:
+    parts = [str(item[f]) for f in _TEXT_FIELDS if item.get(f)]
+    parts.extend(t for t in item.get("tags") or () if isinstance(t, str))
+    return normalize(" ".join(parts))
+
+
+class SearchIndex:
+    """Token/trigram index of catalog items, updated per provider."""
+
+    def __init__(self) -> None:
+        # Documents are addressed by integer ids to keep posting sets small.
+        self._refs: dict[int, ItemRef] = {}
+        self._docs: dict[int, str] = {}
+        self._titles: dict[ItemRef, str] = {}
+        self._by_provider: dict[tuple[str, str], list[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+        self._tokens: dict[str, set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_provider(
+        self, provider: dict[str, Any], items: Iterable[dict[str, Any]]
+    ) -> None:
+        """(Re)index all *items* of *provider*, replacing previous entries."""
+        provider_type = provider.get("type") or ""
+        provider_name = provider.get("name") or ""
+        self.remove_provider(provider_type, provider_name)
+        doc_ids = []
+        for item in items:
+            if not isinstance(item, Mapping):
+                continue
+            name = item_name(item)
+            if not name:
+                continue
+            doc_id = self._next_id
+            self._next_id += 1
+            doc = _document(item)
+            ref = (provider_type, provider_name, name)
+            self._refs[doc_id] = ref
+            self._docs[doc_id] = doc
+            self._titles[ref] = item_title(item)
+            for gram in _trigrams(doc):
+                self._trigrams.setdefault(gram, set()).add(doc_id)
+            for token in set(_TOKEN_RE.findall(doc)):
+                self._tokens.setdefault(token, set()).add(doc_id)
+            doc_ids.append(doc_id)
+        if doc_ids:
+            self._by_provider[(provider_type, provider_name)] = doc_ids
+
+    def remove_provider(self, provider_type: str, provider_name: str) -> None:
+        """Drop every item of the given provider from the index."""
+        for doc_id in self._by_provider.pop((provider_type, provider_name), ()):
+            doc = self._docs.pop(doc_id)
+            self._titles.pop(self._refs.pop(doc_id), None)
+            for gram in _trigrams(doc):
+                postings = self._trigrams.get(gram)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._trigrams[gram]
+            for token in set(_TOKEN_RE.findall(doc)):
+                postings = self._tokens.get(token)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._tokens[token]
+
+    def clear(self) -> None:
+        """Remove everything from the index."""
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        provider_type: str | None = None,
+        provider_name: str | None = None,
+        limit: int | None = None,
+    ) -> list[ItemRef]:
+        """Return the items whose text contains every term of *query*.
+
+        Parameters
+        ----------
+        query : str
+            Whitespace-separated terms; each must occur (case-insensitive)
+            somewhere in the item's name, title, layer name, description
+            or tags.
+        provider_type, provider_name : str | None
+            Restrict results to one provider type and/or provider.
+        limit : int | None
+            Maximum number of results to return (``None`` = all).
+
+        Returns
+        -------
+        list[ItemRef]
+            Matches, exact word hits first, then in catalog order.  Empty
+            for an empty query.
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return []
+
+        scope: set[int] | None = None
+        if provider_name is not None:
+            key = (provider_type or "", provider_name)
+            scope = set(self._by_provider.get(key, ()))
+
+        candidates = scope
+        for term in sorted(terms, key=len, reverse=True):
+            candidates = self._match_term(term, candidates)
+            if not candidates:
+                return []
+
+        if provider_type is not None and provider_name is None:
+            candidates = {
+                i for i in candidates if self._refs[i][0] == provider_type
+            }
+
+        def rank(doc_id: int) -> tuple[int, int]:
+            exact = sum(doc_id in self._tokens.get(term, ()) for term in terms)
+            return (-exact, doc_id)
+
+        ranked = sorted(candidates, key=rank)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self._refs[i] for i in ranked]
+
+    def title(self, ref: ItemRef) -> str:
+        """Return the display title of an indexed item (``""`` if unknown)."""
+        return self._titles.get(ref, "")
+
+    def _match_term(self, term: str, candidates: set[int] | None) -> set[int]:
+        """Narrow *candidates* (``None`` = all) to documents containing *term*."""
+        if len(term) >= 3:
+            grams = sorted(
+                _trigrams(term), key=lambda g: len(self._trigrams.get(g, ()))
+            )
+            postings = set(self._trigrams.get(grams[0], ()))
+            if candidates is not None:
+                postings &= candidates
+            for gram in grams[1:]:
+                if not postings:
+                    break
+                postings &= self._trigrams.get(gram, set())
+            if len(grams) == 1:
+                return postings
+            # Trigram hits may be out of order; confirm the substring.
+            return {i for i in postings if term in self._docs[i]}
+        pool = self._docs.keys() if candidates is None else candidates
+        return {i for i in pool if term in self._docs[i]}
@@ -28,11 +28,11 @@ from __future__ import annotations
 import time
 from pathlib import Path
 
-import yaml
 from qgis.core import QgsBlockingNetworkRequest
 from qgis.PyQt.QtNetwork import QNetworkRequest
 from qgis.PyQt.QtCore import QUrl
 
+from . import yaml_io
 from ._vtile_style_util import normalize_style_text
 from .messageTool import Logger
 
@@ -157,13 +157,7 @@ class StyleCache:
             return
         meta = self._meta_path(path)
         try:
-            with meta.open("w", encoding="utf-8") as fh:
-                yaml.dump(
-                    {"etag": etag, "timestamp": time.time()},
-                    fh,
-                    default_flow_style=False,
-                    allow_unicode=True,
-                )
+            yaml_io.dump_file(meta, {"etag": etag, "timestamp": time.time()})
         except OSError as exc:
             Logger.warning(f"Failed to write style meta {meta}: {exc}")
 
@@ -282,10 +276,9 @@ class StyleCache:
         if not meta.exists():
             return None
         try:
-            with meta.open(encoding="utf-8") as fh:
-                data = yaml.safe_load(fh)
+            data = yaml_io.load_file(meta)
             return data.get("etag") if isinstance(data, dict) else None
-        except (OSError, yaml.YAMLError):
+        except (OSError, yaml_io.YAMLError):
             return None
 
     @staticmethod
@@ -0,0 +1,119 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Tag vocabulary and per-provider tag index.
+
+The tag filter and the tag-based item order are shared by the dialog and
+the Browser panel.  Both are answered from a :class:`TagIndex` built once
+per provider item list:
+
+* a ``tag -> item ids`` map, where an item id is the position of the item
+  in its provider's ``basemaps``/``layers`` list;
+* per-tag counts;
+* the sort key of every item and the resulting display order.
+
+Selecting ``Overlay`` matches the root overlay tag and every
+``Overlay/...`` subcategory, so each item carrying an ``Overlay/...`` tag
+is also filed (and counted once) under ``Overlay``.
+
+This module has no QGIS dependency.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Iterable
+
+OVERLAY_TAG = "Overlay"
+OVERLAY_TAG_PREFIX = f"{OVERLAY_TAG}/"
+
+# Display order of basemaps/layers within a provider (first matching tag).
+TAG_SORT_ORDER = [
+    "Satellite",
+    "Streets",
+    "Terrain",
+    "Thematic",
+    "Overlay/Labels",
+    "Overlay/Boundaries",
+    "Overlay/Transportation",
+    "Overlay/Hydrography",
+    OVERLAY_TAG,
+]
+
+_SORT_RANK = {tag: rank for rank, tag in enumerate(TAG_SORT_ORDER)}
+_UNSORTED = len(TAG_SORT_ORDER)
+
+
+def item_tags(item: Any) -> set[str]:
+    """Return the tags *item* is filed under, including the overlay roll-up."""
+    if not isinstance(item, Mapping):
+        return set()
+    tags = {t for t in item.get("tags") or () if isinstance(t, str)}
+    if any(t.startswith(OVERLAY_TAG_PREFIX) for t in tags):
+        tags.add(OVERLAY_TAG)
+    return tags
+
+
+def count_tags(items: Iterable[Any]) -> dict[str, int]:
+    """Return a ``{tag: number of items}`` histogram, overlay roll-up included."""
+    counts: dict[str, int] = {}
+    for item in items:
+        for tag in item_tags(item):
+            counts[tag] = counts.get(tag, 0) + 1
+    return counts
+
+
+def sort_key_by_tag(item: Any) -> int:
+    """Return sort key for a basemap/layer based on its tags.
+
+    Items are ordered by the first matching tag in TAG_SORT_ORDER.
+    Items without a recognized tag are placed at the end.
+    """
+    if not isinstance(item, Mapping):
+        return _UNSORTED
+    for tag in item.get("tags") or ():
+        if isinstance(tag, str) and tag in _SORT_RANK:
+            return _SORT_RANK[tag]
+    return _UNSORTED
+
+
+class TagIndex:
+    """Tag lookup tables for one provider item list.
+
+    Parameters
+    ----------
+    items : list
+        The provider's ``basemaps`` or ``layers`` list.  Item ids are
+        positions in this list.
+    """
+
+    def __init__(self, items: list[Any]) -> None:
+        self.items = items
+        self.sort_keys = [sort_key_by_tag(item) for item in items]
+        # sorted() is stable, so items keep file order within one tag
+        self.order = sorted(range(len(items)), key=self.sort_keys.__getitem__)
+        ids: dict[str, set[int]] = {}
+        for item_id, item in enumerate(items):
+            for tag in item_tags(item):
+                ids.setdefault(tag, set()).add(item_id)
+        self._ids = {tag: frozenset(members) for tag, members in ids.items()}
+        self.counts = {tag: len(members) for tag, members in self._ids.items()}
+
+    def ids(self, tag: str) -> frozenset[int] | None:
+        """Return the ids of items matching *tag* (``None`` for ``"All"``)."""
+        if tag == "All":
+            return None
+        return self._ids.get(tag, frozenset())
+
+    def sorted_items(self) -> list[tuple[int, Any]]:
+        """Return ``(item id, item)`` pairs in tag display order."""
+        return [(item_id, self.items[item_id]) for item_id in self.order]
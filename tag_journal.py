@@ -0,0 +1,342 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""Append-only journal of tag edits.
+
+Editing the tags of one basemap used to rewrite its whole provider YAML
+(about 360 KB for NASA GIBS) or the whole ``tag_overrides.yaml`` on the
+GUI thread.  Each edit is now appended to ``resources/tag_edits.journal``
+as one small JSON line (a :class:`TagEdit`), which is all the GUI thread
+writes.
+
+Pending edits are applied on load on top of the tag overrides (see
+:func:`apply_edits`), so the journal is authoritative until it is
+compacted.  :class:`TagEditJournal` compacts it into the YAML files in a
+:class:`QgsTask` once edits have stopped arriving for
+:data:`COMPACT_DEBOUNCE_MS`, so a burst of edits costs a single rewrite of
+each affected file.  Compaction follows the two save modes of
+:class:`basemaps_dialog.TagEditDialog`:
+
+* ``"overrides"`` – the item's entry in ``tag_overrides.yaml`` is set;
+* ``"direct"`` – the tags are written into the provider's own YAML file and
+  the provider's overrides are dropped, since the file now holds them.
+
+A ``"clear"`` record drops all of a provider's overrides.  The dialog
+journals one after saving a whole provider to its file, so
+``tag_overrides.yaml`` is only ever written by compaction.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from qgis.core import QgsApplication, QgsTask
+from qgis.PyQt.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+
+from . import config_loader
+from .messageTool import Logger
+
+JOURNAL_FILENAME = "tag_edits.journal"
+
+# Idle time after the last edit before the journal is compacted.
+COMPACT_DEBOUNCE_MS = 3000
+
+
+class TagEdit(NamedTuple):
+    """One tag edit of a single basemap/layer.
+
+    Attributes
+    ----------
+    mode : str
+        ``"overrides"``, ``"direct"`` or ``"clear"`` (the provider's
+        overrides are dropped; *item* and *tags* are empty).
+    provider_type : str
+        ``"xyz"`` or ``"wms"``.
+    provider_name : str
+        Name of the edited provider.
+    source_file : str
+        Provider YAML file (needed for ``"direct"`` edits).
+    item : str
+        Basemap ``name`` (XYZ) or ``layer_name`` (WMS/WMTS).
+    tags : list[str]
+        The item's new tags.
+    """
+
+    mode: str
+    provider_type: str
+    provider_name: str
+    source_file: str
+    item: str
+    tags: list[str]
+
+
+def journal_path(resources_dir: Path) -> Path:
+    """Return the location of the journal inside *resources_dir*."""
+    return Path(resources_dir) / JOURNAL_FILENAME
+
+
+def read_journal(resources_dir: Path) -> list[TagEdit]:
+    """Return the pending edits in the order they were made.
+
+    Lines that cannot be decoded (e.g. a write cut short by a crash) are
+    skipped.
+    """
+    path = journal_path(resources_dir)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        Logger.warning(f"Failed to read tag edit journal {path}: {e}")
+        return []
+    edits = []
+    for line in lines:
+        try:
+            edits.append(TagEdit(*json.loads(line)))
+        except (ValueError, TypeError):
+            if line.strip():
+                Logger.warning(f"Skipping damaged tag edit record: {line!r}")
+    return edits
+
+
+def append_journal(resources_dir: Path, edits: list[TagEdit]) -> None:
+    """Append *edits* to the journal and flush them to disk."""
+    path = journal_path(resources_dir)
+    with path.open("a", encoding="utf-8") as f:
+        for edit in edits:
+            f.write(json.dumps(list(edit), ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def rewrite_journal(resources_dir: Path, edits: list[TagEdit]) -> None:
+    """Replace the journal with *edits* (removing it when empty)."""
+    path = journal_path(resources_dir)
+    if not edits:
+        path.unlink(missing_ok=True)
+        return
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        "".join(json.dumps(list(e), ensure_ascii=False) + "\n" for e in edits),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def apply_edits(overrides: dict[str, Any], edits: list[TagEdit]) -> None:
+    """Fold pending *edits* into an in-memory tag overrides mapping.
+
+    Both save modes become override entries here; this is what the YAML
+    files will hold once the edits are compacted.  As in :func:`compact`,
+    an ``"overrides"`` edit without tags removes the item's entry, so the
+    item falls back to the tags of its provider file.
+    """
+    for edit in edits:
+        if edit.mode == "clear":
+            overrides.get(edit.provider_type, {}).pop(edit.provider_name, None)
+            continue
+        provider_overrides = overrides.setdefault(edit.provider_type, {}).setdefault(
+            edit.provider_name, {}
+        )
+        if edit.mode != "direct" and not edit.tags:
+            provider_overrides.pop(edit.item, None)
+        else:
+            provider_overrides[edit.item] = {"tags": list(edit.tags)}
+
+
+class CompactionConflict(RuntimeError):
+    """A provider file changed while its tag edits were being compacted."""
+
+
+def _file_state(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def compact(resources_dir: Path, edits: list[TagEdit]) -> list[Path]:
+    """Write *edits* into the provider files and ``tag_overrides.yaml``.
+
+    Safe to run off the GUI thread: it reads and writes files only.
+    ``"direct"`` edits whose provider file is missing or unreadable, or no
+    longer defines the provider, are dropped with a warning.
+
+    Returns
+    -------
+    list[Path]
+        Provider files that were rewritten.
+
+    Raises
+    ------
+    CompactionConflict
+        A provider file changed while compacting; nothing was written.
+    """
+    overrides = config_loader.load_tag_overrides(resources_dir)
+    # (source file, type, name) -> (file state when read, provider)
+    providers: dict[
+        tuple[str, str, str], tuple[tuple[int, int], dict[str, Any]]
+    ] = {}
+
+    for edit in edits:
+        if edit.mode == "clear":
+            overrides.get(edit.provider_type, {}).pop(edit.provider_name, None)
+            continue
+        if edit.mode != "direct":
+            provider_overrides = overrides.setdefault(
+                edit.provider_type, {}
+            ).setdefault(edit.provider_name, {})
+            if edit.tags:
+                provider_overrides[edit.item] = {"tags": list(edit.tags)}
+            else:
+                provider_overrides.pop(edit.item, None)
+            continue
+
+        key = (edit.source_file, edit.provider_type, edit.provider_name)
+        if key not in providers:
+            path = Path(edit.source_file)
+            state = _file_state(path)
+            try:
+                if state is None:
+                    raise FileNotFoundError(edit.source_file)
+                file_providers = config_loader.load_provider_file(path)
+            except Exception as e:
+                Logger.warning(
+                    f"Tag edit for unreadable provider file dropped: {edit} ({e})"
+                )
+                continue
+            for provider in file_providers:
+                if (provider.get("type"), provider.get("name")) == key[1:]:
+                    providers[key] = (state, provider)
+                    break
+            else:
+                Logger.warning(f"Tag edit for missing provider dropped: {edit}")
+                continue
+        provider = providers[key][1]
+        # Bake the provider's current overrides in before dropping them
+        config_loader.apply_tag_overrides([provider], overrides)
+        items_key = "basemaps" if edit.provider_type == "xyz" else "layers"
+        name_key = "name" if edit.provider_type == "xyz" else "layer_name"
+        for item in provider.get(items_key) or []:
+            if isinstance(item, Mapping) and item.get(name_key) == edit.item:
+                item["tags"] = list(edit.tags)
+        overrides.get(edit.provider_type, {}).pop(edit.provider_name, None)
+
+    for (source_file, _, _), (state, _) in providers.items():
+        if _file_state(Path(source_file)) != state:
+            raise CompactionConflict(
+                f"{source_file} changed while compacting tag edits"
+            )
+
+    written = []
+    for (source_file, _, _), (_, provider) in providers.items():
+        config_loader.save_provider_to_path(source_file, provider)
+        written.append(Path(source_file))
+    config_loader.save_tag_overrides(resources_dir, overrides)
+    return written
+
+
+class _CompactTask(QgsTask):
+    """Background compaction of a batch of journaled tag edits."""
+
+    def __init__(self, resources_dir: Path, edits: list[TagEdit]) -> None:
+        super().__init__(
+            QCoreApplication.translate("BasemapsDialog", "Saving tag edits...")
+        )
+        self.resources_dir = resources_dir
+        self.edits = edits
+        self.written: list[Path] = []
+        self.error = ""
+        # Whether the batch may succeed when compacted again
+        self.retry = False
+
+    def run(self) -> bool:
+        try:
+            self.written = compact(self.resources_dir, self.edits)
+        except CompactionConflict as e:
+            self.error = str(e)
+            self.retry = True
+            return False
+        except Exception as e:
+            self.error = str(e)
+            return False
+        return True
+
+
+class TagEditJournal(QObject):
+    """Records tag edits and compacts them in the background.
+
+    Parameters
+    ----------
+    resources_dir : Path
+        The plugin ``resources/`` directory.
+    """
+
+    # Files rewritten by a compaction (list[Path])
+    compacted = pyqtSignal(list)
+
+    def __init__(self, resources_dir: Path, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.resources_dir = Path(resources_dir)
+        self._pending: list[TagEdit] = read_journal(self.resources_dir)
+        self._task: _CompactTask | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(COMPACT_DEBOUNCE_MS)
+        self._timer.timeout.connect(self.compact)
+        if self._pending:
+            self._timer.start()
+
+    def pending(self) -> list[TagEdit]:
+        """Return the edits not yet compacted into the YAML files."""
+        return list(self._pending)
+
+    def record(self, edit: TagEdit) -> None:
+        """Append *edit* to the journal and (re)arm the compaction timer."""
+        append_journal(self.resources_dir, [edit])
+        self._pending.append(edit)
+        self._timer.start()
+
+    def compact(self) -> None:
+        """Start compacting the pending edits unless a compaction is running."""
+        if not self._pending or self._task is not None:
+            return
+        task = _CompactTask(self.resources_dir, list(self._pending))
+        task.taskCompleted.connect(lambda: self._on_task_done(task))
+        task.taskTerminated.connect(lambda: self._on_task_done(task))
+        self._task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def stop(self) -> None:
+        """Stop scheduling compactions; pending edits stay in the journal."""
+        self._timer.stop()
+
+    def _on_task_done(self, task: _CompactTask) -> None:
+        self._task = None
+        if task.error:
+            Logger.warning(f"Tag edits kept in journal: {task.error}")
+            # A permanent failure is only tried again with the next edit
+            if task.retry:
+                self._timer.start()
+            return
+        # Edits recorded while the task ran are still pending
+        del self._pending[: len(task.edits)]
+        rewrite_journal(self.resources_dir, self._pending)
+        Logger.info(f"Compacted {len(task.edits)} tag edit(s)")
+        self.compacted.emit(task.written)
+        if self._pending:
+            self._timer.start()
@@ -0,0 +1,131 @@
+# Copyright (C) 2024  Chengyan (Fancy) Fan
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+"""YAML reading and writing for provider files, tag overrides and style meta.
+
+PyYAML ships an optional C extension backed by libyaml that parses and
+emits several times faster than the pure-Python implementation.  This
+module picks ``CSafeLoader`` / ``CSafeDumper`` when PyYAML was built with
+libyaml and falls back to ``SafeLoader`` / ``SafeDumper`` otherwise, so
+callers never have to care which one is in use.
+
+The module deliberately imports nothing from QGIS so it can also be used
+from worker processes (see :func:`config_loader.load_all_provider_files`).
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as _BaseSafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _BaseSafeDumper
+    from yaml import SafeLoader
+
+    HAS_LIBYAML = False
+
+YAMLError = yaml.YAMLError
+
+
+class OrderedDumper(_BaseSafeDumper):
+    """Safe dumper that writes ``dict`` and ``OrderedDict`` in insertion order.
+
+    Tuples are written as plain sequences.  Layer records share interned
+    tuples (see :mod:`layer_record`), so tuples are never turned into YAML
+    anchors/aliases.
+    """
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return isinstance(data, tuple) or super().ignore_aliases(data)
+
+
+def _ordered_mapping_representer(dumper, data):
+    return dumper.represent_mapping("tag:yaml.org,2002:map", data.items())
+
+
+def _sequence_representer(dumper, data):
+    return dumper.represent_sequence("tag:yaml.org,2002:seq", data)
+
+
+OrderedDumper.add_representer(dict, _ordered_mapping_representer)
+OrderedDumper.add_representer(OrderedDict, _ordered_mapping_representer)
+OrderedDumper.add_multi_representer(Mapping, _ordered_mapping_representer)
+OrderedDumper.add_representer(tuple, _sequence_representer)
+
+
+def safe_load(stream: str | bytes | IO) -> Any:
+    """Parse a YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_file(path: str | Path) -> Any:
+    """Read and parse the YAML file at *path*.
+
+    The file is read in one call and handed to the loader as bytes, which
+    lets libyaml detect the encoding itself and avoids per-chunk reads.
+    """
+    return safe_load(Path(path).read_bytes())
+
+
+def dump(data: Any, stream: IO | None = None, **kwargs: Any) -> str | None:
+    """Serialize *data* in insertion order with the fastest safe dumper.
+
+    Parameters
+    ----------
+    data : Any
+        Plain data (dicts, lists, scalars, ``OrderedDict``).
+    stream : IO | None
+        Open text stream to write to; the YAML text is returned when omitted.
+    **kwargs
+        Extra :func:`yaml.dump` options.  The plugin's formatting defaults
+        (block style, unicode, unsorted keys, two-space indent) are applied
+        unless overridden.
+
+    Returns
+    -------
+    str | None
+        The YAML text when *stream* is ``None``.
+    """
+    kwargs.setdefault("allow_unicode", True)
+    kwargs.setdefault("default_flow_style", False)
+    kwargs.setdefault("sort_keys", False)
+    kwargs.setdefault("indent", 2)
+    return yaml.dump(data, stream, Dumper=OrderedDumper, **kwargs)
+
+
+def dump_file(path: str | Path, data: Any, **kwargs: Any) -> None:
+    """Serialize *data* to the file at *path* (see :func:`dump`).
+
+    The document is written to ``<path>.tmp`` and renamed over *path*, so
+    a crash or a concurrent reader never sees a truncated file.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            dump(data, f, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise